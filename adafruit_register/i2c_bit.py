@@ -17,6 +17,8 @@ __version__ = "0.0.0-auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_Register.git"
 """
 
+from adafruit_register.register_cache import read_register, register_buffer, write_register
+
 class RWBit:
     """
     Single bit register that is readable and writeable.
@@ -28,26 +30,27 @@ class RWBit:
     """
     def __init__(self, register_address, bit, register_width=1, lsb_first=True):
         self.bit_mask = 1 << (bit % 8)  # the bitmask *within* the byte!
-        self.buffer = bytearray(1 + register_width)
-        self.buffer[0] = register_address
+        self.clear_mask = ~self.bit_mask & 0xFF
+        self.address = register_address
+        self.width = register_width
         if lsb_first:
-            self.byte = bit // 8 + 1  # the byte number within the buffer
+            self.byte = bit // 8  # the byte number within the buffer
         else:
-            self.byte = register_width - (bit // 8)  # the byte number within the buffer
+            self.byte = register_width - 1 - (bit // 8)  # the byte number within the buffer
 
     def __get__(self, obj, objtype=None):
-        with obj.i2c_device as i2c:
-            i2c.write_then_readinto(self.buffer, self.buffer, out_end=1, in_start=1)
-        return bool(self.buffer[self.byte] & self.bit_mask)
+        buffer = register_buffer(obj, self.width)
+        read_register(obj, self.address, buffer)
+        return bool(buffer[self.byte] & self.bit_mask)
 
     def __set__(self, obj, value):
-        with obj.i2c_device as i2c:
-            i2c.write_then_readinto(self.buffer, self.buffer, out_end=1, in_start=1)
-            if value:
-                self.buffer[self.byte] |= self.bit_mask
-            else:
-                self.buffer[self.byte] &= ~self.bit_mask
-            i2c.write(self.buffer)
+        buffer = register_buffer(obj, self.width)
+        read_register(obj, self.address, buffer)
+        if value:
+            buffer[self.byte] |= self.bit_mask
+        else:
+            buffer[self.byte] &= self.clear_mask
+        write_register(obj, self.address, buffer)
 
 
 
@@ -17,6 +17,8 @@ __version__ = "0.0.0-auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_Register.git"
 """
 
+from adafruit_register.register_cache import read_register, register_buffer, write_register
+
 class RWBits:
     """
     Multibit register (less than a full byte) that is readable and writeable.
@@ -47,21 +49,21 @@ class RWBits:
         if self.bit_mask >= 1 << (register_width * 8):
             raise ValueError("Cannot have more bits than register size")
         self.lowest_bit = lowest_bit
-        self.buffer = bytearray(1 + register_width)
-        self.buffer[0] = register_address
+        self.address = register_address
+        self.width = register_width
         self.lsb_first = lsb_first
         self.sign_bit = (1 << (num_bits - 1)) if signed else 0
+        # precomputed so that accesses don't allocate
+        self.byteorder = "little" if lsb_first else "big"
+        self.lsb_order = tuple(
+            range(register_width) if lsb_first else range(register_width - 1, -1, -1)
+        )  # buffer indices from least to most significant byte
 
     def __get__(self, obj, objtype=None):
-        with obj.i2c_device as i2c:
-            i2c.write_then_readinto(self.buffer, self.buffer, out_end=1, in_start=1)
+        buffer = register_buffer(obj, self.width)
+        read_register(obj, self.address, buffer)
         # read the number of bytes into a single variable
-        reg = 0
-        order = range(len(self.buffer) - 1, 0, -1)
-        if not self.lsb_first:
-            order = reversed(order)
-        for i in order:
-            reg = (reg << 8) | self.buffer[i]
+        reg = int.from_bytes(buffer, self.byteorder)
         reg = (reg & self.bit_mask) >> self.lowest_bit
         # If the value is signed and negative, convert it
         if reg & self.sign_bit:
@@ -70,22 +72,17 @@ class RWBits:
 
     def __set__(self, obj, value):
         value <<= self.lowest_bit  # shift the value over to the right spot
-        with obj.i2c_device as i2c:
-            i2c.write_then_readinto(self.buffer, self.buffer, out_end=1, in_start=1)
-            reg = 0
-            order = range(len(self.buffer) - 1, 0, -1)
-            if not self.lsb_first:
-                order = range(1, len(self.buffer))
-            for i in order:
-                reg = (reg << 8) | self.buffer[i]
-            # print("old reg: ", hex(reg))
-            reg &= ~self.bit_mask  # mask off the bits we're about to change
-            reg |= value  # then or in our new value
-            # print("new reg: ", hex(reg))
-            for i in reversed(order):
-                self.buffer[i] = reg & 0xFF
-                reg >>= 8
-            i2c.write(self.buffer)
+        buffer = register_buffer(obj, self.width)
+        read_register(obj, self.address, buffer)
+        reg = int.from_bytes(buffer, self.byteorder)
+        # print("old reg: ", hex(reg))
+        reg &= ~self.bit_mask  # mask off the bits we're about to change
+        reg |= value & self.bit_mask  # then or in our new value
+        # print("new reg: ", hex(reg))
+        for i in self.lsb_order:
+            buffer[i] = reg & 0xFF
+            reg >>= 8
+        write_register(obj, self.address, buffer)
 
 
 class ROBits(RWBits):
@@ -0,0 +1,64 @@
+"""
+`adafruit_register.i2c_device`
+====================================================
+
+Bus adapters used by the register descriptors
+
+The descriptors only need two register-level operations, named after their
+MicroPython ``machine.I2C`` counterparts with the device address bound:
+
+* ``readfrom_mem_into(memaddr, buf)``
+* ``writeto_mem(memaddr, buf)``
+
+`I2CDevice` implements them on ``machine.I2C`` (or any compatible bus such as
+``PimoroniI2C``) as single repeated-start transactions. `BusDeviceAdapter` provides
+the same interface on top of a CircuitPython ``adafruit_bus_device`` device.
+"""
+
+
+class I2CDevice:
+    """
+    One device on a MicroPython ``machine.I2C`` bus.
+
+    :param i2c: The ``machine.I2C`` compatible bus the device is connected to.
+    :param int device_address: The 7-bit I2C address of the device.
+    """
+
+    def __init__(self, i2c, device_address):
+        self.i2c = i2c
+        self.device_address = device_address
+
+    def readfrom_mem_into(self, memaddr, buf):
+        """Reads ``len(buf)`` bytes starting at register ``memaddr`` into ``buf``, in one
+        transaction with a repeated start after the register pointer."""
+        self.i2c.readfrom_mem_into(self.device_address, memaddr, buf)
+
+    def writeto_mem(self, memaddr, buf):
+        """Writes ``buf`` to register ``memaddr`` in one transaction."""
+        self.i2c.writeto_mem(self.device_address, memaddr, buf)
+
+
+class BusDeviceAdapter:
+    """
+    Register-level interface on top of a CircuitPython BusDevice ``I2CDevice``.
+
+    :param device: An ``adafruit_bus_device.i2c_device.I2CDevice``.
+    """
+
+    def __init__(self, device):
+        self.device = device
+        self._pointer = bytearray(1)
+
+    def readfrom_mem_into(self, memaddr, buf):
+        """Reads ``len(buf)`` bytes starting at register ``memaddr`` into ``buf``."""
+        self._pointer[0] = memaddr
+        with self.device as i2c:
+            i2c.write_then_readinto(self._pointer, buf)
+
+    def writeto_mem(self, memaddr, buf):
+        """Writes ``buf`` to register ``memaddr``."""
+        out = bytearray(1 + len(buf))
+        out[0] = memaddr
+        out[1:] = buf
+        with self.device as i2c:
+            i2c.write(out)
@@ -0,0 +1,147 @@
+"""
+`adafruit_register.i2c_record`
+====================================================
+
+Recording of I2C traffic for offline replay
+
+`I2CRecorder` wraps a ``machine.I2C`` compatible bus like
+`adafruit_register.i2c_trace.I2CTracer` and appends every transaction, with the
+``time.ticks_us()`` at which it completed and the bytes read or written, to a compact
+binary trace. ``sim.replay`` plays a trace back into the drivers on a host.
+
+Trace layout: `MAGIC` and a version byte, then one record per transaction, each a
+`RECORD_FORMAT` header (kind, device address, register, data length, microseconds since
+the previous record) followed by the data. Gaps too long for the 16-bit delta are
+preceded by a `TIME` record holding the full gap as 4 little-endian bytes.
+"""
+
+import struct
+import time
+
+MAGIC = b"SPXI"
+VERSION = 1
+RECORD_FORMAT = "<BBBBH"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+# record kinds
+READ_MEM = 0
+"""``readfrom_mem_into``: data is the bytes read."""
+WRITE_MEM = 1
+"""``writeto_mem``: data is the bytes written."""
+TIME = 2
+"""Long gap: data is the gap in microseconds, the next record's own delta is 0."""
+WRITE = 3
+"""``writeto``: data is the whole write, register pointer included."""
+READ = 4
+"""``readfrom_into``: data is the bytes read."""
+
+_MAX_DELTA = 0xFFFF
+
+
+class I2CRecorder:
+    """
+    ``machine.I2C`` compatible wrapper that records every transaction of the bus it wraps.
+
+    Records are packed into a preallocated buffer that is written to the trace file when it
+    fills, on :meth:`flush` and on :meth:`close`.
+
+    :param i2c: The bus to wrap.
+    :param str filename: The trace file to create.
+    :param int block_size: Size of the RAM buffer.
+    """
+
+    def __init__(self, i2c, filename, *, block_size=4096):
+        self.i2c = i2c
+        self.filename = filename
+        self.records = 0
+        self._file = open(filename, "wb")
+        self._file.write(MAGIC + bytes((VERSION,)))
+        self._buffer = bytearray(block_size)
+        self._length = 0
+        self._last_us = time.ticks_us()
+
+    def __getattr__(self, name):
+        # anything not recorded goes straight to the bus
+        return getattr(self.i2c, name)
+
+    def _append(self, kind, address, register, data, delta):
+        size = RECORD_SIZE + len(data)
+        if self._length + size > len(self._buffer):
+            self._write_buffer()
+            if size > len(self._buffer):
+                raise ValueError("I2C record larger than the recorder buffer")
+        struct.pack_into(RECORD_FORMAT, self._buffer, self._length, kind, address, register, len(data), delta)
+        start = self._length + RECORD_SIZE
+        self._buffer[start:start + len(data)] = data
+        self._length = start + len(data)
+
+    def _record(self, kind, address, register, data):
+        if self._file is None:
+            return
+        if len(data) > 0xFF:
+            raise ValueError("I2C transfers over 255 bytes can't be recorded")
+        # completion time, which is what the driver sees after the call returns
+        now = time.ticks_us()
+        delta = time.ticks_diff(now, self._last_us)
+        self._last_us = now
+        if delta > _MAX_DELTA:
+            self._append(TIME, 0, 0, struct.pack("<I", delta), 0)
+            delta = 0
+        self._append(kind, address, register, data, max(0, delta))
+        self.records += 1
+
+    def readfrom_mem_into(self, addr, memaddr, buf, addrsize=8):
+        """Recorded ``machine.I2C.readfrom_mem_into``."""
+        self.i2c.readfrom_mem_into(addr, memaddr, buf, addrsize=addrsize)
+        self._record(READ_MEM, addr, memaddr, buf)
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8):
+        """Recorded ``machine.I2C.readfrom_mem``."""
+        buf = bytearray(nbytes)
+        self.readfrom_mem_into(addr, memaddr, buf, addrsize)
+        return bytes(buf)
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8):
+        """Recorded ``machine.I2C.writeto_mem``."""
+        self.i2c.writeto_mem(addr, memaddr, buf, addrsize=addrsize)
+        self._record(WRITE_MEM, addr, memaddr, buf)
+
+    def writeto(self, addr, buf, stop=True):
+        """Recorded ``machine.I2C.writeto``."""
+        result = self.i2c.writeto(addr, buf, stop)
+        self._record(WRITE, addr, 0, buf)
+        return result
+
+    def readfrom_into(self, addr, buf, stop=True):
+        """Recorded ``machine.I2C.readfrom_into``."""
+        self.i2c.readfrom_into(addr, buf, stop)
+        self._record(READ, addr, 0, buf)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        """Recorded ``machine.I2C.readfrom``."""
+        buf = bytearray(nbytes)
+        self.readfrom_into(addr, buf, stop)
+        return bytes(buf)
+
+    def _write_buffer(self):
+        if self._length:
+            self._file.write(memoryview(self._buffer)[:self._length])
+            self._length = 0
+
+    def flush(self):
+        """Writes buffered records to the trace file."""
+        if self._file is None:
+            return
+        self._write_buffer()
+        self._file.flush()
+
+    def close(self):
+        """Flushes and closes the trace file. The bus keeps working, unrecorded. Safe to
+        call more than once."""
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
@@ -2,6 +2,20 @@
 
 import ustruct
 
+from adafruit_register.register_cache import read_register, register_buffer, write_register
+
+# single integer struct codes: (size in bytes, signed)
+_INTEGER_CODES = {
+    "b": (1, True),
+    "B": (1, False),
+    "h": (2, True),
+    "H": (2, False),
+    "i": (4, True),
+    "I": (4, False),
+    "l": (4, True),
+    "L": (4, False),
+}
+
 class UnaryStruct:
     """
     Arbitrary single value structure register that is readable and writeable.
@@ -9,6 +23,10 @@ class UnaryStruct:
     Values map to the first value in the defined struct.  See struct
     module documentation for struct format string and its possible value types.
 
+    Single integer formats (e.g. ``">H"``) are decoded directly from the device's
+    preallocated register buffer, so accessing them does not allocate. Other formats
+    fall back to ``ustruct``.
+
     :param int register_address: The register address to read the bit from
     :param type struct_format: The struct format string for this register.
     """
@@ -16,17 +34,37 @@ class UnaryStruct:
     def __init__(self, register_address, struct_format):
         self.format = struct_format
         self.address = register_address
+        self.width = ustruct.calcsize(struct_format)
+
+        code = struct_format.lstrip("<>!=@")
+        order = struct_format[0] if len(code) < len(struct_format) else "@"
+        self.integer = code in _INTEGER_CODES
+        # MicroPython targets are little-endian, so native order is "little"
+        self.byteorder = "big" if order in ">!" else "little"
+        self.lsb_order = tuple(
+            range(self.width - 1, -1, -1) if self.byteorder == "big"
+            else range(self.width)
+        )  # buffer indices from least to most significant byte
+        self.sign_bit = 0
+        if self.integer and _INTEGER_CODES[code][1]:
+            self.sign_bit = 1 << (8 * self.width - 1)
 
     def __get__(self, obj, objtype=None):
-        buf = bytearray(1 + ustruct.calcsize(self.format))
-        buf[0] = self.address
-        with obj.i2c_device as i2c:
-            i2c.write_then_readinto(buf, buf, out_end=1, in_start=1)
-        return ustruct.unpack_from(self.format, buf, 1)[0]
+        buffer = register_buffer(obj, self.width)
+        read_register(obj, self.address, buffer)
+        if not self.integer:
+            return ustruct.unpack_from(self.format, buffer, 0)[0]
+        value = int.from_bytes(buffer, self.byteorder)
+        if value & self.sign_bit:
+            value -= 2 * self.sign_bit
+        return value
 
     def __set__(self, obj, value):
-        buf = bytearray(1 + ustruct.calcsize(self.format))
-        buf[0] = self.address
-        ustruct.pack_into(self.format, buf, 1, value)
-        with obj.i2c_device as i2c:
-            i2c.write(buf)
\ No newline at end of file
+        buffer = register_buffer(obj, self.width)
+        if self.integer:
+            for i in self.lsb_order:
+                buffer[i] = value & 0xFF
+                value >>= 8
+        else:
+            ustruct.pack_into(self.format, buffer, 0, value)
+        write_register(obj, self.address, buffer)
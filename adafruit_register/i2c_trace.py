@@ -0,0 +1,212 @@
+"""
+`adafruit_register.i2c_trace`
+====================================================
+
+Opt-in I2C transaction tracing
+
+`I2CTracer` wraps a ``machine.I2C`` compatible bus and is passed to drivers in its
+place. Every transaction is timed with ``time.ticks_us()`` and counted per
+(device address, register), with transferred bytes and a latency histogram. Reads of
+watched configuration registers that return the value already known from an earlier
+read or write are flagged as redundant, as they are candidates for a
+`adafruit_register.register_cache.RegisterCache`.
+
+Tracing can be switched off at runtime with `I2CTracer.enabled`, which leaves one
+attribute check per transaction, and a bus that is never wrapped costs nothing at all.
+"""
+
+import sys
+import time
+from array import array
+
+HISTOGRAM_BOUNDS_US = (50, 100, 200, 500, 1000, 2000, 5000)
+"""Upper bounds of the latency histogram buckets, in microseconds. A last bucket counts
+everything slower."""
+
+NO_REGISTER = 0xFF
+"""Register recorded for pointer reads before any register pointer was written."""
+
+
+class RegisterStats:
+    """
+    Counters for one (device address, register) pair.
+
+    :param int buckets: Number of latency histogram buckets.
+    """
+
+    def __init__(self, buckets):
+        self.reads = 0
+        self.writes = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.total_us = 0
+        self.max_us = 0
+        self.redundant_reads = 0
+        self.histogram = array("I", [0] * buckets)
+        self.last_value = None
+
+
+class I2CTracer:
+    """
+    ``machine.I2C`` compatible wrapper that traces every transaction of the bus it wraps.
+
+    :param i2c: The bus to wrap.
+    :param watch: Configuration registers to check for redundant reads, i.e. registers that
+                  only change when written.
+    :param bool enabled: Whether to trace from the start.
+    """
+
+    def __init__(self, i2c, *, watch=(), enabled=True):
+        self.i2c = i2c
+        self.watch = set(watch)
+        self.enabled = enabled
+        self.hook = None
+        """Optional ``hook(address, register, nbytes, write, elapsed_us)``, called after every
+        traced transaction."""
+        self.stats = {}
+        self._pointers = {}
+        self._buckets = len(HISTOGRAM_BOUNDS_US) + 1
+
+    def __getattr__(self, name):
+        # anything not traced goes straight to the bus
+        return getattr(self.i2c, name)
+
+    def reset(self):
+        """Clears all counters."""
+        self.stats = {}
+
+    def _record(self, address, register, buf, write, elapsed_us):
+        key = address << 8 | register
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = RegisterStats(self._buckets)
+            self.stats[key] = stats
+        nbytes = len(buf)
+        if write:
+            stats.writes += 1
+            stats.bytes_written += nbytes
+        else:
+            stats.reads += 1
+            stats.bytes_read += nbytes
+        stats.total_us += elapsed_us
+        if elapsed_us > stats.max_us:
+            stats.max_us = elapsed_us
+        bucket = 0
+        for bound in HISTOGRAM_BOUNDS_US:
+            if elapsed_us < bound:
+                break
+            bucket += 1
+        stats.histogram[bucket] += 1
+
+        if register in self.watch and nbytes:
+            last = stats.last_value
+            if not write and last is not None and last == buf:
+                stats.redundant_reads += 1
+            elif last is None or len(last) != nbytes:
+                stats.last_value = bytearray(buf)
+            else:
+                last[:] = buf
+        if self.hook is not None:
+            self.hook(address, register, nbytes, write, elapsed_us)
+
+    def readfrom_mem_into(self, addr, memaddr, buf, addrsize=8):
+        """Traced ``machine.I2C.readfrom_mem_into``."""
+        if not self.enabled:
+            self.i2c.readfrom_mem_into(addr, memaddr, buf, addrsize=addrsize)
+            return
+        start = time.ticks_us()
+        self.i2c.readfrom_mem_into(addr, memaddr, buf, addrsize=addrsize)
+        self._record(addr, memaddr, buf, False, time.ticks_diff(time.ticks_us(), start))
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8):
+        """Traced ``machine.I2C.readfrom_mem``."""
+        buf = bytearray(nbytes)
+        self.readfrom_mem_into(addr, memaddr, buf, addrsize)
+        return bytes(buf)
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8):
+        """Traced ``machine.I2C.writeto_mem``."""
+        if not self.enabled:
+            self.i2c.writeto_mem(addr, memaddr, buf, addrsize=addrsize)
+            return
+        start = time.ticks_us()
+        self.i2c.writeto_mem(addr, memaddr, buf, addrsize=addrsize)
+        self._record(addr, memaddr, buf, True, time.ticks_diff(time.ticks_us(), start))
+
+    def writeto(self, addr, buf, stop=True):
+        """Traced ``machine.I2C.writeto``. The first byte is taken as the register pointer."""
+        if not self.enabled:
+            return self.i2c.writeto(addr, buf, stop)
+        start = time.ticks_us()
+        result = self.i2c.writeto(addr, buf, stop)
+        elapsed = time.ticks_diff(time.ticks_us(), start)
+        if len(buf):
+            self._pointers[addr] = buf[0]
+            self._record(addr, buf[0], memoryview(buf)[1:], True, elapsed)
+        return result
+
+    def readfrom_into(self, addr, buf, stop=True):
+        """Traced ``machine.I2C.readfrom_into``, recorded against the last register pointer."""
+        if not self.enabled:
+            self.i2c.readfrom_into(addr, buf, stop)
+            return
+        start = time.ticks_us()
+        self.i2c.readfrom_into(addr, buf, stop)
+        elapsed = time.ticks_diff(time.ticks_us(), start)
+        self._record(addr, self._pointers.get(addr, NO_REGISTER), buf, False, elapsed)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        """Traced ``machine.I2C.readfrom``."""
+        buf = bytearray(nbytes)
+        self.readfrom_into(addr, buf, stop)
+        return bytes(buf)
+
+    def totals(self):
+        """Returns ``(transactions, bytes, bus_us, redundant_reads)`` over all registers."""
+        transactions = nbytes = bus_us = redundant = 0
+        for stats in self.stats.values():
+            transactions += stats.reads + stats.writes
+            nbytes += stats.bytes_read + stats.bytes_written
+            bus_us += stats.total_us
+            redundant += stats.redundant_reads
+        return transactions, nbytes, bus_us, redundant
+
+    def dump(self, stream=None):
+        """Prints a per-register summary, busiest registers first.
+
+        :param stream: Where to print. Defaults to ``sys.stdout``.
+        """
+        if stream is None:
+            stream = sys.stdout
+        transactions, nbytes, bus_us, redundant = self.totals()
+        print(
+            "I2C trace: {} transactions, {} bytes, {} us, {} redundant reads".format(
+                transactions, nbytes, bus_us, redundant
+            ),
+            file=stream,
+        )
+        bounds = " ".join("<{}".format(bound) for bound in HISTOGRAM_BOUNDS_US)
+        print(
+            "addr reg  reads writes  bytes mean_us max_us redundant | {} >={}".format(
+                bounds, HISTOGRAM_BOUNDS_US[-1]
+            ),
+            file=stream,
+        )
+        keys = sorted(self.stats, key=lambda key: -self.stats[key].total_us)
+        for key in keys:
+            stats = self.stats[key]
+            count = stats.reads + stats.writes
+            print(
+                "0x{:02x} 0x{:02x} {:5} {:6} {:6} {:7} {:6} {:9} | {}".format(
+                    key >> 8,
+                    key & 0xFF,
+                    stats.reads,
+                    stats.writes,
+                    stats.bytes_read + stats.bytes_written,
+                    stats.total_us // count if count else 0,
+                    stats.max_us,
+                    stats.redundant_reads,
+                    " ".join(str(n) for n in stats.histogram),
+                ),
+                file=stream,
+            )
@@ -0,0 +1,183 @@
+"""
+`adafruit_register.register_cache`
+====================================================
+
+Opt-in shadow copies of configuration registers
+
+Descriptors access the device through its ``i2c_device`` attribute, which must be
+one of the adapters in `adafruit_register.i2c_device`.
+
+A device opts in by setting a ``register_cache`` attribute to a `RegisterCache`.
+The register descriptors then serve reads of cached registers from RAM and
+write-through every change, so a read-modify-write of a configuration bit only
+touches the bus once.
+
+`RegisterBatch` builds on the same shadow to coalesce every field write made inside a
+``with`` block into a single write per register.
+
+Descriptors are shared by every instance of a device class, so the scratch buffers
+they read registers into are kept on the device, see `register_buffer`.
+"""
+
+
+class RegisterCache:
+    """
+    Write-through shadow of a device's configuration registers.
+
+    Only registers listed in ``addresses`` are shadowed; status and data registers
+    that the device changes on its own must be left out.
+
+    :param addresses: The register addresses that may be cached.
+    """
+
+    def __init__(self, addresses):
+        self.addresses = set(addresses)
+        self._shadow = {}
+        self._dirty = set()
+        self._batch_depth = 0
+
+    @property
+    def batching(self):
+        """`True` while a `RegisterBatch` is open; writes are then held back until it exits."""
+        return self._batch_depth > 0
+
+    def load(self, address, buffer):
+        """Copies the shadowed value of the register at ``address`` into ``buffer``.
+        Returns `False` if the register is not cached."""
+        shadow = self._shadow.get(address)
+        if shadow is None or len(shadow) != len(buffer):
+            return False
+        for i in range(len(shadow)):
+            buffer[i] = shadow[i]
+        return True
+
+    def store(self, address, buffer):
+        """Records ``buffer`` as the value of the register at ``address``."""
+        if address not in self.addresses and not self._batch_depth:
+            return
+        shadow = self._shadow.get(address)
+        if shadow is None or len(shadow) != len(buffer):
+            shadow = bytearray(len(buffer))
+            self._shadow[address] = shadow
+        for i in range(len(shadow)):
+            shadow[i] = buffer[i]
+
+    def mark_dirty(self, address):
+        """Flags a shadowed register as needing to be written when the batch exits."""
+        self._dirty.add(address)
+
+    def begin(self):
+        """Opens a (possibly nested) batch."""
+        self._batch_depth += 1
+
+    def end(self, obj, commit=True):
+        """Closes a batch. When the outermost batch closes, the pending registers of ``obj``
+        are written in address order, or dropped if ``commit`` is `False`. If a write fails,
+        the registers not yet written are dropped from the shadow too, as the device still
+        holds their old values."""
+        self._batch_depth -= 1
+        if self._batch_depth:
+            return
+        pending = sorted(self._dirty)
+        self._dirty.clear()
+        done = 0
+        try:
+            if commit:
+                for address in pending:
+                    obj.i2c_device.writeto_mem(address, self._shadow[address])
+                    done += 1
+        finally:
+            for address in pending[done:]:
+                self.invalidate(address)
+            # registers that were only shadowed for the duration of the batch
+            for address in [a for a in self._shadow if a not in self.addresses]:
+                del self._shadow[address]
+
+    def invalidate(self, address=None):
+        """Drops the shadow of one register, or of every register if ``address`` is `None`.
+        The next access re-reads it from the device."""
+        if address is None:
+            self._shadow.clear()
+        elif address in self._shadow:
+            del self._shadow[address]
+
+    def refresh(self, obj):
+        """Re-reads every shadowed register of ``obj`` from the device."""
+        for address, shadow in self._shadow.items():
+            obj.i2c_device.readfrom_mem_into(address, shadow)
+
+
+def register_buffer(obj, width):
+    """Returns the scratch buffer of ``width`` bytes owned by ``obj``, allocating it on first
+    use. Register accesses on one device never overlap, so its descriptors share one
+    buffer per width; devices used from different threads never share one."""
+    buffers = getattr(obj, "_register_buffers", None)
+    if buffers is None:
+        buffers = {}
+        obj._register_buffers = buffers
+    buffer = buffers.get(width)
+    if buffer is None:
+        buffer = bytearray(width)
+        buffers[width] = buffer
+    return buffer
+
+
+def read_register(obj, address, buffer):
+    """Fills ``buffer`` with the register at ``address``, from the cache of ``obj``
+    when possible."""
+    cache = getattr(obj, "register_cache", None)
+    if cache is not None and cache.load(address, buffer):
+        return
+    obj.i2c_device.readfrom_mem_into(address, buffer)
+    if cache is not None:
+        cache.store(address, buffer)
+
+
+def write_register(obj, address, buffer):
+    """Writes ``buffer`` to the register at ``address`` and updates the cache of ``obj``.
+    Inside a `RegisterBatch` the write is deferred until the batch exits."""
+    cache = getattr(obj, "register_cache", None)
+    if cache is not None and cache.batching:
+        cache.store(address, buffer)
+        cache.mark_dirty(address)
+        return
+    obj.i2c_device.writeto_mem(address, buffer)
+    if cache is not None:
+        cache.store(address, buffer)
+
+
+class RegisterBatch:
+    """
+    Context manager that coalesces register writes on ``obj``.
+
+    Every field write inside the block updates a shadow of its register; on exit each
+    changed register is written once, in address order. Registers are read at most once
+    per batch, so reads inside the block see the pending values rather than the device.
+    If the block raises, the pending writes are discarded.
+
+    A temporary `RegisterCache` is installed for the duration of the batch if ``obj``
+    has none.
+
+    :param obj: The device whose register descriptors are being written.
+    """
+
+    def __init__(self, obj):
+        self.obj = obj
+        self._temporary = False
+
+    def __enter__(self):
+        cache = getattr(self.obj, "register_cache", None)
+        self._temporary = cache is None
+        if cache is None:
+            cache = RegisterCache(())
+            self.obj.register_cache = cache
+        cache.begin()
+        return cache
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.obj.register_cache.end(self.obj, commit=exc_type is None)
+        finally:
+            if self._temporary:
+                self.obj.register_cache = None
+        return False
@@ -0,0 +1,77 @@
+"""Performance benchmarks for the sampler, run on the host against `sim`
+
+Each benchmark returns a dict of metrics; `run()` collects them into a JSON-serializable
+result that `bench.compare` checks against a saved baseline
+
+Metric naming
+-------------
+- `*_per_s` metrics are rates, higher is better; every other metric is lower-is-better
+- `sim_*` metrics are measured on the simulation clock and bus, so they are deterministic
+  and model the board, e.g. I2C time at the bus frequency plus a per-transaction overhead
+- `host_*` metrics depend on host timing, only useful relative to a baseline from the same
+  machine, and reported without failing the comparison unless `--host-tolerance` is given
+- `alloc_*` metrics come from `tracemalloc`: bytes still held by firmware code per
+  operation, and the peak of transient allocations during the run, simulator included\n
+  The peak depends on the interpreter and on what ran before, so it is reported only
+
+Usage
+-----
+`python -m bench` runs everything and compares against `bench/baseline.json`\n
+`python -m bench --save bench/baseline.json` records a new baseline\n
+`--quick` runs are not compared against a full baseline, as per-operation averages over
+fewer iterations differ
+"""
+
+import sys
+
+BENCHMARKS = {}
+
+RESULTS_VERSION = 1
+
+def benchmark(name:str):
+    """Registers a benchmark function under `name`
+
+    Parameters
+    ----------
+    name : `str`
+        Dotted name, e.g. `"mcp9600.read_all"`
+
+    Returns
+    -------
+    decorator : `Callable`
+    """
+
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+def run(names:list|None=None, *, quick:bool=False) -> dict:
+    """Runs benchmarks and collects their metrics
+
+    Parameters
+    ----------
+    names : `list[str] | None`
+        Benchmarks to run, or name prefixes\n
+        If `None` all are run
+    quick : `bool`
+        Fewer iterations, for a smoke test
+
+    Returns
+    -------
+    results : `dict`
+        `{"version", "python", "quick", "benchmarks": {name: {metric: value}}}`
+    """
+
+    from . import cases # registers the benchmarks
+
+    selected = [
+        name for name in BENCHMARKS
+        if names is None or any(name == n or name.startswith(n + ".") for n in names)
+    ]
+    return {
+        "version": RESULTS_VERSION,
+        "python": sys.version.split()[0],
+        "quick": quick,
+        "benchmarks": {name: BENCHMARKS[name](quick=quick) for name in selected},
+    }
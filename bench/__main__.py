@@ -0,0 +1,49 @@
+import argparse
+import json
+import os
+import sys
+
+from . import run
+from .compare import compare, format_rows
+
+_DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+def main(argv:list|None=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the SPARX sampler benchmarks")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("--save", metavar="BASELINE", help="write results as the new baseline")
+    parser.add_argument("--baseline", default=_DEFAULT_BASELINE, help="baseline to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="allowed regression of sim/alloc metrics, except alloc peaks")
+    parser.add_argument("--host-tolerance", type=float, help="allowed regression of host metrics (default: report only)")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations")
+    args = parser.parse_args(argv)
+
+    results = run(args.names or None, quick=args.quick)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as file: file.write(text + "\n")
+    if args.save:
+        with open(args.save, "w") as file: file.write(text + "\n")
+        print(f"saved baseline {args.save}")
+        return 0
+    if not args.output: print(text)
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}", file=sys.stderr)
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    if results["quick"] != baseline.get("quick", False):
+        print("quick and full runs are not comparable, skipping the baseline", file=sys.stderr)
+        return 0
+    rows = compare(results, baseline, tolerance=args.tolerance, host_tolerance=args.host_tolerance)
+    print(format_rows(rows), file=sys.stderr)
+    regressions = sum(row[-1] for row in rows)
+    if regressions:
+        print(f"{regressions} regression(s)", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
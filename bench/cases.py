@@ -0,0 +1,246 @@
+"""The benchmarks: MCP9600 reads, register descriptors, `Logger.write_log` and the full
+control loop
+
+Driver benchmarks run on a virtual clock, so their `sim_*` metrics are exact; the control
+loop runs `scheduler.Runtime` on `asyncio` in real time
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import sim
+from sim import profiles
+from . import benchmark
+
+# 400 kHz bus, plus the time a MicroPython `machine.I2C` call spends outside the wire
+BUS_FREQ = 400_000
+BUS_OVERHEAD_US = 60
+
+_TIMING_REPEATS = 5
+
+def _install(virtual:bool=True) -> sim.Simulation:
+    return sim.install(
+        hot=profiles.noise(profiles.sine(200, 50, 4), 0.5),
+        virtual=virtual, freq=BUS_FREQ, overhead_us=BUS_OVERHEAD_US,
+    )
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# only firmware code counts towards the bytes held per operation, not the simulator
+_FIRMWARE = (
+    tracemalloc.Filter(True, os.path.join(_ROOT, "*")),
+    tracemalloc.Filter(False, os.path.join(_ROOT, "sim", "*")),
+    tracemalloc.Filter(False, os.path.join(_ROOT, "bench", "*")),
+)
+
+def _firmware_memory(snapshot) -> int:
+    return sum(stat.size for stat in snapshot.filter_traces(_FIRMWARE).statistics("filename"))
+
+def _measure(func, iterations:int) -> dict:
+    # host time and allocations of `iterations` calls
+    func()
+    tracemalloc.start()
+    start_memory, _ = tracemalloc.get_traced_memory()
+    start_firmware = _firmware_memory(tracemalloc.take_snapshot())
+    tracemalloc.reset_peak()
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter_ns() - start
+    _, peak = tracemalloc.get_traced_memory()
+    end_firmware = _firmware_memory(tracemalloc.take_snapshot())
+    tracemalloc.stop()
+    # tracing slows the calls down, time them again without it, best of a few runs
+    for _ in range(_TIMING_REPEATS):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            func()
+        elapsed = min(elapsed, time.perf_counter_ns() - start)
+    return {
+        "host_us_per_op": round(elapsed / iterations / 1000, 3),
+        "alloc_bytes_per_op": round((end_firmware - start_firmware) / iterations, 2),
+        "alloc_peak_bytes": peak - start_memory,
+    }
+
+def _bus_metrics(simulation:sim.Simulation, func, iterations:int) -> dict:
+    # simulated time and bus traffic of `iterations` calls
+    bus = simulation.i2c
+    bus.reset_counters()
+    start = simulation.clock.now_us()
+    for _ in range(iterations):
+        func()
+    elapsed = simulation.clock.now_us() - start
+    return {
+        "sim_us_per_op": round(elapsed / iterations, 2),
+        "sim_transactions_per_op": round(bus.transactions / iterations, 3),
+        "sim_bytes_per_op": round((bus.bytes_read + bus.bytes_written) / iterations, 2),
+    }
+
+def _mcp9600(simulation:sim.Simulation, profile:str="fast", cache:bool=False):
+    from thermocouple import MCP9600
+    mcp = MCP9600(simulation.i2c, address=0x60)
+    mcp.set_profile(profile)
+    if cache: mcp.enable_register_cache()
+    return mcp
+
+@benchmark("mcp9600.read_all")
+def read_all(*, quick:bool=False) -> dict:
+    simulation = _install()
+    try:
+        mcp = _mcp9600(simulation)
+        iterations = 200 if quick else 2000
+        metrics = _bus_metrics(simulation, mcp.read_all, iterations)
+        metrics["sim_reads_per_s"] = round(1_000_000 / metrics["sim_us_per_op"], 1)
+        metrics.update(_measure(mcp.read_all, iterations))
+        return metrics
+    finally:
+        simulation.uninstall()
+
+@benchmark("mcp9600.read_if_ready")
+def read_if_ready(*, quick:bool=False) -> dict:
+    # polls as the sampling task does, every `poll_ms`, and counts conversions delivered
+    simulation = _install()
+    try:
+        mcp = _mcp9600(simulation)
+        samples = 100 if quick else 1000
+        poll_ms = 1
+        bus = simulation.i2c
+        bus.reset_counters()
+        start = simulation.clock.now_us()
+        count = 0
+        while count < samples:
+            if mcp.read_if_ready() is None:
+                time.sleep_ms(poll_ms)
+            else:
+                count += 1
+        elapsed = simulation.clock.now_us() - start
+        metrics = {
+            "sim_samples_per_s": round(samples * 1_000_000 / elapsed, 1),
+            "sim_transactions_per_sample": round(bus.transactions / samples, 3),
+            "sim_bus_busy_fraction": round(bus.busy_us / elapsed, 4),
+        }
+
+        def ready_read():
+            # the cost of one delivered sample, skipping the wait for the conversion
+            simulation.devices[0x60].registers[0x04][0] |= 0x40
+            mcp.read_if_ready()
+        metrics.update(_measure(ready_read, samples))
+        return metrics
+    finally:
+        simulation.uninstall()
+
+@benchmark("mcp9600.burst")
+def burst(*, quick:bool=False) -> dict:
+    simulation = _install()
+    try:
+        from thermocouple import MCP9600
+        mcp = _mcp9600(simulation)
+        return _bus_metrics(simulation, lambda: mcp.read_burst(MCP9600.BURST_SAMPLES_4), 10 if quick else 50)
+    finally:
+        simulation.uninstall()
+
+@benchmark("descriptors")
+def descriptors(*, quick:bool=False) -> dict:
+    simulation = _install()
+    try:
+        iterations = 200 if quick else 2000
+        metrics = {}
+        for cache in (False, True):
+            mcp = _mcp9600(simulation, cache=cache)
+            suffix = "_cached" if cache else ""
+            cases = {
+                "rwbits_get": lambda: mcp.adc_resolution,
+                "rwbits_set": lambda: setattr(mcp, "adc_resolution", 3),
+                "rwbit_get": lambda: mcp.ambient_resolution,
+                "rwbit_set": lambda: setattr(mcp, "ambient_resolution", 1),
+                "struct_set": lambda: setattr(mcp, "_alert_1_temperature_limit", 640),
+            }
+            for name, func in cases.items():
+                bus = _bus_metrics(simulation, func, iterations)
+                host = _measure(func, iterations)
+                metrics[f"{name}{suffix}_sim_transactions"] = bus["sim_transactions_per_op"]
+                metrics[f"{name}{suffix}_host_us"] = host["host_us_per_op"]
+                metrics[f"{name}{suffix}_alloc_bytes"] = host["alloc_bytes_per_op"]
+        return metrics
+    finally:
+        simulation.uninstall()
+
+@benchmark("logger.write_log")
+def logger(*, quick:bool=False) -> dict:
+    simulation = _install()
+    try:
+        from log import Logger
+        iterations = 500 if quick else 5000
+        metrics = {}
+        with tempfile.TemporaryDirectory() as folder:
+            for deferred in (0, 256):
+                log = Logger(os.path.join(folder, f"log{deferred}.txt"), deferred_entries=deferred)
+                suffix = "_deferred" if deferred else ""
+                # the sampling loop's call
+                host = _measure(lambda: log.write_info("{} {} {} {}", 1234, 56, 789, 1), iterations)
+                log.close()
+                metrics[f"host_us_per_op{suffix}"] = host["host_us_per_op"]
+                metrics[f"alloc_bytes_per_op{suffix}"] = host["alloc_bytes_per_op"]
+                metrics[f"alloc_peak_bytes{suffix}"] = host["alloc_peak_bytes"]
+            # the sampling loop's share in deferred mode: a ring that never fills, formatted afterwards
+            best = None
+            for repeat in range(_TIMING_REPEATS):
+                log = Logger(os.path.join(folder, f"ring{repeat}.txt"), deferred_entries=iterations)
+                start = time.perf_counter_ns()
+                for _ in range(iterations - 1):
+                    log.write_info("{} {} {} {}", 1234, 56, 789, 1)
+                elapsed = time.perf_counter_ns() - start
+                log.close()
+                best = elapsed if best is None else min(best, elapsed)
+            metrics["host_us_per_write_deferred"] = round(best / (iterations - 1) / 1000, 3)
+        return metrics
+    finally:
+        simulation.uninstall()
+
+@benchmark("control_loop")
+def control_loop(*, quick:bool=False) -> dict:
+    # the scheduler on the simulated board, with the run pin toggling every 100 ms
+    simulation = _install(virtual=False)
+    try:
+        sys.modules.pop("pins", None)
+        import pins
+        from scheduler import Runtime
+
+        pins.thermocouple.set_profile("fast")
+        pins.run_pin.enable_irq(debounce_ms=pins.RUN_PIN_DEBOUNCE_MS)
+        samples = []
+        runtime = Runtime(
+            run_pin=pins.run_pin,
+            relays=(pins.valve, pins.mosfet),
+            thermocouple=pins.thermocouple,
+            on_sample=lambda sample: samples.append(sample.ticks),
+        )
+        seconds = 0.5 if quick else 2.0
+
+        async def scenario():
+            task = asyncio.create_task(runtime.main())
+            level = 0
+            for _ in range(int(seconds * 10)):
+                await asyncio.sleep(0.1)
+                level ^= 1
+                simulation.set_input(0, level)
+            runtime.stop()
+            await task
+
+        simulation.i2c.reset_counters()
+        asyncio.run(scenario())
+        latencies = simulation.actuation_latencies_us(pins.VALVE_RELAY)
+        pins.run_pin.disable_irq()
+        return {
+            "host_samples_per_s": round(len(samples) / seconds, 1),
+            # polling follows host timing, so this one is not deterministic
+            "host_transactions_per_sample": round(simulation.i2c.transactions / max(1, len(samples)), 3),
+            "host_actuation_us_mean": sum(latencies) // max(1, len(latencies)),
+            "host_actuation_us_max": max(latencies, default=0),
+        }
+    finally:
+        sys.modules.pop("pins", None)
+        simulation.uninstall()
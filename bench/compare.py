@@ -0,0 +1,61 @@
+"""Compares benchmark results against a baseline"""
+
+HOST_PREFIX = "host_"
+# depend on the interpreter and on what ran before, simulator allocations included
+REPORT_ONLY_PREFIX = "alloc_peak_"
+
+def higher_is_better(metric:str) -> bool:
+    return metric.endswith("_per_s")
+
+def _change(base:float, value:float, metric:str) -> float|None:
+    # relative change, positive is worse, `None` for a regression from 0
+    worse = (base - value) if higher_is_better(metric) else (value - base)
+    if base != 0: return worse / abs(base)
+    return None if worse > 0 else 0.0
+
+def compare(results:dict, baseline:dict, *, tolerance:float=0.05, host_tolerance:float|None=None) -> list:
+    """Checks every metric present in both results against the baseline
+
+    Parameters
+    ----------
+    results, baseline : `dict`
+        Output of `bench.run()`
+    tolerance : `float`
+        Allowed relative regression of deterministic metrics
+    host_tolerance : `float | None`
+        Allowed relative regression of `host_*` metrics\n
+        If `None` they are reported but never count as regressions, as host timing
+        varies too much between runs to gate on\n
+        `alloc_peak_*` metrics are always reported only
+
+    Returns
+    -------
+    rows : `list[tuple[str, str, float, float, float | None, bool]]`
+        `(benchmark, metric, baseline, value, relative change, regressed)`, with the change
+        signed so that positive is worse
+    """
+
+    rows = []
+    for name, metrics in results["benchmarks"].items():
+        base_metrics = baseline.get("benchmarks", {}).get(name, {})
+        for metric, value in metrics.items():
+            if metric not in base_metrics: continue
+            base = base_metrics[metric]
+            if metric.startswith(REPORT_ONLY_PREFIX): allowed = None
+            else: allowed = host_tolerance if HOST_PREFIX in metric else tolerance
+            if allowed is None:
+                rows.append((name, metric, base, value, _change(base, value, metric), False))
+                continue
+            change = _change(base, value, metric)
+            regressed = change is None or change > allowed
+            rows.append((name, metric, base, value, change, regressed))
+    return rows
+
+def format_rows(rows:list) -> str:
+    """Formats `compare()` rows as a table, regressions marked with `!`"""
+    lines = []
+    for name, metric, base, value, change, regressed in rows:
+        change_text = "new" if change is None else f"{change:+.1%}"
+        marker = "!" if regressed else " "
+        lines.append(f"{marker} {name:<24} {metric:<36} {base:>12} -> {value:<12} {change_text}")
+    return "\n".join(lines)
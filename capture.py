@@ -0,0 +1,151 @@
+"""High-rate capture of thermocouple data around run-pin transitions
+
+Keeps a continuous pre-trigger window of samples in RAM; on a trigger, switches the
+MCP9600 to its fastest conversion profile, records a post-trigger window, then restores
+the previous configuration
+
+Each event is written atomically as its own binary sample log (`event{n}.bin`, readable
+with `log.decode`): the file is written under a temporary name and renamed when complete
+
+The status register is not kept in the sample windows and is recorded as 0
+"""
+
+import os
+import struct
+
+from samples import SampleStore
+from log.binary import header, RECORD_FORMAT, RECORD_SIZE
+from log.rotation import LogSequence
+
+class TriggerCapture:
+    """
+    Pre/post-trigger capture of thermocouple samples
+
+    Feed every sample to `add()` and call `trigger()` on each run-pin edge\n
+    `write_pending()` does the flash write, so it can run outside the sampling task
+    """
+
+    capturing: bool
+    pending: bool
+
+    def __init__(self, thermocouple, *, pre_samples:int=256, post_samples:int=512,
+                 folder:str="logs/", max_files:int|None=None, profile:str="fast"):
+        """
+        Parameters
+        ----------
+        thermocouple : `thermocouple.MCP9600`
+            Device to reconfigure during the post-trigger window
+        pre_samples, post_samples : `int`
+            Length of the windows before and after the trigger
+        folder : `str`
+            Folder for the event files
+        max_files : `int | None`
+            Number of event files to keep, the oldest are deleted
+        profile : `str`
+            Conversion profile used during the post-trigger window
+        """
+
+        self.thermocouple = thermocouple
+        self.profile = profile
+        self.pre = SampleStore(pre_samples)
+        self.post = SampleStore(post_samples)
+        self.capturing = False
+        self.pending = False
+        self.trigger_ticks = 0
+        self._sequence = LogSequence(folder, prefix="event", suffix=".bin", max_files=max_files)
+        self._saved_config = None
+
+        # whole event file, packed when the capture completes and written in one go
+        self._header = header()
+        self._event = bytearray(len(self._header) + (pre_samples + post_samples) * RECORD_SIZE)
+        self._event[:len(self._header)] = self._header
+        self._event_length = 0
+
+    def add(self, snapshot, relay:int=0) -> bool:
+        """Adds one sample to the current window
+
+        Parameters
+        ----------
+        snapshot : `thermocouple.Snapshot`
+            The reading
+        relay : `int`
+            Relay state at the time of the reading
+
+        Returns
+        -------
+        finished : `bool`
+            Whether this sample completed a capture, which restores the previous
+            conversion profile
+        """
+
+        if not self.capturing:
+            self.pre.append_snapshot(snapshot, relay)
+            return False
+        self.post.append_snapshot(snapshot, relay)
+        if len(self.post) < self.post.capacity: return False
+        self._finish()
+        return True
+
+    def trigger(self, ticks:int) -> bool:
+        """Starts a capture, unless one is running or waiting to be written
+
+        Parameters
+        ----------
+        ticks : `int`
+            `time.ticks_ms()` of the trigger
+
+        Returns
+        -------
+        started : `bool`
+            Whether a capture was started, which switches the conversion profile
+        """
+
+        if self.capturing or self.pending: return False
+        mcp = self.thermocouple
+        self._saved_config = (mcp.adc_resolution, mcp.ambient_resolution, mcp.filter_coefficient)
+        mcp.set_profile(self.profile)
+        self.trigger_ticks = ticks
+        self.capturing = True
+        return True
+
+    def _finish(self) -> None:
+        mcp = self.thermocouple
+        with mcp.batch():
+            mcp.adc_resolution, mcp.ambient_resolution, mcp.filter_coefficient = self._saved_config
+        self.capturing = False
+
+        offset = len(self._header)
+        for store in (self.pre, self.post):
+            for i in range(len(store)):
+                j = store.slot(i)
+                struct.pack_into(
+                    RECORD_FORMAT, self._event, offset,
+                    store.ticks[j], store.hot[j], store.delta[j], store.cold[j], 0, store.relay[j]
+                )
+                offset += RECORD_SIZE
+        self._event_length = offset
+        self.pre.clear()
+        self.post.clear()
+        self.pending = True
+
+    def write_pending(self) -> str|None:
+        """Writes a completed capture to its event file, if there is one
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        path : `str | None`
+            The event file written, or `None` if no capture was pending
+        """
+
+        if not self.pending: return None
+        path = self._sequence.next_path()
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(memoryview(self._event)[:self._event_length])
+        os.rename(temp_path, path)
+        self.pending = False
+        return path
@@ -0,0 +1,222 @@
+"""Thermocouple acquisition on the RP2040's second core
+
+`CoreSampler` runs `MCP9600.read_if_ready()` in a loop on core 1 with `_thread` and hands
+each sample to core 0 through a `SampleRing`, a preallocated single-producer/single-consumer
+ring, so flash writes and serial output on core 0 no longer delay acquisition
+
+The ring takes no lock: core 1 only writes the head index and core 0 only writes the tail
+index, each a single word store into an `array`\n
+Nothing on the core 1 side allocates, so it never waits on the garbage collector
+
+While the sampler runs the MCP9600 belongs to core 1, reconfigure it only when stopped
+"""
+
+import time
+from array import array
+
+import _thread
+
+from thermocouple import Snapshot
+
+_HEAD = 0
+_TAIL = 1
+
+class SampleRing:
+    """
+    Lock-free single-producer/single-consumer ring of thermocouple samples
+
+    When full, new samples are dropped and counted rather than overwriting unread ones
+    """
+
+    capacity: int
+    dropped: int
+
+    def __init__(self, capacity:int):
+        """
+        Parameters
+        ----------
+        capacity : `int`
+            Number of samples the ring holds
+        """
+
+        self.capacity = capacity
+        # one slot is kept free to tell a full ring from an empty one
+        size = capacity + 1
+        self._size = size
+        self.ticks = array("i", [0] * size)
+        self.hot = array("h", [0] * size)
+        self.delta = array("h", [0] * size)
+        self.cold = array("h", [0] * size)
+        self.status = bytearray(size)
+        self._index = array("I", [0, 0])
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return (self._index[_HEAD] - self._index[_TAIL]) % self._size
+
+    def push(self, snapshot) -> bool:
+        """Copies a sample into the ring, producer side only
+
+        Parameters
+        ----------
+        snapshot : `thermocouple.Snapshot`
+            The reading
+
+        Returns
+        -------
+        pushed : `bool`
+            `False` if the ring was full and the sample was dropped
+        """
+
+        head = self._index[_HEAD]
+        following = head + 1
+        if following == self._size: following = 0
+        if following == self._index[_TAIL]:
+            self.dropped += 1
+            return False
+        self.ticks[head] = snapshot.ticks
+        self.hot[head] = snapshot.hot
+        self.delta[head] = snapshot.delta
+        self.cold[head] = snapshot.cold
+        self.status[head] = snapshot.status
+        # publish only once the slot is filled
+        self._index[_HEAD] = following
+        return True
+
+    def pop(self, snapshot) -> bool:
+        """Copies the oldest sample out of the ring, consumer side only
+
+        Parameters
+        ----------
+        snapshot : `thermocouple.Snapshot`
+            Record to fill in place
+
+        Returns
+        -------
+        popped : `bool`
+            `False` if the ring was empty
+        """
+
+        tail = self._index[_TAIL]
+        if tail == self._index[_HEAD]: return False
+        snapshot.ticks = self.ticks[tail]
+        snapshot.hot = self.hot[tail]
+        snapshot.delta = self.delta[tail]
+        snapshot.cold = self.cold[tail]
+        snapshot.status = self.status[tail]
+        tail += 1
+        # free the slot only once it is read
+        self._index[_TAIL] = 0 if tail == self._size else tail
+        return True
+
+class CoreSampler:
+    """
+    Samples an MCP9600 on core 1 and queues the readings for core 0
+
+    Has the same `read_if_ready()` and `conversion_period_ms` as `MCP9600`, so it can be
+    passed to `scheduler.Runtime` in its place; the runtime then drains every queued sample
+    """
+
+    queued = True  # tells `scheduler.Runtime` to drain all waiting samples each period
+    running: bool
+
+    def __init__(self, thermocouple, *, capacity:int=256, poll_ms:int|None=None):
+        """
+        Parameters
+        ----------
+        thermocouple : `thermocouple.MCP9600`
+            The device, used only from core 1 while running
+        capacity : `int`
+            Number of samples that can wait for core 0
+        poll_ms : `int | None`
+            Wait between data-ready checks on core 1\n
+            If `None` a quarter of the conversion period is used
+        """
+
+        self.thermocouple = thermocouple
+        self.ring = SampleRing(capacity)
+        self.snapshot = Snapshot()
+        self.poll_ms = poll_ms
+        self.running = False
+        self._stopped = True
+        # read over I2C only while core 1 is not using the bus, `scheduler.Runtime` asks
+        # before `start()` and its sample task asks again while running
+        self._conversion_period_ms = thermocouple.conversion_period_ms
+
+    @property
+    def conversion_period_ms(self) -> int:
+        """Conversion period of the device, as of the last `start()`"""
+        return self._conversion_period_ms
+
+    @property
+    def dropped(self) -> int:
+        """Samples lost because core 0 fell behind by more than the ring capacity"""
+        return self.ring.dropped
+
+    def start(self) -> None:
+        """Starts acquisition on core 1
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        if self.running: return
+        self._conversion_period_ms = self.thermocouple.conversion_period_ms
+        poll_ms = self.poll_ms
+        if poll_ms is None: poll_ms = max(1, self._conversion_period_ms // 4)
+        self.running = True
+        self._stopped = False
+        _thread.start_new_thread(self._acquire, (poll_ms,))
+
+    def _acquire(self, poll_ms:int) -> None:
+        thermocouple = self.thermocouple
+        ring = self.ring
+        try:
+            while self.running:
+                sample = thermocouple.read_if_ready()
+                if sample is None:
+                    time.sleep_ms(poll_ms)
+                    continue
+                ring.push(sample)
+        finally:
+            self.running = False
+            self._stopped = True
+
+    def stop(self) -> None:
+        """Stops acquisition and waits for core 1 to finish its current read
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self.running = False
+        while not self._stopped:
+            time.sleep_ms(1)
+
+    def read_if_ready(self, snapshot=None):
+        """Takes the oldest queued sample
+
+        Parameters
+        ----------
+        snapshot : `Snapshot | None`
+            Record to fill, `self.snapshot` if `None`
+
+        Returns
+        -------
+        snapshot : `Snapshot | None`
+            The filled record, or `None` if no sample is waiting
+        """
+
+        if snapshot is None: snapshot = self.snapshot
+        if not self.ring.pop(snapshot): return None
+        return snapshot
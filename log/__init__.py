@@ -1,8 +1,9 @@
 from .logger import Logger
+from .binary import SampleLog
 
 _GLOBAL_LOGGER = None
 
-def init_global_logger(*, filename:str|None=None, folder:str|None=None) -> None:
+def init_global_logger(*, filename:str|None=None, folder:str|None=None, **kwargs) -> None:
     """Initializes global logger, which can be accessed through `global_logger()`
     Ideally, should only be called once
         
@@ -14,6 +15,8 @@ def init_global_logger(*, filename:str|None=None, folder:str|None=None) -> None:
     folder : `str | None`
         The folder in which to place the log\n
         If `None` cwd will be used
+    **kwargs
+        Passed on to `Logger()` or `Logger.new_file()`, e.g. `max_bytes` and `max_files`
 
     Returns
     -------
@@ -22,9 +25,9 @@ def init_global_logger(*, filename:str|None=None, folder:str|None=None) -> None:
 
     global _GLOBAL_LOGGER
     if filename is None:
-        _GLOBAL_LOGGER = Logger.new_file("logs/" if folder is None else folder)
+        _GLOBAL_LOGGER = Logger.new_file("logs/" if folder is None else folder, **kwargs)
         return
-    _GLOBAL_LOGGER = Logger(filename)
+    _GLOBAL_LOGGER = Logger(filename, **kwargs)
 
 def global_logger() -> Logger:
     """Retrieves global logger, which must first be initialized through `init_global_logger()`
@@ -39,4 +42,19 @@ def global_logger() -> Logger:
     """
 
     if _GLOBAL_LOGGER is None: raise Exception("No global logger")
-    return _GLOBAL_LOGGER
\ No newline at end of file
+    return _GLOBAL_LOGGER
+
+def close_global_logger() -> None:
+    """Flushes and closes the global logger, if it was initialized\n
+    Safe to call more than once, and from a `finally` block on shutdown
+        
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None : `None`
+    """
+
+    if _GLOBAL_LOGGER is not None: _GLOBAL_LOGGER.close()
@@ -0,0 +1,193 @@
+"""Implements `SampleLog` class, which writes samples as fixed-size binary records
+
+Each record is one struct-packed thermocouple sample, 12 bytes instead of ~40 bytes of text
+
+The file starts with a header that describes the record schema, so `log.decode` can read
+logs written by any version of this module
+
+File layout
+-----------
+header : `bytes`
+    `MAGIC`, then `<BBBB` version, record size, temperature scale and spec length,
+    then the spec: the record struct format and comma separated field names, e.g.
+    `"<IhhhBB ticks,hot,delta,cold,status,relay"`
+records : `bytes`
+    Records packed with the header's struct format, back to back
+"""
+
+import struct
+
+from .buffer import BlockWriter
+from .rotation import LogSequence
+
+MAGIC = b"SPXB"
+VERSION = 1
+
+RECORD_FORMAT = "<IhhhBB"
+RECORD_FIELDS = ("ticks", "hot", "delta", "cold", "status", "relay")
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+# temperatures are stored as they come from the MCP9600, in 1/16 degrees Celsius
+TEMPERATURE_SCALE = 16
+TEMPERATURE_FIELDS = ("hot", "delta", "cold")
+
+HEADER_FORMAT = "<BBBB"
+
+def header() -> bytes:
+    """Builds the file header for the current record schema
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    header : `bytes`
+    """
+
+    spec = (RECORD_FORMAT + " " + ",".join(RECORD_FIELDS)).encode()
+    return MAGIC + struct.pack(HEADER_FORMAT, VERSION, RECORD_SIZE, TEMPERATURE_SCALE, len(spec)) + spec
+
+class SampleLog:
+    """
+    Writes thermocouple samples to a binary log file as fixed-size records
+
+    Records are packed into a preallocated buffer and written through a `BlockWriter`,
+    so logging a sample does not format any text
+    """
+
+    _writer: BlockWriter
+
+    def __init__(self, filename:str, *, buffer_size:int=4096, flush_interval_ms:int|None=5000,
+                 max_bytes:int|None=None, sequence:LogSequence|None=None):
+        """
+        Parameters
+        ----------
+        filename : `str`
+            The log file, appended to if it exists
+        buffer_size : `int`
+            Size of the RAM buffer, and of the chunks written to flash
+        flush_interval_ms : `int | None`
+            Longest time a record may stay buffered
+        max_bytes : `int | None`
+            Size at which the log is rotated to the next file of `sequence`\n
+            If `None` the log is never rotated
+        sequence : `LogSequence | None`
+            Numbering used to name rotated logs, required for `max_bytes`
+        """
+
+        if max_bytes is not None and sequence is None:
+            raise Exception("`SampleLog` rotation needs a `LogSequence`")
+        self._filename = filename
+        self._max_bytes = max_bytes
+        self._sequence = sequence
+        self._writer = BlockWriter(filename, block_size=buffer_size, flush_interval_ms=flush_interval_ms)
+        if self._writer.size == 0: self._writer.write(header())
+        self._record = bytearray(RECORD_SIZE)
+
+    @classmethod
+    def new_file(cls, log_folder:str, *, max_bytes:int|None=None, max_files:int|None=None, **kwargs) -> "SampleLog":
+        """Creates a new binary log in `log_folder` without overwriting previous logs\n
+        Logs are numbered `log1.bin`, `log2.bin`, ... through a `LogSequence`
+
+        Parameters
+        ----------
+        log_folder : `str`
+            The folder in which to place the logs
+        max_bytes : `int | None`
+            Size at which the log is rotated to the next number
+        max_files : `int | None`
+            Number of logs to keep in `log_folder`, the oldest are deleted
+        **kwargs
+            Passed on to `SampleLog()`
+
+        Returns
+        -------
+        SampleLog : `SampleLog`
+        """
+
+        sequence = LogSequence(log_folder, suffix=".bin", max_files=max_files)
+        return cls(sequence.next_path(), max_bytes=max_bytes, sequence=sequence, **kwargs)
+
+    def rotate(self) -> None:
+        """Closes the current log file and continues in the next file of the sequence,
+        starting it with a new header
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        if self._sequence is None: raise Exception("`SampleLog` rotation needs a `LogSequence`")
+        self._filename = self._sequence.next_path()
+        self._writer.reopen(self._filename)
+        if self._writer.size == 0: self._writer.write(header())
+
+    def write_sample(self, sample, relay:int=0) -> None:
+        """Appends one sample record
+
+        Parameters
+        ----------
+        sample : `thermocouple.Snapshot`
+            The reading to record
+        relay : `int`
+            Relay state at the time of the reading
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        struct.pack_into(
+            RECORD_FORMAT, self._record, 0,
+            sample.ticks, sample.hot, sample.delta, sample.cold, sample.status, relay
+        )
+        self._writer.write(self._record)
+        if self._max_bytes is not None and self._writer.size >= self._max_bytes: self.rotate()
+
+    def flush(self) -> None:
+        """Writes all buffered records to the log file
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self._writer.flush()
+
+    def flush_if_due(self) -> None:
+        """Writes buffered records if `flush_interval_ms` has passed since the last flush
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self._writer.flush_if_due()
+
+    def close(self) -> None:
+        """Flushes buffered records and closes the log file\n
+        Safe to call more than once
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self._writer.close()
@@ -0,0 +1,153 @@
+"""Implements `BlockWriter` class, which buffers writes to a file
+
+Keeps one append handle open for the lifetime of the writer
+
+Collects data in a preallocated RAM buffer and writes it in flash-block-sized chunks
+"""
+
+import time
+
+_DEFAULT_BLOCK_SIZE = 4096 # RP2040 flash erase block
+
+class BlockWriter:
+    """
+    Keeps one append handle open for the lifetime of the writer
+
+    Collects data in a preallocated RAM buffer and writes it in flash-block-sized chunks,
+    when the buffer fills, when `flush_interval_ms` has passed since the last flush, or
+    when `flush()` is called
+    """
+
+    filename: str
+
+    def __init__(self, filename:str, *, block_size:int=_DEFAULT_BLOCK_SIZE, flush_interval_ms:int|None=None):
+        """
+        Parameters
+        ----------
+        filename : `str`
+            The file to append to
+        block_size : `int`
+            Size of the RAM buffer, and of the chunks written to the file
+        flush_interval_ms : `int | None`
+            Longest time buffered data may wait before being written\n
+            If `None` data is only written when the buffer fills or on `flush()`
+        """
+
+        self.filename = filename
+        self._file = open(filename, "ab")
+        self._buffer = bytearray(block_size)
+        self._view = memoryview(self._buffer)
+        self._length = 0
+        self._flush_interval_ms = flush_interval_ms
+        self._last_flush = time.ticks_ms()
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    @property
+    def size(self) -> int:
+        """Size of the file including buffered data, in bytes"""
+        if self._file is None: return 0
+        return self._file.tell() + self._length
+
+    def write(self, data:bytes) -> None:
+        """Buffers `data`, writing out every block that fills up
+
+        Parameters
+        ----------
+        data : `bytes`
+            Data to append
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        if self._file is None: raise Exception("`BlockWriter` is closed")
+        data = memoryview(data)
+        block_size = len(self._buffer)
+        offset = 0
+        while offset < len(data):
+            count = min(len(data) - offset, block_size - self._length)
+            self._view[self._length:self._length + count] = data[offset:offset + count]
+            self._length += count
+            offset += count
+            if self._length == block_size:
+                self._file.write(self._buffer)
+                self._length = 0
+
+        self.flush_if_due()
+
+    def flush_if_due(self) -> None:
+        """Flushes if `flush_interval_ms` has passed since the last flush
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        if self._flush_interval_ms is None: return
+        if time.ticks_diff(time.ticks_ms(), self._last_flush) >= self._flush_interval_ms:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes all buffered data to the file
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        if self._file is None: return
+        if self._length:
+            self._file.write(self._view[:self._length])
+            self._length = 0
+        self._file.flush()
+        self._last_flush = time.ticks_ms()
+
+    def reopen(self, filename:str) -> None:
+        """Flushes and closes the current file, then continues appending to `filename`
+
+        Parameters
+        ----------
+        filename : `str`
+            The file to append to from now on
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self.close()
+        self.filename = filename
+        self._file = open(filename, "ab")
+        self._last_flush = time.ticks_ms()
+
+    def close(self) -> None:
+        """Flushes and closes the file\n
+        Safe to call more than once
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        if self._file is None: return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,178 @@
+"""Decodes binary sample logs written by `log.binary.SampleLog`
+
+Runs on the host, not on the board
+
+Reads the file header to find the record schema, then exports records as CSV or
+loads them into a NumPy structured array in one read
+
+Usage
+-----
+`python -m log.decode log1.bin` prints CSV to stdout\n
+`python -m log.decode log1.bin -o log1.csv` writes CSV to a file
+"""
+
+import struct
+import sys
+
+from .binary import MAGIC, HEADER_FORMAT, TEMPERATURE_FIELDS
+
+# struct codes to NumPy dtype codes
+_NUMPY_CODES = {
+    "b": "i1", "B": "u1", "h": "i2", "H": "u2",
+    "i": "i4", "I": "u4", "l": "i4", "L": "u4", "q": "i8", "Q": "u8",
+    "f": "f4", "d": "f8",
+}
+
+class Schema:
+    """
+    Record schema read from a binary log header
+    """
+
+    version: int
+    record_format: str
+    record_size: int
+    fields: tuple
+    temperature_scale: int
+    header_size: int
+
+    def __init__(self, version:int, record_format:str, fields:tuple, temperature_scale:int, header_size:int):
+        self.version = version
+        self.record_format = record_format
+        self.record_size = struct.calcsize(record_format)
+        self.fields = fields
+        self.temperature_scale = temperature_scale
+        self.header_size = header_size
+
+def read_schema(file) -> Schema:
+    """Reads the header at the start of a binary log
+
+    Parameters
+    ----------
+    file : `BinaryIO`
+        Binary log opened for reading, positioned at the start
+
+    Returns
+    -------
+    schema : `Schema`
+    """
+
+    magic = file.read(len(MAGIC))
+    if magic != MAGIC: raise ValueError("Not a binary sample log")
+    fixed = file.read(struct.calcsize(HEADER_FORMAT))
+    version, record_size, temperature_scale, spec_length = struct.unpack(HEADER_FORMAT, fixed)
+    record_format, fields = file.read(spec_length).decode().split(" ")
+    schema = Schema(
+        version, record_format, tuple(fields.split(",")), temperature_scale,
+        len(MAGIC) + len(fixed) + spec_length,
+    )
+    if schema.record_size != record_size: raise ValueError("Corrupt binary log header")
+    return schema
+
+def iter_records(filename:str):
+    """Yields each record of a binary log as a tuple of raw field values\n
+    A truncated final record (e.g. from a power loss mid-write) is skipped
+
+    Parameters
+    ----------
+    filename : `str`
+        The binary log
+
+    Returns
+    -------
+    records : `Iterator[tuple]`
+    """
+
+    with open(filename, "rb") as file:
+        schema = read_schema(file)
+        unpacker = struct.Struct(schema.record_format)
+        while True:
+            data = file.read(schema.record_size)
+            if len(data) < schema.record_size: return
+            yield unpacker.unpack(data)
+
+def to_csv(filename:str, out) -> None:
+    """Writes a binary log as CSV, with temperatures converted to degrees Celsius
+
+    Parameters
+    ----------
+    filename : `str`
+        The binary log
+    out : `TextIO`
+        Where to write the CSV
+
+    Returns
+    -------
+    None : `None`
+    """
+
+    with open(filename, "rb") as file:
+        schema = read_schema(file)
+    scaled = [field in TEMPERATURE_FIELDS for field in schema.fields]
+
+    out.write(",".join(schema.fields) + "\n")
+    for record in iter_records(filename):
+        out.write(",".join(
+            str(value / schema.temperature_scale) if scale else str(value)
+            for value, scale in zip(record, scaled)
+        ) + "\n")
+
+def to_numpy(filename:str, celsius:bool=True):
+    """Loads a binary log into a NumPy structured array in one read\n
+    Requires NumPy
+
+    Parameters
+    ----------
+    filename : `str`
+        The binary log
+    celsius : `bool`
+        Convert temperature fields to float degrees Celsius\n
+        If `False` they are left in raw register units
+
+    Returns
+    -------
+    records : `numpy.ndarray`
+        Structured array with one field per record field
+    """
+
+    import numpy as np
+
+    with open(filename, "rb") as file:
+        schema = read_schema(file)
+    byte_order = schema.record_format[0] if schema.record_format[0] in "<>!=" else "="
+    byte_order = ">" if byte_order == "!" else byte_order
+    dtype = np.dtype([
+        (field, byte_order + _NUMPY_CODES[code])
+        for field, code in zip(schema.fields, schema.record_format.lstrip("<>!=@"))
+    ])
+    raw = np.fromfile(filename, dtype=np.uint8, offset=schema.header_size)
+    raw = raw[:len(raw) - len(raw) % schema.record_size]
+    records = raw.view(dtype)
+    if not celsius: return records
+
+    converted = np.empty(len(records), dtype=[
+        (field, "f8" if field in TEMPERATURE_FIELDS else dtype[field])
+        for field in schema.fields
+    ])
+    for field in schema.fields:
+        if field in TEMPERATURE_FIELDS:
+            converted[field] = records[field] / schema.temperature_scale
+        else:
+            converted[field] = records[field]
+    return converted
+
+def main(argv:list|None=None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a SPARX binary sample log to CSV")
+    parser.add_argument("log", help="binary sample log")
+    parser.add_argument("-o", "--output", help="CSV file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.output is None:
+        to_csv(args.log, sys.stdout)
+        return
+    with open(args.output, "w") as out:
+        to_csv(args.log, out)
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,21 @@ Formats logs, with log types such as warning or error
 
 Automatically timestamps log entries
 
-Able to create a new log in a folder without overwriting previous logs
+Able to create a new log in a folder without overwriting previous logs, and to
+rotate to a new log once the current one reaches a size limit
+
+Buffers entries in RAM and appends them to the file in flash-block-sized chunks
+
+Can defer formatting: entries are then recorded raw in a preallocated ring and only
+formatted when the ring is flushed. Messages given with positional arguments are format
+strings, so building the text is deferred along with the rest of the entry
 """
 
 import time
-import os
-import re
+from array import array
+
+from .buffer import BlockWriter
+from .rotation import LogSequence
 
 _DEFAULT_FORMAT_STR = "{timestamp} | {type} | {message}"
 
@@ -21,6 +30,12 @@ _DEFAULT_TYPE_STRINGS = {
     "error": "ERR",
 }
 
+# log types that are written out immediately
+_DEFAULT_FLUSH_TYPES = ("error",)
+
+# format arguments kept per deferred entry, entries with more are formatted when written
+_DEFERRED_ARGS = 6
+
 class Logger:
     """
     Opens specified file, and tracks its file handler
@@ -30,57 +45,193 @@ class Logger:
     Automatically timestamps log entries
 
     Able to create a new log in a folder without overwriting previous logs
+
+    Keeps one append handle open and buffers entries in RAM, flushing in
+    flash-block-sized chunks, after `flush_interval_ms`, on error entries, and on `close()`
+
+    In deferred mode (`deferred_entries`), writing an entry only records its tick, type and
+    arguments in a preallocated ring; formatting happens when the ring fills, on error
+    entries, or on `flush()` and `close()`. On hot paths pass the message as a format string
+    with raw arguments, e.g. `write_info("{} {}", hot, cold)`, rather than an f-string
     """
 
     _filename: str
     _format_str = _DEFAULT_FORMAT_STR
-    _type_strings = _DEFAULT_TYPE_STRINGS
-    
-    # can't type file handler because micropython doesn't have typing module
+    _type_strings: dict
+    _flush_types = _DEFAULT_FLUSH_TYPES
+    _writer: BlockWriter
 
-    def __init__(self, filename:str):
+    def __init__(self, filename:str, *, buffer_size:int=4096, flush_interval_ms:int|None=5000,
+                 max_bytes:int|None=None, sequence:LogSequence|None=None, deferred_entries:int=0):
+        """
+        Parameters
+        ----------
+        filename : `str`
+            The log file, appended to if it exists
+        buffer_size : `int`
+            Size of the RAM buffer, and of the chunks written to flash
+        flush_interval_ms : `int | None`
+            Longest time an entry may stay buffered\n
+            If `None` entries are only written when the buffer fills, on error entries or on `flush()`
+        max_bytes : `int | None`
+            Size at which the log is rotated to the next file of `sequence`\n
+            If `None` the log is never rotated
+        sequence : `LogSequence | None`
+            Numbering used to name rotated logs, required for `max_bytes`
+        deferred_entries : `int`
+            Size of the ring of unformatted entries\n
+            If 0 entries are formatted as soon as they are written
+        """
+
+        if max_bytes is not None and sequence is None:
+            raise Exception("`Logger` rotation needs a `LogSequence`")
         self._filename = filename
+        self._max_bytes = max_bytes
+        self._sequence = sequence
+        self._writer = BlockWriter(filename, block_size=buffer_size, flush_interval_ms=flush_interval_ms)
+        # per-instance copy, so `set_type_string()` doesn't change other loggers
+        self._type_strings = dict(_DEFAULT_TYPE_STRINGS)
+
+        # deferred entries: type codes index `_type_names`, the rest is stored as written
+        self._type_names = list(self._type_strings)
+        self._type_codes = {name: code for code, name in enumerate(self._type_names)}
+        self._ring_ticks = array("i", [0] * deferred_entries)
+        self._ring_types = bytearray(deferred_entries)
+        self._ring_messages = [None] * deferred_entries
+        # `_DEFERRED_ARGS` slots per entry, so deferring doesn't keep a tuple per entry
+        self._ring_args = [None] * (deferred_entries * _DEFERRED_ARGS)
+        self._ring_arg_counts = bytearray(deferred_entries)
+        self._ring_kwargs = [None] * deferred_entries
+        self._ring_length = 0
 
     def _write_file(self, txt:str) -> None:
-        if self._filename is None: raise Exception("No `Logger` file handler")
-        with open(self._filename, "w+") as file:
-            file.write(txt)
+        if self._writer.closed: raise Exception("No `Logger` file handler")
+        self._writer.write(txt.encode())
+        self._writer.write(b"\n")
+        if self._max_bytes is not None and self._writer.size >= self._max_bytes: self.rotate()
 
-    @classmethod
-    def new_file(cls, log_folder:str) -> "Logger":
-        """Creates a new log file in `log_folder` without overwriting previous log files
+    def rotate(self) -> None:
+        """Closes the current log file and continues in the next file of the sequence
         
         Parameters
         ----------
-        log_folder : `str`
-            The folder in which to place the logs
+        None
 
         Returns
         -------
-        Logger : `Logger`
-            A `Logger` object with `filename` of a new log file
+        None : `None`
         """
 
-        logs: list[str] = os.listdir(log_folder)
+        if self._sequence is None: raise Exception("`Logger` rotation needs a `LogSequence`")
+        self._filename = self._sequence.next_path()
+        self._writer.reopen(self._filename)
+
+    def _format(self, timestamp:int, type_:str, message:str, args:tuple|None, kwargs:dict|None) -> str:
+        if args is not None: message = message.format(*args)
+        if kwargs is None:
+            return self._format_str.format(
+                timestamp = timestamp,
+                type = self._type_strings.get(type_, type_),
+                message = message,
+            )
+        return self._format_str.format(
+            timestamp = timestamp,
+            type = self._type_strings.get(type_, type_),
+            message = message,
+            **kwargs
+        )
+
+    def _format_deferred(self) -> None:
+        for i in range(self._ring_length):
+            first = i * _DEFERRED_ARGS
+            count = self._ring_arg_counts[i]
+            self._write_file(self._format(
+                self._ring_ticks[i],
+                self._type_names[self._ring_types[i]],
+                self._ring_messages[i],
+                tuple(self._ring_args[first:first + count]) if count else None,
+                self._ring_kwargs[i],
+            ))
+            # drop references so the arguments can be collected
+            self._ring_messages[i] = None
+            for j in range(first, first + count):
+                self._ring_args[j] = None
+            self._ring_kwargs[i] = None
+        self._ring_length = 0
+
+    def flush(self) -> None:
+        """Formats any deferred entries and writes all buffered entries to the log file
         
-        # pick highest log number
-        i = 0
-        for log in logs:
-            # find number in log file name
-            re_match = re.compile("log(\\d*).txt").match(log)
-            if re_match is None: continue
+        Parameters
+        ----------
+        None
 
-            digit:str = re_match.group(0)
+        Returns
+        -------
+        None : `None`
+        """
 
-            if len(digit) > 0:
-                int_dig = int(digit)
-                if int_dig > i: i = int_dig
+        self._format_deferred()
+        self._writer.flush()
 
-        # add trailing / if it's not there
-        if log_folder[-1] != "/": log_folder += "/"
+    def flush_if_due(self) -> None:
+        """Formats any deferred entries, and writes buffered entries if `flush_interval_ms` has
+        passed since the last flush
 
-        # use highest number + 1
-        return cls(log_folder+f"log{i+1}.txt")
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self._format_deferred()
+        self._writer.flush_if_due()
+
+    def close(self) -> None:
+        """Flushes buffered entries and closes the log file\n
+        Safe to call more than once
+        
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        if not self._writer.closed: self._format_deferred()
+        self._writer.close()
+
+    @classmethod
+    def new_file(cls, log_folder:str, *, max_bytes:int|None=None, max_files:int|None=None, **kwargs) -> "Logger":
+        """Creates a new log file in `log_folder` without overwriting previous log files\n
+        Logs are numbered `log1.txt`, `log2.txt`, ... through a `LogSequence`
+        
+        Parameters
+        ----------
+        log_folder : `str`
+            The folder in which to place the logs
+        max_bytes : `int | None`
+            Size at which the log is rotated to the next number\n
+            If `None` the log is never rotated
+        max_files : `int | None`
+            Number of logs to keep in `log_folder`, the oldest are deleted\n
+            If `None` no logs are deleted
+        **kwargs
+            Passed on to `Logger()`
+
+        Returns
+        -------
+        Logger : `Logger`
+            A `Logger` object with `filename` of a new log file
+        """
+
+        sequence = LogSequence(log_folder, max_files=max_files)
+        return cls(sequence.next_path(), max_bytes=max_bytes, sequence=sequence, **kwargs)
 
     def set_format_string(self, string:str) -> None:
         """Sets the log format string of the logger
@@ -114,7 +265,7 @@ class Logger:
 
         self._type_strings[key] = val
 
-    def write_log(self, type_:str, message:str, **kwargs:list[str]) -> None:
+    def write_log(self, type_:str, message:str, *args, **kwargs:list[str]) -> None:
         """Writes an entry to the log file
         
         Parameters
@@ -122,7 +273,10 @@ class Logger:
         type_ : `str`
             Log type (written to beginning of log entry)
         message : `str`
-            Message to write to log
+            Message to write to log\n
+            A format string if `args` are given
+        *args
+            Values for the `{}` fields of `message`, formatted with the entry
         **kwargs : `list[str]`
             Anything else specified in custom format string
 
@@ -131,22 +285,45 @@ class Logger:
         None : `None`
         """
 
-        self._write_file(
-            self._format_str.format(
-                timestamp = time.ticks_ms(),
-                type = type_ if type_ not in self._type_strings.keys() else self._type_strings[type_],
-                message = message,
-                **kwargs
-            )
-        )
-
-    def write_info(self, message:str, **kwargs: list[str]) -> None:
+        if len(self._ring_types):
+            self._defer(type_, message, args, kwargs)
+        else:
+            self._write_file(self._format(time.ticks_ms(), type_, message, args or None, kwargs or None))
+        if type_ in self._flush_types: self.flush()
+
+    def _defer(self, type_:str, message:str, args:tuple, kwargs:dict) -> None:
+        code = self._type_codes.get(type_)
+        if code is None:
+            # first entry of a new type
+            code = len(self._type_names)
+            self._type_names.append(type_)
+            self._type_codes[type_] = code
+
+        i = self._ring_length
+        self._ring_ticks[i] = time.ticks_ms()
+        self._ring_types[i] = code
+        if len(args) > _DEFERRED_ARGS:
+            message = message.format(*args)
+            args = ()
+        first = i * _DEFERRED_ARGS
+        for j in range(len(args)):
+            self._ring_args[first + j] = args[j]
+        self._ring_arg_counts[i] = len(args)
+        self._ring_messages[i] = message
+        self._ring_kwargs[i] = kwargs or None
+        self._ring_length = i + 1
+        if self._ring_length == len(self._ring_types): self._format_deferred()
+
+    def write_info(self, message:str, *args, **kwargs: list[str]) -> None:
         """Writes a log entry of type "info" to the log file
         
         Parameters
         ----------
         message : `str`
-            Message to write to log
+            Message to write to log\n
+            A format string if `args` are given
+        *args
+            Values for the `{}` fields of `message`, formatted with the entry
         **kwargs : `list[str]`
             Anything else specified in custom format string
 
@@ -155,15 +332,18 @@ class Logger:
         None : `None`
         """
 
-        self.write_log("info", message, **kwargs)
+        self.write_log("info", message, *args, **kwargs)
 
-    def write_warning(self, message:str, **kwargs: list[str]) -> None:
+    def write_warning(self, message:str, *args, **kwargs: list[str]) -> None:
         """Writes a log entry of type "warning" to the log file
         
         Parameters
         ----------
         message : `str`
-            Message to write to log
+            Message to write to log\n
+            A format string if `args` are given
+        *args
+            Values for the `{}` fields of `message`, formatted with the entry
         **kwargs : `list[str]`
             Anything else specified in custom format string
 
@@ -172,15 +352,18 @@ class Logger:
         None : `None`
         """
 
-        self.write_log("warning", message, **kwargs)
+        self.write_log("warning", message, *args, **kwargs)
 
-    def write_error(self, message:str, **kwargs: list[str]) -> None:
+    def write_error(self, message:str, *args, **kwargs: list[str]) -> None:
         """Writes a log entry of type "error" to the log file
         
         Parameters
         ----------
         message : `str`
-            Message to write to log
+            Message to write to log\n
+            A format string if `args` are given
+        *args
+            Values for the `{}` fields of `message`, formatted with the entry
         **kwargs : `list[str]`
             Anything else specified in custom format string
 
@@ -189,4 +372,4 @@ class Logger:
         None : `None`
         """
 
-        self.write_log("error", message, **kwargs)
\ No newline at end of file
+        self.write_log("error", message, *args, **kwargs)
\ No newline at end of file
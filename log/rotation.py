@@ -0,0 +1,147 @@
+"""Implements `LogSequence` class, which numbers log files in a folder
+
+Keeps the last used number in a sequence file in the folder, so picking the next log
+name does not depend on how many files are on flash
+
+Falls back to scanning the folder once if the sequence file is missing or unreadable
+
+Creates the folder, one level deep, if it does not exist yet
+
+Prunes the oldest logs so that at most `max_files` are kept: the first new log lists the
+folder once to catch any old or leftover logs, later ones only delete the log falling out
+"""
+
+import errno
+import os
+import re
+
+class LogSequence:
+    """
+    Numbers log files `{prefix}{n}{suffix}` in a folder, e.g. `log1.txt`, `log2.txt`, ...
+
+    The last used number is kept in `.{prefix}{suffix}.seq` in the same folder
+    """
+
+    folder: str
+    prefix: str
+    suffix: str
+    max_files: int|None
+
+    def __init__(self, folder:str, *, prefix:str="log", suffix:str=".txt", max_files:int|None=None):
+        """
+        Parameters
+        ----------
+        folder : `str`
+            The folder holding the logs
+        prefix, suffix : `str`
+            Log file name around the number
+        max_files : `int | None`
+            Number of logs to keep, the oldest are deleted as new ones are created\n
+            If `None` no logs are deleted
+        """
+
+        # add trailing / if it's not there
+        if folder[-1] != "/": folder += "/"
+        self.folder = folder
+        self.prefix = prefix
+        self.suffix = suffix
+        self.max_files = max_files
+        self._sequence_file = f"{folder}.{prefix}{suffix}.seq"
+        self._pruned = False
+
+    def path(self, number:int) -> str:
+        """Path of log number `number`
+
+        Parameters
+        ----------
+        number : `int`
+
+        Returns
+        -------
+        path : `str`
+        """
+
+        return f"{self.folder}{self.prefix}{number}{self.suffix}"
+
+    def last(self) -> int:
+        """The highest log number in use, 0 if there are none
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        number : `int`
+        """
+
+        try:
+            with open(self._sequence_file) as file:
+                return int(file.read())
+        except (OSError, ValueError):
+            return self._scan()
+
+    def _numbers(self) -> list:
+        # micropython's re has no re.escape, the only special character expected here is "."
+        pattern = re.compile(
+            "^" + self.prefix.replace(".", "\\.") + "(\\d+)" + self.suffix.replace(".", "\\.") + "$"
+        )
+        numbers = []
+        for name in os.listdir(self.folder):
+            re_match = pattern.match(name)
+            if re_match is not None: numbers.append(int(re_match.group(1)))
+        return numbers
+
+    def _scan(self) -> int:
+        highest = 0
+        for number in self._numbers():
+            if number > highest: highest = number
+        return highest
+
+    def _make_folder(self) -> None:
+        folder = self.folder.rstrip("/")
+        if not folder: return
+        try:
+            os.mkdir(folder)
+        except OSError as e:
+            if e.args[0] != errno.EEXIST: raise
+
+    def _remove(self, number:int) -> None:
+        try:
+            os.remove(self.path(number))
+        except OSError:
+            pass
+
+    def next_path(self) -> str:
+        """Claims the next log number and returns its path\n
+        Creates the folder if needed and deletes the logs that fall outside `max_files`
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        path : `str`
+        """
+
+        self._make_folder()
+        number = self.last() + 1
+        with open(self._sequence_file, "w") as file:
+            file.write(str(number))
+
+        if self.max_files is not None:
+            oldest = number - self.max_files
+            if self._pruned:
+                self._remove(oldest)
+            else:
+                # once per sequence: logs older than the counter or beyond a lowered `max_files`
+                try:
+                    stale = [n for n in self._numbers() if n <= oldest]
+                except OSError:
+                    stale = []
+                for n in stale:
+                    self._remove(n)
+                self._pruned = True
+
+        return self.path(number)
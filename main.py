@@ -1,23 +1,60 @@
 import pins
+from scheduler import Runtime
+from capture import TriggerCapture
+from dualcore import CoreSampler
+from telemetry import Telemetry
+from pipeline import decimate, median, moving_average, sink
+from log import close_global_logger
 # from log import init_global_logger, global_logger
 
 
 def main() -> None:
-    running = False
-    last = False
-
     # global_logger().write_info("start main()")
-    while True:
-        if pins.THERMOCOUPLE_ENALED:
-            print(pins.thermocouple.temperature)
-
-        running = bool(pins.run_pin.state)
-        if last == running: continue
-
-        pins.valve.set(running)
-        pins.mosfet.set(running)
-        
-        last = running
+    if pins.RUN_PIN_IRQ:
+        pins.run_pin.enable_irq(debounce_ms=pins.RUN_PIN_DEBOUNCE_MS)
+    thermocouple = pins.thermocouple if pins.THERMOCOUPLE_ENALED and pins.thermocouple_array is None else None
+    sensor_array = pins.thermocouple_array
+    capture = None
+    sampler = None
+    burst_samples = None
+    if thermocouple is not None and pins.DUAL_CORE:
+        # the MCP9600 belongs to core 1, so trigger capture can't reconfigure it
+        sampler = thermocouple = CoreSampler(thermocouple)
+    elif thermocouple is not None and pins.BURST_SAMPLES is not None:
+        # capture would switch profiles mid-burst
+        burst_samples = pins.BURST_SAMPLES
+    elif thermocouple is not None and pins.TRIGGER_CAPTURE:
+        capture = TriggerCapture(thermocouple, folder="logs/")
+    # control acts on raw samples in the runtime, the outputs get spike-rejected, smoothed and
+    # decimated ones; printing would corrupt the telemetry stream on the same serial port
+    if pins.TELEMETRY_INTERVAL_MS is not None:
+        telemetry = Telemetry(min_interval_ms=pins.TELEMETRY_INTERVAL_MS)
+        output = decimate(pins.TELEMETRY_DECIMATION, sink(lambda sample: telemetry.send_sample(sample, int(runtime.running))))
+    else:
+        output = decimate(pins.PRINT_DECIMATION, sink(lambda sample: print(sample.ticks, sample.temperature)))
+    on_sample = median(3, moving_average(4, output)).send
+    on_frame = None
+    if sensor_array is not None:
+        # staggers the conversions, so must run before the runtime reads the poll period
+        sensor_array.start()
+        on_frame = lambda frame: print(frame.ticks, frame.temperatures())
+    runtime = Runtime(
+        run_pin=pins.run_pin,
+        relays=(pins.valve, pins.mosfet),
+        thermocouple=thermocouple,
+        capture=capture,
+        # logger=global_logger(),
+        on_sample=on_sample,
+        sensor_array=sensor_array,
+        burst_samples=burst_samples,
+        on_frame=on_frame,
+    )
+    if sampler is not None: sampler.start()
+    try:
+        runtime.run()
+    finally:
+        if sampler is not None: sampler.stop()
+        if sensor_array is not None: sensor_array.stop()
 
 if __name__ == "__main__":
     # init_global_logger(folder="logs/")
@@ -28,4 +65,7 @@ if __name__ == "__main__":
         pass
     finally:
         # global_logger().write_info("System exit")
-        pins.board.reset()
\ No newline at end of file
+        close_global_logger()
+        if pins.i2c_tracer is not None: pins.i2c_tracer.dump()
+        if pins.i2c_recorder is not None: pins.i2c_recorder.close()
+        pins.board.reset()
@@ -1,29 +1,63 @@
 """Constant definitions for pins and drivers"""
 
+import time
+from array import array
+
 import automation
+import machine
 
 #######################################
 #######################################
 
 THERMOCOUPLE_ENALED = True
 THERMOCOUPLE_ADDRESS = 0x60
+THERMOCOUPLE_ADDRESSES = None  # e.g. range(0x60, 0x68) to sample every MCP9600 found there, see thermocouple_array.py
 
 VALVE_RELAY = 0
 MOSFET_RELAY = 1
 
 RUN_PIN = automation.INPUT_1
+RUN_PIN_IRQ = True
+RUN_PIN_DEBOUNCE_MS = 20
+TRIGGER_CAPTURE = True
+TELEMETRY_INTERVAL_MS = 100  # binary telemetry over USB serial, None to print temperatures
+PRINT_DECIMATION = 5  # print every 5th smoothed sample when telemetry is off, see pipeline.py
+TELEMETRY_DECIMATION = 10  # send every 10th smoothed sample as telemetry
+DUAL_CORE = False  # sample the thermocouple on core 1, see dualcore.py
+BURST_SAMPLES = None  # e.g. MCP9600.BURST_SAMPLES_8 to sample in bursts with the device shut down in between
+TRACE_I2C = False  # count and time every I2C transaction, see adafruit_register/i2c_trace.py
+RECORD_I2C = False  # record all I2C traffic to logs/i2c{n}.trc for replay, see sim/replay.py
 
 #######################################
 
 board = automation.Automation2040W()
 
-if THERMOCOUPLE_ENALED:
+i2c = board.i2c
+i2c_recorder = None
+if RECORD_I2C:
+    from adafruit_register.i2c_record import I2CRecorder
+    from log.rotation import LogSequence
+    i2c = i2c_recorder = I2CRecorder(i2c, LogSequence("logs/", prefix="i2c", suffix=".trc").next_path())
+
+i2c_tracer = None
+if TRACE_I2C:
+    from adafruit_register.i2c_trace import I2CTracer
+    from thermocouple import MCP9600
+    i2c = i2c_tracer = I2CTracer(i2c, watch=MCP9600.CONFIG_REGISTERS)  # dumped by main.py on exit
+
+thermocouple_array = None
+if THERMOCOUPLE_ENALED and THERMOCOUPLE_ADDRESSES is not None:
+    from thermocouple_array import ThermocoupleArray
+    thermocouple_array = ThermocoupleArray(i2c, addresses=THERMOCOUPLE_ADDRESSES)
+elif THERMOCOUPLE_ENALED:
     from thermocouple import MCP9600
-    thermocouple = MCP9600(board.i2c, address=THERMOCOUPLE_ADDRESS)
+    thermocouple = MCP9600(i2c, address=THERMOCOUPLE_ADDRESS)
 
 # Pin class
 class Pin:
     pin_num:int
+    irq_enabled = False
+    notify = None  # called from the IRQ handler on each accepted edge, must be IRQ safe
 
     def __init__(self, pin_num:int, type):
         self.pin_num = pin_num
@@ -31,7 +65,81 @@ class Pin:
 
     @property
     def state(self) -> int:
+        # debounced level when interrupt driven
+        if self.irq_enabled: return self._level
         return board.read_input(self.pin_num)
+
+    def enable_irq(self, debounce_ms:int=20, queue_size:int=16) -> None:
+        """Switches a READ pin from polling to interrupt-driven edge detection
+
+        The first edge is accepted immediately and further edges are ignored for
+        `debounce_ms`, so chatter is rejected without delaying a real edge.
+        Accepted edges are queued for `next_event()`
+        """
+
+        if self.pin_type != "READ":
+            raise Exception("Cannot attach interrupt to writeonly pin!")
+        self.debounce_ms = debounce_ms
+        # preallocated edge queue, written by the IRQ handler and read by `next_event()`
+        self._ticks = array("i", [0] * queue_size)
+        self._levels = bytearray(queue_size)
+        self._head = 0
+        self._tail = 0
+        self.dropped = 0
+
+        self._pin = machine.Pin(board.IN_BUFFERED_PINS[self.pin_num], machine.Pin.IN)
+        self._level = self._pin.value()
+        # so that the first edge is never debounced
+        self._level_ticks = time.ticks_add(time.ticks_ms(), -debounce_ms)
+        self.irq_enabled = True
+        self._pin.irq(self._on_edge, machine.Pin.IRQ_RISING | machine.Pin.IRQ_FALLING, hard=True)
+
+    def disable_irq(self) -> None:
+        if not self.irq_enabled: return
+        self._pin.irq(None)
+        self.irq_enabled = False
+
+    def _on_edge(self, pin) -> None:
+        # hard IRQ context: must not allocate
+        now = time.ticks_ms()
+        level = pin.value()
+        if level == self._level: return
+        if time.ticks_diff(now, self._level_ticks) < self.debounce_ms: return
+        self._push(now, level)
+
+    def _push(self, now:int, level:int) -> None:
+        self._level = level
+        self._level_ticks = now
+        tail = (self._tail + 1) % len(self._levels)
+        if tail == self._head:
+            self.dropped += 1
+        else:
+            self._ticks[self._tail] = now
+            self._levels[self._tail] = level
+            self._tail = tail
+        if self.notify is not None: self.notify()
+
+    def next_event(self) -> tuple|None:
+        """Pops the oldest debounced edge as `(ticks_ms, level)`, or `None` if there is none
+
+        Also catches an edge whose final level settled inside the debounce window,
+        which the IRQ handler had to ignore
+        """
+
+        if self._head == self._tail:
+            self._settle()
+            if self._head == self._tail: return None
+        event = (self._ticks[self._head], self._levels[self._head])
+        self._head = (self._head + 1) % len(self._levels)
+        return event
+
+    def _settle(self) -> None:
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._level_ticks) < self.debounce_ms: return
+        irq_state = machine.disable_irq()
+        level = self._pin.value()
+        if level != self._level: self._push(now, level)
+        machine.enable_irq(irq_state)
     
     @property
     def percent(self) -> int:
@@ -0,0 +1,174 @@
+"""Streaming filter and decimation pipeline for thermocouple samples
+
+Stages are generator coroutines: a stage receives `thermocouple.Snapshot`s through `send()`
+and sends its output on to the next stage, so a pipeline is built by nesting stages from
+sink to source
+
+Filters smooth the hot junction temperature and pass the reading's ticks, delta, cold
+junction and status through, in a preallocated snapshot of their own, so the input is
+never modified; they use integer math on fixed-point temperatures (1/16 degrees Celsius)
+and preallocated windows, so pushing a sample through does not allocate
+
+Example: control sees raw data, the log gets spike-rejected, smoothed data at 1/10 of the
+rate and telemetry gets it at 1/50 of the rate
+
+    smoothed = median(3, moving_average(4, broadcast(
+        decimate(10, sink(log_sample)),
+        decimate(50, sink(send_telemetry)),
+    )))
+    pipe = broadcast(sink(control), smoothed)
+
+    runtime = Runtime(..., on_sample=pipe.send)
+"""
+
+from array import array
+
+from thermocouple import Snapshot
+
+def _primed(func):
+    # starts the generator so it is ready for `send()`
+    def start(*args):
+        stage = func(*args)
+        next(stage)
+        return stage
+    return start
+
+def _filtered(sample:Snapshot, out:Snapshot, hot:int) -> Snapshot:
+    out.ticks = sample.ticks
+    out.hot = hot
+    out.delta = sample.delta
+    out.cold = sample.cold
+    out.status = sample.status
+    return out
+
+@_primed
+def sink(func):
+    """Stage that calls `func(sample)` for every sample
+
+    Parameters
+    ----------
+    func : `Callable[[Snapshot], None]`
+        Consumer of the samples
+
+    Returns
+    -------
+    stage : `Generator`
+    """
+
+    while True:
+        func((yield))
+
+@_primed
+def broadcast(*targets):
+    """Stage that fans each sample out to every target
+
+    Parameters
+    ----------
+    *targets : `Generator`
+        Stages to send to, in order
+
+    Returns
+    -------
+    stage : `Generator`
+    """
+
+    while True:
+        sample = yield
+        for target in targets:
+            target.send(sample)
+
+@_primed
+def decimate(n:int, target):
+    """Stage that forwards every `n`th sample
+
+    Parameters
+    ----------
+    n : `int`
+        Decimation factor
+    target : `Generator`
+        Stage to send to
+
+    Returns
+    -------
+    stage : `Generator`
+    """
+
+    count = 0
+    while True:
+        sample = yield
+        count += 1
+        if count == n:
+            count = 0
+            target.send(sample)
+
+@_primed
+def moving_average(n:int, target):
+    """Stage that sends the mean hot junction temperature of the last `n` samples, rounded down\n
+    Averages over fewer samples until `n` have been received
+
+    Parameters
+    ----------
+    n : `int`
+        Window length
+    target : `Generator`
+        Stage to send to
+
+    Returns
+    -------
+    stage : `Generator`
+    """
+
+    out = Snapshot()
+    window = array("i", [0] * n)
+    index = 0
+    filled = 0
+    total = 0
+    while True:
+        sample = yield
+        value = sample.hot
+        total += value - window[index]
+        window[index] = value
+        index += 1
+        if index == n: index = 0
+        if filled < n: filled += 1
+        target.send(_filtered(sample, out, total // filled))
+
+@_primed
+def median(n:int, target):
+    """Stage that sends the median hot junction temperature of the last `n` samples, rejecting
+    single-sample spikes\n
+    Uses the median of fewer samples until `n` have been received
+
+    Parameters
+    ----------
+    n : `int`
+        Window length, odd values give a true median
+    target : `Generator`
+        Stage to send to
+
+    Returns
+    -------
+    stage : `Generator`
+    """
+
+    out = Snapshot()
+    window = array("i", [0] * n)
+    ordered = array("i", [0] * n)
+    index = 0
+    filled = 0
+    while True:
+        sample = yield
+        window[index] = sample.hot
+        index += 1
+        if index == n: index = 0
+        if filled < n: filled += 1
+
+        # insertion sort of the window into the preallocated scratch array
+        for i in range(filled):
+            item = window[i]
+            j = i
+            while j > 0 and ordered[j - 1] > item:
+                ordered[j] = ordered[j - 1]
+                j -= 1
+            ordered[j] = item
+        target.send(_filtered(sample, out, ordered[filled // 2]))
@@ -0,0 +1,237 @@
+"""In-memory store of recent thermocouple samples
+
+Keeps a fixed number of samples in preallocated `array` ring buffers, one column each for
+ticks, hot, delta and cold junction temperatures and relay state
+
+Temperatures are fixed-point integers in 1/16 degrees Celsius, as delivered by
+`thermocouple.MCP9600`, so storing and summarizing samples does no float math
+"""
+
+from array import array
+
+COLUMNS = ("ticks", "hot", "delta", "cold", "relay")
+
+class Window:
+    """
+    View of the most recent samples of one column of a `SampleStore`, oldest first
+
+    Reads straight from the ring buffer, nothing is copied\n
+    Only valid until the store is appended to again
+    """
+
+    def __init__(self, column, start:int, length:int):
+        self._column = column
+        self._start = start
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index:int) -> int:
+        if index < 0: index += self._length
+        if not 0 <= index < self._length: raise IndexError("Window index out of range")
+        return self._column[(self._start + index) % len(self._column)]
+
+    def __iter__(self):
+        column = self._column
+        capacity = len(column)
+        index = self._start
+        for _ in range(self._length):
+            yield column[index]
+            index += 1
+            if index == capacity: index = 0
+
+    def summary(self) -> tuple:
+        """Minimum, maximum and mean of the window in one pass
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        summary : `tuple[int, int, int]`
+            `(min, max, mean)`, with the mean rounded down to an integer
+        """
+
+        if self._length == 0: raise ValueError("Empty window")
+        column = self._column
+        capacity = len(column)
+        index = self._start
+        low = high = total = column[index]
+        for _ in range(self._length - 1):
+            index += 1
+            if index == capacity: index = 0
+            value = column[index]
+            if value < low: low = value
+            if value > high: high = value
+            total += value
+        return low, high, total // self._length
+
+    def min(self) -> int:
+        return self.summary()[0]
+
+    def max(self) -> int:
+        return self.summary()[1]
+
+    def mean(self) -> int:
+        return self.summary()[2]
+
+class SampleStore:
+    """
+    Fixed-capacity ring of samples with O(1) append
+
+    Once full, each append overwrites the oldest sample
+    """
+
+    capacity: int
+    count: int
+
+    def __init__(self, capacity:int):
+        """
+        Parameters
+        ----------
+        capacity : `int`
+            Number of samples kept
+        """
+
+        self.capacity = capacity
+        self.ticks = array("i", [0] * capacity)
+        self.hot = array("h", [0] * capacity)
+        self.delta = array("h", [0] * capacity)
+        self.cold = array("h", [0] * capacity)
+        self.relay = bytearray(capacity)
+        self.count = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, ticks:int, hot:int, delta:int, cold:int, relay:int=0) -> None:
+        """Appends one sample, overwriting the oldest if the store is full
+
+        Parameters
+        ----------
+        ticks : `int`
+            `time.ticks_ms()` of the sample
+        hot, delta, cold : `int`
+            Temperatures in 1/16 degrees Celsius
+        relay : `int`
+            Relay state
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        i = self._next
+        self.ticks[i] = ticks
+        self.hot[i] = hot
+        self.delta[i] = delta
+        self.cold[i] = cold
+        self.relay[i] = relay
+        i += 1
+        self._next = 0 if i == self.capacity else i
+        if self.count < self.capacity: self.count += 1
+
+    def append_snapshot(self, snapshot, relay:int=0) -> None:
+        """Appends a `thermocouple.Snapshot`
+
+        Parameters
+        ----------
+        snapshot : `thermocouple.Snapshot`
+            The reading to store
+        relay : `int`
+            Relay state
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self.append(snapshot.ticks, snapshot.hot, snapshot.delta, snapshot.cold, relay)
+
+    def clear(self) -> None:
+        """Forgets all samples, without freeing the buffers
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self.count = 0
+        self._next = 0
+
+    def slot(self, index:int) -> int:
+        """Position in the column arrays of a stored sample
+
+        Parameters
+        ----------
+        index : `int`
+            Sample index, 0 being the oldest stored sample
+
+        Returns
+        -------
+        slot : `int`
+        """
+
+        return (self._next - self.count + index) % self.capacity
+
+    def window(self, column:str, n:int|None=None) -> Window:
+        """View of the `n` most recent values of a column, oldest first
+
+        Parameters
+        ----------
+        column : `str`
+            One of `COLUMNS`
+        n : `int | None`
+            Number of samples, capped at the number stored\n
+            If `None` all stored samples are included
+
+        Returns
+        -------
+        window : `Window`
+        """
+
+        if column not in COLUMNS: raise ValueError(f"Unknown column {column}")
+        if n is None or n > self.count: n = self.count
+        return Window(getattr(self, column), (self._next - n) % self.capacity, n)
+
+    def latest(self, column:str) -> int:
+        """Most recent value of a column
+
+        Parameters
+        ----------
+        column : `str`
+            One of `COLUMNS`
+
+        Returns
+        -------
+        value : `int`
+        """
+
+        if self.count == 0: raise IndexError("SampleStore is empty")
+        return getattr(self, column)[self._next - 1]
+
+    def summary(self, column:str, n:int|None=None) -> tuple:
+        """Minimum, maximum and mean of the `n` most recent values of a column
+
+        Parameters
+        ----------
+        column : `str`
+            One of `COLUMNS`
+        n : `int | None`
+            Number of samples\n
+            If `None` all stored samples are included
+
+        Returns
+        -------
+        summary : `tuple[int, int, int]`
+            `(min, max, mean)`, with the mean rounded down to an integer
+        """
+
+        return self.window(column, n).summary()
@@ -0,0 +1,419 @@
+"""Cooperative `uasyncio` runtime for the sampler
+
+Runs thermocouple sampling, run-pin monitoring, relay actuation and log flushing as
+independent tasks, each with its own period and deadline
+
+Tracks deadline misses and worst-case run time per task
+
+When the run pin is interrupt driven (`pins.Pin.enable_irq()`), run-pin edges wake
+the runtime through a `ThreadSafeFlag` instead of being polled
+
+When the thermocouple is sampled on the other core (`dualcore.CoreSampler`), every
+queued sample is handled each sampling period
+
+In burst mode the sample task starts each MCP9600 burst and polls for its end, so long
+bursts never block the other tasks
+
+Several thermocouples (`thermocouple_array.ThermocoupleArray`) are polled by their own
+task, fast enough to catch each staggered conversion, and handled as whole frames
+"""
+
+import time
+
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+# uasyncio sleeps in milliseconds, CPython asyncio only in seconds
+_sleep_ms = getattr(asyncio, "sleep_ms", None) or (lambda ms: asyncio.sleep(ms / 1000))
+_wait_for_ms = getattr(asyncio, "wait_for_ms", None) or (lambda awaitable, ms: asyncio.wait_for(awaitable, ms / 1000))
+
+# polling at the conversion period itself loses a conversion to every bit of jitter,
+# the data-ready check makes the extra polls cheap
+POLLS_PER_CONVERSION = 4
+
+class PeriodicTask:
+    """
+    Calls a function every `period_ms` and checks each call against `deadline_ms`
+
+    Missed periods are skipped rather than run back to back
+
+    Shortening the period with `set_period()` cuts the current wait short, so it takes
+    effect at once
+    """
+
+    name: str
+    period_ms: int
+    deadline_ms: int
+    runs: int
+    misses: int
+    worst_ms: int
+
+    def __init__(self, name:str, period_ms:int, deadline_ms:int|None=None):
+        self.name = name
+        self.period_ms = period_ms
+        self.deadline_ms = period_ms if deadline_ms is None else deadline_ms
+        self.runs = 0
+        self.misses = 0
+        self.worst_ms = 0
+        self.task = None
+        self._wake = asyncio.Event()
+
+    def set_period(self, period_ms:int) -> None:
+        """Changes the period, waking the task if it is waiting out a longer one
+
+        Parameters
+        ----------
+        period_ms : `int`
+            The new period
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        shorter = period_ms < self.period_ms
+        self.period_ms = period_ms
+        if shorter: self._wake.set()
+
+    def start(self, func):
+        """Runs `run(func)` as a new `uasyncio` task
+
+        Parameters
+        ----------
+        func : `Callable[[], None]`
+            The periodic work
+
+        Returns
+        -------
+        task : `asyncio.Task`
+        """
+
+        self.task = asyncio.create_task(self.run(func))
+        return self.task
+
+    def record(self, elapsed_ms:int) -> None:
+        """Records one run of the task
+
+        Parameters
+        ----------
+        elapsed_ms : `int`
+            How long the run took
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self.runs += 1
+        if elapsed_ms > self.deadline_ms: self.misses += 1
+        if elapsed_ms > self.worst_ms: self.worst_ms = elapsed_ms
+
+    async def run(self, func) -> None:
+        """Calls `func()` every `period_ms` until cancelled
+
+        Parameters
+        ----------
+        func : `Callable[[], None]`
+            The periodic work
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self._wake.clear()
+        next_run = time.ticks_ms()
+        while True:
+            start = time.ticks_ms()
+            func()
+            now = time.ticks_ms()
+            self.record(time.ticks_diff(now, start))
+
+            next_run = time.ticks_add(next_run, self.period_ms)
+            delay = time.ticks_diff(next_run, now)
+            if delay < 0:
+                # overran, skip the missed periods
+                next_run = now
+                delay = 0
+            if delay == 0:
+                await _sleep_ms(0)
+            else:
+                try:
+                    await _wait_for_ms(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            if self._wake.is_set():
+                # woken by `set_period()`, the new period starts now
+                self._wake.clear()
+                next_run = time.ticks_ms()
+
+class Runtime:
+    """
+    Runs the sampler's tasks on `uasyncio`
+
+    Sampling polls the thermocouple several times per conversion and reads it only when a
+    conversion is ready, the run pin is polled independently of it, and relays are actuated
+    by their own task as soon as an edge is seen, so valve response never waits behind an
+    I2C read
+    """
+
+    def __init__(self, *, run_pin, relays:tuple, thermocouple=None, logger=None, sample_log=None, store=None, capture=None, on_sample=None,
+                 sensor_array=None, on_frame=None, burst_samples:int|None=None,
+                 sample_period_ms:int|None=None, sample_deadline_ms:int|None=None,
+                 pin_period_ms:int=5, pin_deadline_ms:int=2,
+                 actuation_deadline_ms:int=2,
+                 flush_period_ms:int=1000, flush_deadline_ms:int=50):
+        """
+        Parameters
+        ----------
+        run_pin : `pins.Pin`
+            Input that switches the relays
+        relays : `tuple[pins.Relay]`
+            Relays that follow the run pin
+        thermocouple : `MCP9600 | CoreSampler | None`
+            Thermocouple to sample, or `None` to disable sampling
+        logger : `Logger | None`
+            Logger that every sample is written to, and that the flush task flushes
+        sample_log : `SampleLog | None`
+            Binary log that every sample is written to, and that the flush task flushes
+        store : `SampleStore | None`
+            In-memory ring that every sample is appended to
+        capture : `TriggerCapture | None`
+            Pre/post-trigger capture, triggered on every run-pin edge and written by the flush task
+        on_sample : `Callable[[Snapshot], None] | None`
+            Called with each new thermocouple reading
+        sensor_array : `ThermocoupleArray | None`
+            Started thermocouple array to poll, independently of `thermocouple`
+        on_frame : `Callable[[Frame], None] | None`
+            Called with each new time-aligned frame of `sensor_array`
+        burst_samples : `int | None`
+            Sample in back-to-back bursts of this many conversions (an `MCP9600.BURST_SAMPLES_*`
+            option), one reading per burst, with the device shut down in between\n
+            If `None` the thermocouple converts continuously
+        sample_period_ms : `int | None`
+            Sampling period\n
+            If `None` the thermocouple is polled `POLLS_PER_CONVERSION` times per conversion
+        sample_deadline_ms : `int | None`
+            Sampling deadline\n
+            If `None` the thermocouple's conversion period, or `sample_period_ms` if given
+        pin_period_ms, pin_deadline_ms, actuation_deadline_ms, flush_period_ms, flush_deadline_ms : `int`
+            Periods and deadlines of the other tasks
+        """
+
+        self.run_pin = run_pin
+        self.relays = relays
+        self.thermocouple = thermocouple
+        self.logger = logger
+        self.sample_log = sample_log
+        self.store = store
+        self.capture = capture
+        self.on_sample = on_sample
+        self.sensor_array = sensor_array
+        self.on_frame = on_frame
+        self.sample = None
+        self.frame = None
+        self.running = False
+        self._drain = getattr(thermocouple, "queued", False)
+        self._sample_period_ms = sample_period_ms
+        self.burst_samples = burst_samples
+        self.burst_timeouts = 0
+        self._burst_running = False
+        self._burst_start = 0
+        if burst_samples is not None and (self._drain or capture is not None):
+            raise Exception("Burst sampling needs a directly attached `MCP9600` and no capture")
+
+        if sample_period_ms is None and thermocouple is not None:
+            sample_period_ms = self._poll_period_ms()
+            # a sample only has to be handled before the next conversion is ready
+            if sample_deadline_ms is None: sample_deadline_ms = thermocouple.conversion_period_ms
+        self.sample_task = PeriodicTask("sample", sample_period_ms or 0, sample_deadline_ms)
+        self.pin_task = PeriodicTask("run_pin", pin_period_ms, pin_deadline_ms)
+        self.actuation_task = PeriodicTask("actuation", 0, actuation_deadline_ms)
+        self.flush_task = PeriodicTask("flush", flush_period_ms, flush_deadline_ms)
+        self.array_task = None
+        if sensor_array is not None:
+            # one poll per stagger slot, each reads at most the channels that are due
+            self.array_task = PeriodicTask("array", sensor_array.poll_period_ms, sensor_array.period_ms)
+
+        self._edge = asyncio.Event()
+        self._edge_ticks = 0
+        self._tasks = []
+
+        self._pin_flag = None
+        if getattr(run_pin, "irq_enabled", False):
+            self._pin_flag = asyncio.ThreadSafeFlag()
+            run_pin.notify = self._pin_flag.set
+
+    def _poll_period_ms(self) -> int:
+        return max(1, self.thermocouple.conversion_period_ms // POLLS_PER_CONVERSION)
+
+    def _sample(self) -> None:
+        sample = self.thermocouple.read_if_ready()
+        while sample is not None:
+            self._handle_sample(sample)
+            if not self._drain: return
+            sample = self.thermocouple.read_if_ready()
+
+    def _sample_burst(self) -> None:
+        thermocouple = self.thermocouple
+        now = time.ticks_ms()
+        if self._burst_running:
+            sample = thermocouple.poll_burst()
+            if sample is not None:
+                self._burst_running = False
+                self._handle_sample(sample)
+            elif time.ticks_diff(now, self._burst_start) > 2 * thermocouple.burst_duration_ms(self.burst_samples):
+                # lost, e.g. the device was reset, start over
+                self.burst_timeouts += 1
+                self._burst_running = False
+        if not self._burst_running:
+            thermocouple.start_burst(self.burst_samples)
+            self._burst_running = True
+            self._burst_start = now
+
+    def _handle_sample(self, sample) -> None:
+        self.sample = sample
+        if self.logger is not None:
+            # buffered in RAM, and with a deferred logger formatted by the flush task
+            self.logger.write_info("{} {} {} {}", sample.hot, sample.delta, sample.cold, int(self.running))
+        if self.sample_log is not None:
+            self.sample_log.write_sample(sample, int(self.running))
+        if self.store is not None:
+            self.store.append_snapshot(sample, int(self.running))
+        if self.capture is not None and self.capture.add(sample, int(self.running)):
+            self._sync_sample_period()
+        if self.on_sample is not None: self.on_sample(sample)
+
+    def _poll_array(self) -> None:
+        frame = self.sensor_array.poll()
+        if frame is None: return
+        self.frame = frame
+        if self.on_frame is not None: self.on_frame(frame)
+
+    def _poll_run_pin(self) -> None:
+        self._set_running(bool(self.run_pin.state), time.ticks_ms())
+
+    async def _watch_run_pin(self) -> None:
+        # edges only report changes, so take the level the pin already had at boot
+        self._set_running(bool(self.run_pin.state), time.ticks_ms())
+        while True:
+            try:
+                # the timeout lets `next_event()` catch edges that settled while debouncing
+                await asyncio.wait_for(self._pin_flag.wait(), self.run_pin.debounce_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            start = time.ticks_ms()
+            event = self.run_pin.next_event()
+            while event is not None:
+                self._set_running(bool(event[1]), event[0])
+                event = self.run_pin.next_event()
+            self.pin_task.record(time.ticks_diff(time.ticks_ms(), start))
+
+    def _set_running(self, running:bool, ticks:int) -> None:
+        if running == self.running: return
+        self.running = running
+        self._edge_ticks = ticks
+        self._edge.set()
+
+    async def _actuate(self) -> None:
+        while True:
+            await self._edge.wait()
+            self._edge.clear()
+            running = self.running
+            for relay in self.relays:
+                relay.set(running)
+            # latency from edge detection to the relays being switched
+            self.actuation_task.record(time.ticks_diff(time.ticks_ms(), self._edge_ticks))
+            if self.capture is not None and self.capture.trigger(self._edge_ticks):
+                self._sync_sample_period()
+
+    def _sync_sample_period(self) -> None:
+        # follow conversion profile changes, a configured period only applies outside captures
+        if self._sample_period_ms is not None and not self.capture.capturing:
+            self.sample_task.set_period(self._sample_period_ms)
+        else:
+            self.sample_task.set_period(self._poll_period_ms())
+
+    def _flush(self) -> None:
+        # the writers' own intervals decide when buffered data goes to flash
+        if self.logger is not None: self.logger.flush_if_due()
+        if self.sample_log is not None: self.sample_log.flush_if_due()
+        if self.capture is not None: self.capture.write_pending()
+
+    def stats(self) -> dict:
+        """Per-task run counts, deadline misses and worst-case run time
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        stats : `dict[str, tuple[int, int, int]]`
+            `(runs, misses, worst_ms)` keyed by task name
+        """
+
+        tasks = [self.sample_task, self.pin_task, self.actuation_task, self.flush_task]
+        if self.array_task is not None: tasks.append(self.array_task)
+        return {task.name: (task.runs, task.misses, task.worst_ms) for task in tasks}
+
+    async def main(self) -> None:
+        """Starts all tasks and waits on them until `stop()` is called
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        if self._pin_flag is not None:
+            pin_watcher = self._watch_run_pin()
+        else:
+            pin_watcher = self.pin_task.run(self._poll_run_pin)
+        self._tasks = [
+            asyncio.create_task(pin_watcher),
+            asyncio.create_task(self._actuate()),
+            asyncio.create_task(self.flush_task.run(self._flush)),
+        ]
+        if self.thermocouple is not None:
+            self._tasks.append(self.sample_task.start(self._sample if self.burst_samples is None else self._sample_burst))
+        if self.sensor_array is not None:
+            self._tasks.append(asyncio.create_task(self.array_task.run(self._poll_array)))
+        try:
+            await asyncio.gather(*self._tasks)
+        except asyncio.CancelledError:
+            pass
+
+    def stop(self) -> None:
+        """Cancels all running tasks, which makes `main()` return
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        for task in self._tasks:
+            task.cancel()
+
+    def run(self) -> None:
+        """Runs `main()` on the event loop, blocking until `stop()` is called
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        asyncio.run(self.main())
@@ -0,0 +1,211 @@
+"""Host-side simulation of the Automation 2040 W and the MCP9600
+
+Runs `pins.py`, `thermocouple.py`, `scheduler.py` and the rest of the firmware on Linux:
+`install()` registers stand-ins for the MicroPython modules (`micropython`, `machine`,
+`uasyncio`, `ustruct`, the `time.ticks_*` functions) and Pimoroni's `automation`, with
+simulated MCP9600s on the board's I2C bus
+
+    import sim
+    simulation = sim.install(hot=sim.profiles.ramp(20, 5))
+    import pins  # builds the simulated board and finds the MCP9600 at 0x60
+
+`python -m sim` runs the sampler against the simulation and reports throughput, I2C
+traffic and actuation latency
+
+`sim.replay` runs the firmware on a recorded I2C trace instead of the device models
+"""
+
+import asyncio
+import struct
+import sys
+import time
+import types
+
+from . import automation, machine, micropython, profiles
+from .bus import SimI2C
+from .clock import Clock, ticks_add, ticks_diff
+from .mcp9600 import MCP9600Model
+
+_SHIMS = ("micropython", "machine", "automation", "uasyncio", "ustruct", "utime")
+_TIME_FUNCTIONS = ("ticks_ms", "ticks_us", "ticks_cpu", "ticks_add", "ticks_diff", "sleep_ms", "sleep_us")
+
+class ThreadSafeFlag:
+    """
+    `uasyncio.ThreadSafeFlag` on `asyncio`: `set()` may be called from IRQ handlers and
+    other threads, `wait()` clears the flag when it returns
+    """
+
+    def __init__(self):
+        self._event = asyncio.Event()
+        self._loop = None
+
+    def set(self) -> None:
+        if self._loop is None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._event.set)
+
+    def clear(self) -> None:
+        self._event.clear()
+
+    async def wait(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        await self._event.wait()
+        self._event.clear()
+
+def _uasyncio() -> types.ModuleType:
+    module = types.ModuleType("uasyncio")
+    module.__dict__.update({name: getattr(asyncio, name) for name in dir(asyncio) if not name.startswith("_")})
+    module.sleep_ms = lambda ms: asyncio.sleep(ms / 1000)
+    module.ThreadSafeFlag = ThreadSafeFlag
+    return module
+
+class Simulation:
+    """
+    Handle on an installed simulation: its clock, bus, device models and board
+    """
+
+    clock: Clock
+    i2c: SimI2C
+    devices: dict
+
+    def __init__(self, clock:Clock, i2c:SimI2C, devices:dict):
+        self.clock = clock
+        self.i2c = i2c
+        self.devices = devices
+        self.input_log = []
+        self._saved_modules = {}
+        self._saved_time = {}
+
+    @property
+    def board(self) -> automation.Automation2040W:
+        """The most recently built board, e.g. `pins.board`"""
+        if not automation.boards: raise Exception("No `Automation2040W` has been built")
+        return automation.boards[-1]
+
+    def set_input(self, input:int, level:int) -> None:
+        """Drives a buffered input, running any IRQ handler attached to it
+
+        Parameters
+        ----------
+        input : `int`
+            Input number, e.g. `automation.INPUT_1`
+        level : `int`
+            0 or 1
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self.input_log.append((self.clock.now_us(), input, 1 if level else 0))
+        machine.set_level(automation.Automation2040W.IN_BUFFERED_PINS[input], level)
+
+    def actuation_latencies_us(self, relay:int=0) -> list:
+        """Time from each input edge to the relay following it
+
+        Parameters
+        ----------
+        relay : `int`
+            The relay driven by the input
+
+        Returns
+        -------
+        latencies : `list[int]`
+            One entry per input edge that the relay followed, in microseconds
+        """
+
+        relay_log = [(t, state) for t, number, state in self.board.relay_log if number == relay]
+        latencies = []
+        index = 0
+        for edge_us, _, level in self.input_log:
+            while index < len(relay_log) and relay_log[index][0] < edge_us:
+                index += 1
+            if index == len(relay_log): break
+            if relay_log[index][1] == bool(level):
+                latencies.append(relay_log[index][0] - edge_us)
+        return latencies
+
+    def uninstall(self) -> None:
+        """Removes the module stand-ins and restores the `time` module
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        for name, module in self._saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        for name, func in self._saved_time.items():
+            if func is None:
+                delattr(time, name)
+            else:
+                setattr(time, name, func)
+        self._saved_modules = {}
+        self._saved_time = {}
+
+def install(*, hot=None, cold=None, addresses:tuple=(0x60,), virtual:bool=False,
+            freq:int=400_000, overhead_us:int=0) -> Simulation:
+    """Registers the MicroPython and `automation` stand-ins, with an MCP9600 model at each
+    of `addresses` on the board's I2C bus\n
+    Call before importing any firmware module
+
+    Parameters
+    ----------
+    hot, cold : `Callable[[float], float | None] | None`
+        Temperature profiles for every device, see `sim.profiles`
+    addresses : `tuple[int]`
+        I2C addresses of the simulated MCP9600s
+    virtual : `bool`
+        Use a virtual clock, which only advances as the code under test spends time\n
+        Leave `False` when running `uasyncio` code, whose timing follows the host clock
+    freq : `int`
+        I2C bus frequency in Hz
+    overhead_us : `int`
+        Extra time per I2C transaction
+
+    Returns
+    -------
+    simulation : `Simulation`
+    """
+
+    clock = Clock(virtual=virtual)
+    i2c = SimI2C(freq=freq, clock=clock, overhead_us=overhead_us)
+    devices = {}
+    for address in addresses:
+        devices[address] = MCP9600Model(clock, hot=hot, cold=cold)
+        i2c.attach(address, devices[address])
+    simulation = Simulation(clock, i2c, devices)
+
+    machine.reset_levels()
+    automation.configure(i2c, clock)
+    automation.boards.clear()
+
+    shims = {
+        "micropython": micropython,
+        "machine": machine,
+        "automation": automation,
+        "uasyncio": _uasyncio(),
+        "ustruct": struct,
+        "utime": time,
+    }
+    for name in _SHIMS:
+        simulation._saved_modules[name] = sys.modules.get(name)
+        sys.modules[name] = shims[name]
+
+    functions = {
+        "ticks_ms": clock.ticks_ms, "ticks_us": clock.ticks_us, "ticks_cpu": clock.ticks_cpu,
+        "ticks_add": ticks_add, "ticks_diff": ticks_diff,
+        "sleep_ms": clock.sleep_ms, "sleep_us": clock.sleep_us,
+    }
+    for name in _TIME_FUNCTIONS:
+        simulation._saved_time[name] = getattr(time, name, None)
+        setattr(time, name, functions[name])
+    return simulation
@@ -0,0 +1,72 @@
+"""Runs the sampler against the simulation and reports its performance
+
+Usage
+-----
+`python -m sim` samples for 5 s with the run pin toggling every 500 ms\n
+`python -m sim --seconds 10 --toggle-ms 200 --profile fast --irq`
+"""
+
+import argparse
+import asyncio
+import sys
+
+import sim
+from sim import profiles
+
+def _summary(values:list) -> str:
+    if not values: return "n/a"
+    return f"min {min(values)} / mean {sum(values) // len(values)} / max {max(values)}"
+
+async def _run(simulation, runtime, seconds:float, toggle_ms:int) -> None:
+    task = asyncio.create_task(runtime.main())
+    level = 0
+    for _ in range(int(seconds * 1000 / toggle_ms)):
+        await asyncio.sleep(toggle_ms / 1000)
+        level ^= 1
+        simulation.set_input(0, level)
+    await asyncio.sleep(0.05)
+    runtime.stop()
+    await task
+
+def main(argv:list|None=None) -> None:
+    parser = argparse.ArgumentParser(description="Run the SPARX sampler on a simulated board")
+    parser.add_argument("--seconds", type=float, default=5.0, help="how long to run")
+    parser.add_argument("--toggle-ms", type=int, default=500, help="run pin toggle interval")
+    parser.add_argument("--profile", choices=("fast", "balanced", "precise"), help="MCP9600 profile")
+    parser.add_argument("--irq", action="store_true", help="interrupt-driven run pin")
+    parser.add_argument("--freq", type=int, default=400_000, help="I2C frequency in Hz")
+    parser.add_argument("--overhead-us", type=int, default=50, help="extra time per I2C transaction")
+    args = parser.parse_args(argv)
+
+    simulation = sim.install(
+        hot=profiles.noise(profiles.sine(200, 50, 4), 0.5),
+        freq=args.freq, overhead_us=args.overhead_us,
+    )
+    import pins
+    from scheduler import Runtime
+
+    if args.profile is not None: pins.thermocouple.set_profile(args.profile)
+    if args.irq: pins.run_pin.enable_irq(debounce_ms=pins.RUN_PIN_DEBOUNCE_MS)
+    samples = []
+    runtime = Runtime(
+        run_pin=pins.run_pin,
+        relays=(pins.valve, pins.mosfet),
+        thermocouple=pins.thermocouple,
+        on_sample=lambda sample: samples.append(sample.ticks),
+    )
+    simulation.i2c.reset_counters()
+    asyncio.run(_run(simulation, runtime, args.seconds, args.toggle_ms))
+
+    bus = simulation.i2c
+    out = sys.stdout
+    out.write(f"samples           {len(samples)} ({len(samples) / args.seconds:.1f}/s)\n")
+    out.write(f"conversions       {simulation.devices[pins.THERMOCOUPLE_ADDRESS].conversions}\n")
+    out.write(f"i2c transactions  {bus.transactions} ({bus.transactions / max(1, len(samples)):.2f}/sample)\n")
+    out.write(f"i2c bytes         {bus.bytes_read} read, {bus.bytes_written} written\n")
+    out.write(f"i2c busy          {bus.busy_us / 1000:.1f} ms\n")
+    out.write(f"actuation us      {_summary(simulation.actuation_latencies_us(pins.VALVE_RELAY))}\n")
+    for name, (runs, misses, worst_ms) in runtime.stats().items():
+        out.write(f"task {name:<12} runs {runs}, misses {misses}, worst {worst_ms} ms\n")
+
+if __name__ == "__main__":
+    main()
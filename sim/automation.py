@@ -0,0 +1,101 @@
+"""Stand-in for Pimoroni's `automation` module
+
+`Automation2040W` reads its buffered inputs from the simulated GPIO levels in
+`sim.machine`, so `Simulation.set_input()` reaches both polled and interrupt-driven
+readers, and records every relay and output change with its time
+"""
+
+from . import machine
+from .bus import SimI2C
+from .clock import Clock
+
+INPUT_1 = 0
+INPUT_2 = 1
+INPUT_3 = 2
+INPUT_4 = 3
+
+OUTPUT_1 = 0
+OUTPUT_2 = 1
+OUTPUT_3 = 2
+
+RELAY_1 = 0
+RELAY_2 = 1
+RELAY_3 = 2
+
+ADC_1 = 0
+ADC_2 = 1
+ADC_3 = 2
+
+NUM_INPUTS = 4
+NUM_OUTPUTS = 3
+NUM_RELAYS = 3
+NUM_ADCS = 3
+
+# bus and clock for boards built by code under test, set by `sim.install()`
+_bus = None
+_clock = None
+boards = []
+
+def configure(bus:SimI2C, clock:Clock) -> None:
+    global _bus, _clock
+    _bus = bus
+    _clock = clock
+
+class Automation2040W:
+    """
+    Simulated Automation 2040 W board
+    """
+
+    IN_BUFFERED_PINS = (19, 20, 21, 22)
+    RELAY_PINS = (9, 10, 11)
+    OUT_PINS = (16, 17, 18)
+
+    def __init__(self, init_i2c:bool=True):
+        self.clock = _clock if _clock is not None else Clock()
+        self.i2c = (_bus if _bus is not None else SimI2C(clock=self.clock)) if init_i2c else None
+        self.relays = [False] * NUM_RELAYS
+        self.outputs = [0.0] * NUM_OUTPUTS
+        self.adcs = [0.0] * NUM_ADCS
+        self.relay_log = []
+        self.output_log = []
+        self.resets = 0
+        boards.append(self)
+
+    def read_input(self, input:int) -> bool:
+        if not 0 <= input < NUM_INPUTS: raise ValueError("input out of range")
+        return bool(machine.Pin(self.IN_BUFFERED_PINS[input]).value())
+
+    def read_adc(self, adc:int) -> float:
+        return self.adcs[adc]
+
+    def relay(self, relay:int, actuate:bool|None=None) -> bool|None:
+        if actuate is None: return self.relays[relay]
+        self.actuate_relay(relay) if actuate else self.release_relay(relay)
+        return None
+
+    def actuate_relay(self, relay:int) -> None:
+        self._set_relay(relay, True)
+
+    def release_relay(self, relay:int) -> None:
+        self._set_relay(relay, False)
+
+    def _set_relay(self, relay:int, state:bool) -> None:
+        if not 0 <= relay < NUM_RELAYS: raise ValueError("relay out of range")
+        if self.relays[relay] != state: self.relay_log.append((self.clock.now_us(), relay, state))
+        self.relays[relay] = state
+
+    def output(self, output:int, value:float|bool) -> None:
+        if not 0 <= output < NUM_OUTPUTS: raise ValueError("output out of range")
+        percent = (100.0 if value else 0.0) if isinstance(value, bool) else float(value)
+        self.outputs[output] = percent
+        self.output_log.append((self.clock.now_us(), output, percent))
+
+    def output_percent(self, output:int) -> float:
+        return self.outputs[output]
+
+    def reset(self) -> None:
+        self.resets += 1
+        for relay in range(NUM_RELAYS):
+            self.release_relay(relay)
+        for output in range(NUM_OUTPUTS):
+            self.outputs[output] = 0.0
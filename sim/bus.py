@@ -0,0 +1,130 @@
+"""Implements `SimI2C` class, a `machine.I2C` compatible bus for simulated devices
+
+Each transaction takes the time its bits need at the bus frequency, plus a fixed
+per-transaction overhead, on the simulation `Clock`\n
+Counts transactions and bytes so driver changes can be compared by bus traffic
+"""
+
+import errno
+
+from .clock import Clock
+
+_BITS_PER_BYTE = 9 # 8 data bits and ACK
+
+class SimI2C:
+    """
+    `machine.I2C` compatible bus with attached simulated devices
+
+    Devices implement `read(register, buffer)` and `write(register, data)`
+    """
+
+    transactions: int
+    bytes_read: int
+    bytes_written: int
+    busy_us: int
+
+    def __init__(self, id:int=0, *, scl=None, sda=None, freq:int=400_000, clock:Clock|None=None, overhead_us:int=0):
+        """
+        Parameters
+        ----------
+        id, scl, sda
+            Ignored, accepted for `machine.I2C` compatibility
+        freq : `int`
+            Bus frequency in Hz, sets the time each transaction takes
+        clock : `Clock | None`
+            Clock that transactions spend time on\n
+            If `None` a real clock is used
+        overhead_us : `int`
+            Fixed extra time per transaction, e.g. driver and interpreter overhead
+        """
+
+        self.freq = freq
+        self.clock = Clock() if clock is None else clock
+        self.overhead_us = overhead_us
+        self.devices = {}
+        self._pointers = {}
+        self.transactions = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.busy_us = 0
+
+    def attach(self, address:int, device) -> None:
+        """Connects a simulated device at `address`
+
+        Parameters
+        ----------
+        address : `int`
+            7-bit I2C address
+        device
+            The device model
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self.devices[address] = device
+        self._pointers[address] = 0
+
+    def reset_counters(self) -> None:
+        self.transactions = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.busy_us = 0
+
+    def _device(self, address:int):
+        device = self.devices.get(address)
+        if device is None:
+            # what MicroPython raises when the address is not acknowledged
+            self._spend(1)
+            raise OSError(errno.ENODEV)
+        return device
+
+    def _spend(self, frame_bytes:int, restarts:int=0) -> None:
+        # start, stop and repeated starts take about one bit each
+        bits = frame_bytes * _BITS_PER_BYTE + 2 + restarts
+        us = bits * 1_000_000 // self.freq + self.overhead_us
+        self.transactions += 1
+        self.busy_us += us
+        self.clock.spend_us(us)
+
+    def scan(self) -> list:
+        return sorted(self.devices)
+
+    def readfrom_mem_into(self, address:int, memaddr:int, buf, *, addrsize:int=8) -> None:
+        device = self._device(address)
+        self._spend(2 + addrsize // 8 + len(buf), restarts=1)
+        device.read(memaddr, buf)
+        self.bytes_read += len(buf)
+
+    def readfrom_mem(self, address:int, memaddr:int, nbytes:int, *, addrsize:int=8) -> bytes:
+        buf = bytearray(nbytes)
+        self.readfrom_mem_into(address, memaddr, buf, addrsize=addrsize)
+        return bytes(buf)
+
+    def writeto_mem(self, address:int, memaddr:int, buf, *, addrsize:int=8) -> None:
+        device = self._device(address)
+        self._spend(1 + addrsize // 8 + len(buf))
+        device.write(memaddr, bytes(buf))
+        self.bytes_written += len(buf)
+
+    def writeto(self, address:int, buf, stop:bool=True) -> int:
+        # register pointer write, optionally followed by data
+        device = self._device(address)
+        self._spend(1 + len(buf))
+        if len(buf):
+            self._pointers[address] = buf[0]
+            if len(buf) > 1: device.write(buf[0], bytes(buf[1:]))
+        self.bytes_written += len(buf)
+        return len(buf)
+
+    def readfrom_into(self, address:int, buf, stop:bool=True) -> None:
+        device = self._device(address)
+        self._spend(1 + len(buf))
+        device.read(self._pointers[address], buf)
+        self.bytes_read += len(buf)
+
+    def readfrom(self, address:int, nbytes:int, stop:bool=True) -> bytes:
+        buf = bytearray(nbytes)
+        self.readfrom_into(address, buf, stop)
+        return bytes(buf)
@@ -0,0 +1,111 @@
+"""Implements `Clock` class, the simulator's source of MicroPython `time.ticks_*`
+
+A real clock follows the host's monotonic clock, so it stays in step with `asyncio`\n
+A virtual clock only moves when time is spent or slept, so driver loops run as fast as
+the host allows while timing stays deterministic
+"""
+
+import time
+
+# MicroPython ports wrap ticks at 2**30
+TICKS_PERIOD = 1 << 30
+_TICKS_MAX = TICKS_PERIOD - 1
+_TICKS_HALF = TICKS_PERIOD // 2
+
+def ticks_add(ticks:int, delta:int) -> int:
+    return (ticks + delta) & _TICKS_MAX
+
+def ticks_diff(end:int, start:int) -> int:
+    return ((end - start + _TICKS_HALF) & _TICKS_MAX) - _TICKS_HALF
+
+class Clock:
+    """
+    Microsecond clock behind the simulated `time.ticks_ms()`, `time.ticks_us()`,
+    `time.sleep_ms()` and `time.sleep_us()`
+    """
+
+    virtual: bool
+
+    def __init__(self, *, virtual:bool=False):
+        """
+        Parameters
+        ----------
+        virtual : `bool`
+            If `True` time only advances through `spend_us()` and the sleeps\n
+            If `False` it follows the host's monotonic clock
+        """
+
+        self.virtual = virtual
+        self._start_ns = time.monotonic_ns()
+        self._virtual_us = 0
+
+    def now_us(self) -> int:
+        """Microseconds since the clock was created, without wrapping
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        now : `int`
+        """
+
+        if self.virtual: return self._virtual_us
+        return (time.monotonic_ns() - self._start_ns) // 1000
+
+    def spend_us(self, us:int) -> None:
+        """Lets `us` microseconds pass, e.g. for a bus transaction\n
+        A real clock busy-waits, since host sleeps are far coarser than a transaction
+
+        Parameters
+        ----------
+        us : `int`
+            Time to spend
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        if us <= 0: return
+        if self.virtual:
+            self._virtual_us += us
+            return
+        end = self.now_us() + us
+        while self.now_us() < end:
+            pass
+
+    def set_us(self, us:int) -> None:
+        """Moves a virtual clock to `us`, e.g. to the time of a replayed transaction
+
+        Parameters
+        ----------
+        us : `int`
+            The new `now_us()`
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        if not self.virtual: raise Exception("Only a virtual `Clock` can be set")
+        self._virtual_us = us
+
+    def sleep_us(self, us:int) -> None:
+        if self.virtual:
+            self._virtual_us += max(0, us)
+        else:
+            time.sleep(max(0, us) / 1_000_000)
+
+    def sleep_ms(self, ms:int) -> None:
+        self.sleep_us(ms * 1000)
+
+    def ticks_us(self) -> int:
+        return self.now_us() & _TICKS_MAX
+
+    def ticks_ms(self) -> int:
+        return (self.now_us() // 1000) & _TICKS_MAX
+
+    def ticks_cpu(self) -> int:
+        return self.ticks_us()
@@ -0,0 +1,97 @@
+"""Stand-in for MicroPython's `machine` module
+
+GPIO levels are kept per pin number, so every `Pin` object for a pin sees the same level\n
+`set_level()` drives a pin from the outside and runs its IRQ handler synchronously, as a
+hard IRQ would interrupt the running code
+"""
+
+from .bus import SimI2C as I2C
+
+_levels = {}
+_handlers = {}
+_irq_depth = 0
+
+def set_level(pin_id:int, level:int) -> None:
+    """Drives a pin to `level`, running its IRQ handler if the edge matches its trigger
+
+    Parameters
+    ----------
+    pin_id : `int`
+        GPIO number
+    level : `int`
+        0 or 1
+
+    Returns
+    -------
+    None : `None`
+    """
+
+    level = 1 if level else 0
+    previous = _levels.get(pin_id, 0)
+    _levels[pin_id] = level
+    if level == previous: return
+    handler = _handlers.get(pin_id)
+    if handler is None: return
+    pin, func, trigger = handler
+    edge = Pin.IRQ_RISING if level else Pin.IRQ_FALLING
+    if trigger & edge: func(pin)
+
+def reset_levels() -> None:
+    """Forgets all pin levels and IRQ handlers
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None : `None`
+    """
+
+    _levels.clear()
+    _handlers.clear()
+
+class Pin:
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, pin_id:int, mode:int=-1, pull:int=-1, *, value:int|None=None):
+        self.id = pin_id
+        self.mode = mode
+        if value is not None: _levels[pin_id] = 1 if value else 0
+
+    def value(self, level:int|None=None) -> int|None:
+        if level is None: return _levels.get(self.id, 0)
+        set_level(self.id, level)
+        return None
+
+    def on(self) -> None:
+        set_level(self.id, 1)
+
+    def off(self) -> None:
+        set_level(self.id, 0)
+
+    def irq(self, handler=None, trigger:int=IRQ_FALLING | IRQ_RISING, hard:bool=False) -> None:
+        if handler is None:
+            _handlers.pop(self.id, None)
+        else:
+            _handlers[self.id] = (self, handler, trigger)
+
+def disable_irq() -> int:
+    global _irq_depth
+    _irq_depth += 1
+    return _irq_depth - 1
+
+def enable_irq(state:int) -> None:
+    global _irq_depth
+    _irq_depth = state
+
+def freq(hz:int|None=None) -> int:
+    return 125_000_000
+
+def reset() -> None:
+    raise SystemExit("machine.reset()")
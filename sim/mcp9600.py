@@ -0,0 +1,270 @@
+"""Implements `MCP9600Model` class, a register-level model of the MCP9600
+
+Models the register map as the driver sees it: temperature registers in 1/16 degrees
+Celsius, the status register's burst-complete, update and input-range bits, the sensor and
+device configuration, alert configuration, hysteresis and limits, and the device ID
+
+Conversions follow the ADC resolution's conversion time on the simulation `Clock`, in
+normal and burst mode; shutdown mode stops them
+
+Approximations
+--------------
+- ADC resolution quantizes the hot junction to 1/16, 1/4, 1 or 4 degrees
+- The digital filter is an exponential average with weight `1 / 2**coefficient`
+- Register widths follow the datasheet, so bytes written past a register's width (e.g.
+  the driver's 16-bit hysteresis writes to the 8-bit hysteresis registers) are dropped
+"""
+
+from .clock import Clock
+
+REGISTER_HOT_JUNCTION = 0x00
+REGISTER_DELTA = 0x01
+REGISTER_COLD_JUNCTION = 0x02
+REGISTER_RAW_ADC = 0x03
+REGISTER_STATUS = 0x04
+REGISTER_SENSOR_CONFIG = 0x05
+REGISTER_DEVICE_CONFIG = 0x06
+REGISTER_ALERT_CONFIG = 0x08     # 0x08 - 0x0B
+REGISTER_ALERT_HYSTERESIS = 0x0C # 0x0C - 0x0F
+REGISTER_ALERT_LIMIT = 0x10      # 0x10 - 0x13
+REGISTER_DEVICE_ID = 0x20
+
+_WIDTHS = {
+    REGISTER_HOT_JUNCTION: 2, REGISTER_DELTA: 2, REGISTER_COLD_JUNCTION: 2, REGISTER_RAW_ADC: 3,
+    REGISTER_STATUS: 1, REGISTER_SENSOR_CONFIG: 1, REGISTER_DEVICE_CONFIG: 1,
+    0x08: 1, 0x09: 1, 0x0A: 1, 0x0B: 1,
+    0x0C: 1, 0x0D: 1, 0x0E: 1, 0x0F: 1,
+    0x10: 2, 0x11: 2, 0x12: 2, 0x13: 2,
+    REGISTER_DEVICE_ID: 2,
+}
+_READ_ONLY = (REGISTER_HOT_JUNCTION, REGISTER_DELTA, REGISTER_COLD_JUNCTION, REGISTER_RAW_ADC, REGISTER_DEVICE_ID)
+
+STATUS_BURST_COMPLETE = 0x80
+STATUS_UPDATE = 0x40
+STATUS_INPUT_RANGE = 0x10
+
+NORMAL = 0b00
+SHUTDOWN = 0b01
+BURST = 0b10
+
+DEVICE_ID = 0x40
+REVISION = 0x14
+
+# conversion time and hot junction step (1/16 degrees) per ADC resolution (18, 16, 14, 12-bit)
+CONVERSION_TIMES_MS = (320, 80, 20, 5)
+_HOT_STEPS = (1, 4, 16, 64)
+
+# measurable range per thermocouple type, in sensor config order
+TYPE_RANGES = {
+    "K": (-200, 1372), "J": (-150, 1200), "T": (-200, 400), "N": (-150, 1300),
+    "S": (-50, 1664), "E": (-200, 1000), "B": (250, 1820), "R": (-50, 1664),
+}
+_TYPES = ("K", "J", "T", "N", "S", "E", "B", "R")
+
+_MICROVOLTS_PER_DEGREE = 41 # type K, for the raw ADC register only
+
+_MAX_CATCH_UP = 64
+
+def _to_register(value:int) -> bytes:
+    return (value & 0xFFFF).to_bytes(2, "big")
+
+def _from_register(data) -> int:
+    value = data[0] << 8 | data[1]
+    return value - 0x10000 if value & 0x8000 else value
+
+class MCP9600Model:
+    """
+    Simulated MCP9600, to attach to a `SimI2C` bus
+
+    Temperatures come from profiles, functions of the time in seconds since the model was
+    created that return degrees Celsius; a hot junction profile returning `None` simulates
+    an open thermocouple and sets the input range bit
+    """
+
+    conversions: int
+
+    def __init__(self, clock:Clock, hot=None, cold=None):
+        """
+        Parameters
+        ----------
+        clock : `Clock`
+            The simulation clock
+        hot : `Callable[[float], float | None] | None`
+            Hot junction temperature profile\n
+            If `None` a constant 25 degrees
+        cold : `Callable[[float], float] | None`
+            Cold junction temperature profile\n
+            If `None` a constant 25 degrees
+        """
+
+        self.clock = clock
+        self.hot = hot if hot is not None else (lambda t: 25.0)
+        self.cold = cold if cold is not None else (lambda t: 25.0)
+        self.registers = {register: bytearray(width) for register, width in _WIDTHS.items()}
+        self.registers[REGISTER_DEVICE_ID][:] = bytes((DEVICE_ID, REVISION))
+        self.conversions = 0
+        self._start_us = clock.now_us()
+        self._last_conversion_us = self._start_us
+        self._burst_end_us = None
+        self._filtered = None
+        self._latched = 0
+
+    def _seconds(self, us:int) -> float:
+        return (us - self._start_us) / 1_000_000
+
+    @property
+    def mode(self) -> int:
+        return self.registers[REGISTER_DEVICE_CONFIG][0] & 0b11
+
+    @property
+    def conversion_time_us(self) -> int:
+        resolution = (self.registers[REGISTER_DEVICE_CONFIG][0] >> 5) & 0b11
+        return CONVERSION_TIMES_MS[resolution] * 1000
+
+    @property
+    def status(self) -> int:
+        return self.registers[REGISTER_STATUS][0]
+
+    def _advance(self) -> None:
+        # completes the conversions due by now
+        now = self.clock.now_us()
+        period = self.conversion_time_us
+        mode = self.mode
+        if mode == NORMAL:
+            due = (now - self._last_conversion_us) // period
+            if due == 0: return
+            # run the filter over the missed conversions too, up to a limit
+            for i in range(max(1, due - _MAX_CATCH_UP + 1), due + 1):
+                self._convert(self._last_conversion_us + i * period)
+            self.conversions += due - min(due, _MAX_CATCH_UP)
+            self._last_conversion_us += due * period
+        elif mode == BURST and self._burst_end_us is not None and now >= self._burst_end_us:
+            self._convert(self._burst_end_us)
+            self._burst_end_us = None
+            self.registers[REGISTER_STATUS][0] |= STATUS_BURST_COMPLETE
+            # the device shuts down by itself after a burst
+            config = self.registers[REGISTER_DEVICE_CONFIG]
+            config[0] = config[0] & ~0b11 | SHUTDOWN
+
+    def _convert(self, at_us:int) -> None:
+        self.conversions += 1
+        status = self.registers[REGISTER_STATUS]
+        t = self._seconds(at_us)
+        config = self.registers[REGISTER_DEVICE_CONFIG][0]
+        sensor = self.registers[REGISTER_SENSOR_CONFIG][0]
+
+        cold = round(self.cold(t) * 16)
+        if config & 0x80: cold = cold // 4 * 4 # 0.25 degree cold junction resolution
+        hot_celsius = self.hot(t)
+        low, high = TYPE_RANGES[_TYPES[(sensor >> 4) & 0b111]]
+        if hot_celsius is None or not low <= hot_celsius <= high:
+            status[0] |= STATUS_INPUT_RANGE
+            status[0] |= STATUS_UPDATE
+            return
+        status[0] &= ~STATUS_INPUT_RANGE
+
+        hot = round(hot_celsius * 16)
+        coefficient = sensor & 0b111
+        if coefficient and self._filtered is not None:
+            self._filtered += (hot - self._filtered) / (1 << coefficient)
+        else:
+            self._filtered = float(hot)
+        step = _HOT_STEPS[(config >> 5) & 0b11]
+        hot = round(self._filtered / step) * step
+
+        self.registers[REGISTER_HOT_JUNCTION][:] = _to_register(hot)
+        self.registers[REGISTER_DELTA][:] = _to_register(hot - cold)
+        self.registers[REGISTER_COLD_JUNCTION][:] = _to_register(cold)
+        raw = (hot - cold) * _MICROVOLTS_PER_DEGREE // 32 # 2 uV per LSB at 18-bit
+        self.registers[REGISTER_RAW_ADC][:] = (raw & 0xFFFFFF).to_bytes(3, "big")
+        self._update_alerts(hot, cold)
+        status[0] |= STATUS_UPDATE
+
+    def _update_alerts(self, hot:int, cold:int) -> None:
+        status = self.registers[REGISTER_STATUS]
+        for i in range(4):
+            config = self.registers[REGISTER_ALERT_CONFIG + i][0]
+            bit = 1 << i
+            if not config & 0x01:
+                status[0] &= ~bit
+                continue
+            value = cold if config & 0x10 else hot
+            limit = _from_register(self.registers[REGISTER_ALERT_LIMIT + i])
+            hysteresis = self.registers[REGISTER_ALERT_HYSTERESIS + i][0] * 16
+            active = status[0] & bit
+            if config & 0x08: # rising
+                active = value >= limit or (active and value > limit - hysteresis)
+            else:
+                active = value <= limit or (active and value < limit + hysteresis)
+            if config & 0x02 and active: self._latched |= bit # interrupt mode
+            if active or self._latched & bit:
+                status[0] |= bit
+            else:
+                status[0] &= ~bit
+
+    def read(self, register:int, buf) -> None:
+        """Fills `buf` from `register`, zero past the register's width
+
+        Parameters
+        ----------
+        register : `int`
+            Register pointer
+        buf : `bytearray`
+            Buffer to fill
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self._advance()
+        data = self.registers.get(register, b"")
+        for i in range(len(buf)):
+            buf[i] = data[i] if i < len(data) else 0
+
+    def write(self, register:int, data:bytes) -> None:
+        """Writes `data` to `register`, dropping bytes past the register's width
+
+        Parameters
+        ----------
+        register : `int`
+            Register pointer
+        data : `bytes`
+            Bytes to write
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        self._advance()
+        if register in _READ_ONLY or register not in self.registers or not data: return
+        stored = self.registers[register]
+
+        if register == REGISTER_STATUS:
+            # burst complete and update can only be cleared, the rest is read only
+            stored[0] &= data[0] | 0x3F
+            return
+
+        if register == REGISTER_DEVICE_CONFIG:
+            previous = stored[0]
+            stored[0] = data[0]
+            mode = data[0] & 0b11
+            if mode == BURST and (previous & 0b11 != BURST or self._burst_end_us is None):
+                samples = 1 << ((data[0] >> 2) & 0b111)
+                self._burst_end_us = self.clock.now_us() + samples * self.conversion_time_us
+            elif mode == NORMAL and (previous & 0b11 != NORMAL or (previous ^ data[0]) & 0x60):
+                # conversions restart when leaving shutdown or changing resolution
+                self._last_conversion_us = self.clock.now_us()
+            if mode != BURST: self._burst_end_us = None
+            return
+
+        if REGISTER_ALERT_CONFIG <= register < REGISTER_ALERT_CONFIG + 4 and data[0] & 0x80:
+            # interrupt clear is a strobe, it reads back as 0
+            bit = 1 << (register - REGISTER_ALERT_CONFIG)
+            self._latched &= ~bit
+            self.registers[REGISTER_STATUS][0] &= ~bit
+            data = bytes((data[0] & 0x7F,)) + data[1:]
+
+        width = len(stored)
+        stored[:min(width, len(data))] = data[:width]
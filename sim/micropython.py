@@ -0,0 +1,16 @@
+"""Stand-in for MicroPython's `micropython` module"""
+
+def const(value):
+    return value
+
+def native(func):
+    return func
+
+def viper(func):
+    return func
+
+def alloc_emergency_exception_buf(size:int) -> None:
+    pass
+
+def schedule(func, arg) -> None:
+    func(arg)
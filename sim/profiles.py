@@ -0,0 +1,91 @@
+"""Scriptable temperature profiles for `MCP9600Model`
+
+A profile is any function of the time in seconds that returns degrees Celsius, or `None`
+for an open thermocouple\n
+The functions here build common shapes and combine them, e.g. a noisy ramp with spikes
+and a dropout:
+
+    hot = dropout(spikes(noise(ramp(20, 5), 0.3), every_s=2, magnitude=40), 30, 31)
+"""
+
+import math
+import random
+
+def constant(celsius:float):
+    return lambda t: celsius
+
+def ramp(start:float, rate:float, *, limit:float|None=None):
+    """Linear ramp from `start` at `rate` degrees per second, held at `limit` if given"""
+    def profile(t):
+        value = start + rate * t
+        if limit is not None: value = min(value, limit) if rate >= 0 else max(value, limit)
+        return value
+    return profile
+
+def step(before:float, after:float, at_s:float):
+    return lambda t: before if t < at_s else after
+
+def sine(mean:float, amplitude:float, period_s:float):
+    return lambda t: mean + amplitude * math.sin(2 * math.pi * t / period_s)
+
+def piecewise(points:list):
+    """Linear interpolation between `(t, celsius)` points, held flat outside them"""
+    points = sorted(points)
+    def profile(t):
+        if t <= points[0][0]: return points[0][1]
+        for (t0, v0), (t1, v1) in zip(points, points[1:]):
+            if t <= t1: return v0 + (v1 - v0) * (t - t0) / (t1 - t0)
+        return points[-1][1]
+    return profile
+
+def sequence(segments:list):
+    """Runs `(duration_s, profile)` segments one after another, each seeing its own time
+    from 0, holding the last segment's profile after the end"""
+    def profile(t):
+        start = 0.0
+        for duration, segment in segments:
+            if t < start + duration: return segment(t - start)
+            start += duration
+        duration, segment = segments[-1]
+        return segment(t - start + duration)
+    return profile
+
+def noise(profile, sigma:float, *, seed:int=0):
+    """Adds Gaussian noise with standard deviation `sigma`, reproducible for a seed"""
+    generator = random.Random(seed)
+    def noisy(t):
+        value = profile(t)
+        return None if value is None else value + generator.gauss(0, sigma)
+    return noisy
+
+def spikes(profile, *, every_s:float, magnitude:float, width_s:float=0.001):
+    """Adds a single-sample spike of `magnitude` degrees every `every_s` seconds"""
+    def spiky(t):
+        value = profile(t)
+        if value is None: return None
+        return value + magnitude if t % every_s < width_s else value
+    return spiky
+
+def dropout(profile, start_s:float, end_s:float):
+    """Open thermocouple between `start_s` and `end_s`"""
+    return lambda t: None if start_s <= t < end_s else profile(t)
+
+def follow(target, tau_s:float, *, initial:float|None=None):
+    """First-order lag towards another profile with time constant `tau_s`, e.g. a
+    part heating while a relay is on:
+
+        hot = follow(lambda t: 300 if board.relays[0] else 25, tau_s=4, initial=25)
+
+    Stateful, so it must be evaluated at increasing times
+    """
+    state = {"t": None, "value": initial}
+    def lagged(t):
+        goal = target(t)
+        if state["value"] is None or state["t"] is None:
+            if state["value"] is None: state["value"] = goal
+        else:
+            dt = max(0.0, t - state["t"])
+            state["value"] += (goal - state["value"]) * (1 - math.exp(-dt / tau_s))
+        state["t"] = t
+        return state["value"]
+    return lagged
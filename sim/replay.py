@@ -0,0 +1,239 @@
+"""Replays I2C traces recorded by `adafruit_register.i2c_record.I2CRecorder`
+
+`ReplayI2C` is a `machine.I2C` compatible bus that answers each transaction from the next
+matching record of a trace and moves the virtual simulation clock to the time it was
+recorded, so drivers see the flight's data and timestamps as fast as the host runs them
+
+Code that talks to the bus differently from the recorded code is tolerated within
+`lookahead` records: unmatched records are skipped and writes the trace does not have
+are counted and dropped\n
+A read with no matching record left in the trace ends the replay like the end of the
+trace, as recordings usually stop with other traffic after the last sample
+
+Usage
+-----
+`python -m sim.replay flight.trc` replays a trace through `MCP9600.read_if_ready()` and
+prints the samples as CSV, for comparing the output of two versions of the code\n
+`python -m sim.replay flight.trc -o samples.csv`
+"""
+
+import struct
+import sys
+
+import sim
+from sim import automation
+from adafruit_register.i2c_record import MAGIC, VERSION, RECORD_FORMAT, RECORD_SIZE, READ_MEM, WRITE_MEM, TIME, WRITE, READ
+
+class ReplayMismatch(Exception):
+    """The code under test read something the trace does not have"""
+
+class Record:
+    """
+    One recorded transaction
+    """
+
+    __slots__ = ("kind", "address", "register", "data", "us")
+
+    def __init__(self, kind:int, address:int, register:int, data:bytes, us:int):
+        self.kind = kind
+        self.address = address
+        self.register = register
+        self.data = data
+        self.us = us
+
+def read_trace(filename:str) -> list:
+    """Reads a whole trace
+
+    Parameters
+    ----------
+    filename : `str`
+        The trace file
+
+    Returns
+    -------
+    records : `list[Record]`
+        Transactions in order, with `us` the time since the trace started\n
+        A truncated final record is dropped
+    """
+
+    with open(filename, "rb") as file:
+        data = file.read()
+    if data[:len(MAGIC)] != MAGIC: raise ValueError("Not an I2C trace")
+    if data[len(MAGIC)] != VERSION: raise ValueError(f"Unsupported I2C trace version {data[len(MAGIC)]}")
+
+    records = []
+    offset = len(MAGIC) + 1
+    now = 0
+    while offset + RECORD_SIZE <= len(data):
+        kind, address, register, length, delta = struct.unpack_from(RECORD_FORMAT, data, offset)
+        offset += RECORD_SIZE
+        if offset + length > len(data): break
+        payload = data[offset:offset + length]
+        offset += length
+        if kind == TIME:
+            now += struct.unpack("<I", payload)[0]
+            continue
+        now += delta
+        records.append(Record(kind, address, register, payload, now))
+    return records
+
+class ReplayI2C:
+    """
+    `machine.I2C` compatible bus that plays back a recorded trace
+
+    Raises `EOFError` once the trace is used up, or has no record left for a read, which
+    ends replay loops
+    """
+
+    skipped: int
+    extra_writes: int
+    changed_writes: int
+
+    def __init__(self, filename:str, *, clock=None, lookahead:int=64):
+        """
+        Parameters
+        ----------
+        filename : `str`
+            The trace file
+        clock : `sim.clock.Clock | None`
+            Virtual clock to move to each record's time, e.g. `Simulation.clock`\n
+            If `None` time is not replayed
+        lookahead : `int`
+            How many records to search for a transaction that does not match the next one
+        """
+
+        self.records = read_trace(filename)
+        self.clock = clock
+        self.lookahead = lookahead
+        self.position = 0
+        self.skipped = 0
+        self.extra_writes = 0
+        self.changed_writes = 0
+        self._start_us = clock.now_us() if clock is not None else 0
+
+    @property
+    def remaining(self) -> int:
+        return len(self.records) - self.position
+
+    def _match(self, kind:int, address:int, register:int, length:int) -> Record|None:
+        if self.position >= len(self.records): raise EOFError("End of I2C trace")
+        end = min(len(self.records), self.position + self.lookahead + 1)
+        for index in range(self.position, end):
+            record = self.records[index]
+            if (record.kind == kind and record.address == address
+                    and record.register == register and len(record.data) == length):
+                self.skipped += index - self.position
+                self.position = index + 1
+                if self.clock is not None: self.clock.set_us(self._start_us + record.us)
+                return record
+        return None
+
+    def _has_later(self, kind:int, address:int, register:int, length:int) -> bool:
+        for index in range(self.position + self.lookahead + 1, len(self.records)):
+            record = self.records[index]
+            if (record.kind == kind and record.address == address
+                    and record.register == register and len(record.data) == length):
+                return True
+        return False
+
+    def _read(self, kind:int, address:int, register:int, buf) -> None:
+        record = self._match(kind, address, register, len(buf))
+        if record is None:
+            if not self._has_later(kind, address, register, len(buf)):
+                raise EOFError("No further matching read in I2C trace")
+            raise ReplayMismatch(
+                f"No recorded read of {len(buf)} bytes from 0x{address:02x} register 0x{register:02x} "
+                f"within {self.lookahead} records of record {self.position}"
+            )
+        buf[:] = record.data
+
+    def _write(self, kind:int, address:int, register:int, buf) -> None:
+        record = self._match(kind, address, register, len(buf))
+        if record is None:
+            self.extra_writes += 1
+        elif record.data != bytes(buf):
+            self.changed_writes += 1
+
+    def scan(self) -> list:
+        return sorted({record.address for record in self.records})
+
+    def readfrom_mem_into(self, address:int, memaddr:int, buf, *, addrsize:int=8) -> None:
+        self._read(READ_MEM, address, memaddr, buf)
+
+    def readfrom_mem(self, address:int, memaddr:int, nbytes:int, *, addrsize:int=8) -> bytes:
+        buf = bytearray(nbytes)
+        self.readfrom_mem_into(address, memaddr, buf)
+        return bytes(buf)
+
+    def writeto_mem(self, address:int, memaddr:int, buf, *, addrsize:int=8) -> None:
+        self._write(WRITE_MEM, address, memaddr, buf)
+
+    def writeto(self, address:int, buf, stop:bool=True) -> int:
+        self._write(WRITE, address, 0, buf)
+        return len(buf)
+
+    def readfrom_into(self, address:int, buf, stop:bool=True) -> None:
+        self._read(READ, address, 0, buf)
+
+    def readfrom(self, address:int, nbytes:int, stop:bool=True) -> bytes:
+        buf = bytearray(nbytes)
+        self.readfrom_into(address, buf)
+        return bytes(buf)
+
+def install(filename:str, *, lookahead:int=64) -> tuple:
+    """Installs the simulation with a virtual clock and a `ReplayI2C` as the board's bus, so
+    `import pins` builds the firmware on the recorded traffic
+
+    Parameters
+    ----------
+    filename : `str`
+        The trace file
+    lookahead : `int`
+        See `ReplayI2C`
+
+    Returns
+    -------
+    simulation, bus : `tuple[sim.Simulation, ReplayI2C]`
+    """
+
+    simulation = sim.install(addresses=(), virtual=True)
+    bus = ReplayI2C(filename, clock=simulation.clock, lookahead=lookahead)
+    simulation.i2c = bus
+    automation.configure(bus, simulation.clock)
+    return simulation, bus
+
+def main(argv:list|None=None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a SPARX I2C trace through the MCP9600 driver")
+    parser.add_argument("trace", help="trace recorded by I2CRecorder")
+    parser.add_argument("-o", "--output", help="CSV file to write (default: stdout)")
+    parser.add_argument("--address", type=lambda text: int(text, 0), help="MCP9600 address (default: first in trace)")
+    args = parser.parse_args(argv)
+
+    simulation, bus = install(args.trace)
+    from thermocouple import MCP9600
+
+    address = args.address if args.address is not None else bus.scan()[0]
+    out = sys.stdout if args.output is None else open(args.output, "w")
+    samples = 0
+    try:
+        mcp = MCP9600(bus, address=address)
+        out.write("ticks,hot,delta,cold,status\n")
+        while True:
+            sample = mcp.read_if_ready()
+            if sample is None: continue
+            samples += 1
+            out.write(f"{sample.ticks},{sample.temperature},{sample.delta_temperature},{sample.ambient_temperature},{sample.status}\n")
+    except EOFError:
+        pass
+    finally:
+        if out is not sys.stdout: out.close()
+        simulation.uninstall()
+    sys.stderr.write(
+        f"{samples} samples, {bus.position} records replayed, {bus.skipped} skipped, "
+        f"{bus.extra_writes} extra and {bus.changed_writes} changed writes\n"
+    )
+
+if __name__ == "__main__":
+    main()
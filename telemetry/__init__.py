@@ -0,0 +1 @@
+from .frames import Telemetry
@@ -0,0 +1,145 @@
+"""Implements `Telemetry` class, which streams samples to the host as binary frames
+
+Replaces printing each temperature as text: a frame is 18 bytes, packed into a
+preallocated buffer, and is only written when the serial port can take it without
+blocking, so a host that stops reading never stalls the sampler
+
+Frame layout
+------------
+sync : `bytes`
+    `SYNC`, lets the reader find frame boundaries after garbage such as REPL output
+length, type : `int`
+    `<BB` payload length and `FRAME_*` frame type
+payload : `bytes`
+    For `FRAME_SAMPLE` one record packed with `log.binary.RECORD_FORMAT`
+checksum : `int`
+    `<H` Fletcher-16 of the length, type and payload bytes
+"""
+
+import struct
+import sys
+import time
+
+from log.binary import RECORD_FORMAT, RECORD_SIZE
+
+try:
+    import select
+except ImportError:
+    select = None
+
+SYNC = b"\xaa\x55"
+PREFIX_FORMAT = "<BB"
+CHECKSUM_FORMAT = "<H"
+
+FRAME_SAMPLE = 1
+
+# payload length of each frame type, anything else is not a frame
+PAYLOAD_SIZES = {FRAME_SAMPLE: RECORD_SIZE}
+
+_PAYLOAD_OFFSET = len(SYNC) + struct.calcsize(PREFIX_FORMAT)
+_SAMPLE_FRAME_SIZE = _PAYLOAD_OFFSET + RECORD_SIZE + struct.calcsize(CHECKSUM_FORMAT)
+
+def fletcher16(data, start:int=0, end:int|None=None) -> int:
+    """Fletcher-16 checksum of `data[start:end]`
+
+    Parameters
+    ----------
+    data : `bytes | bytearray | memoryview`
+        The bytes to check
+    start, end : `int`
+        Range of `data` to include
+
+    Returns
+    -------
+    checksum : `int`
+    """
+
+    if end is None: end = len(data)
+    low = high = 0
+    for i in range(start, end):
+        low = (low + data[i]) % 255
+        high = (high + low) % 255
+    return (high << 8) | low
+
+class Telemetry:
+    """
+    Sends thermocouple samples over a stream, by default USB serial, as checksummed frames
+
+    Frames are skipped rather than queued when sent faster than `min_interval_ms`, and
+    dropped when the stream is not writable
+    """
+
+    sent: int
+    skipped: int
+    dropped: int
+
+    def __init__(self, stream=None, *, min_interval_ms:int=0):
+        """
+        Parameters
+        ----------
+        stream : `Stream | None`
+            Where to write frames\n
+            If `None` the raw stdout stream is used, i.e. USB serial on the board
+        min_interval_ms : `int`
+            Shortest time between two frames, 0 to send every sample
+        """
+
+        if stream is None: stream = getattr(sys.stdout, "buffer", sys.stdout)
+        self.stream = stream
+        self.min_interval_ms = min_interval_ms
+        self.sent = 0
+        self.skipped = 0
+        self.dropped = 0
+        self._last_send = time.ticks_add(time.ticks_ms(), -min_interval_ms)
+
+        self._frame = bytearray(_SAMPLE_FRAME_SIZE)
+        self._frame[:len(SYNC)] = SYNC
+        struct.pack_into(PREFIX_FORMAT, self._frame, len(SYNC), RECORD_SIZE, FRAME_SAMPLE)
+
+        self._poll = None
+        if select is not None:
+            try:
+                self._poll = select.poll()
+                self._poll.register(stream, select.POLLOUT)
+            except (OSError, TypeError, ValueError):
+                # stream can't be polled, e.g. an in-memory buffer, always write
+                self._poll = None
+
+    def _writable(self) -> bool:
+        if self._poll is None: return True
+        return bool(self._poll.poll(0))
+
+    def send_sample(self, sample, relay:int=0) -> bool:
+        """Sends one sample, unless rate limited or the stream would block
+
+        Parameters
+        ----------
+        sample : `thermocouple.Snapshot`
+            The reading
+        relay : `int`
+            Relay state at the time of the reading
+
+        Returns
+        -------
+        sent : `bool`
+        """
+
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._last_send) < self.min_interval_ms:
+            self.skipped += 1
+            return False
+        if not self._writable():
+            self.dropped += 1
+            return False
+
+        frame = self._frame
+        struct.pack_into(
+            RECORD_FORMAT, frame, _PAYLOAD_OFFSET,
+            sample.ticks, sample.hot, sample.delta, sample.cold, sample.status, relay
+        )
+        end = _PAYLOAD_OFFSET + RECORD_SIZE
+        struct.pack_into(CHECKSUM_FORMAT, frame, end, fletcher16(frame, len(SYNC), end))
+        self.stream.write(frame)
+        self._last_send = now
+        self.sent += 1
+        return True
@@ -0,0 +1,195 @@
+"""Decodes the telemetry stream written by `telemetry.Telemetry`
+
+Runs on the host, not on the board
+
+Scans for `SYNC`, checks each frame's type, length and checksum and resynchronizes on the
+next `SYNC` after anything that does not decode, so REPL text or a partial frame on the
+serial line only costs the frames it overlaps\n
+An unknown type or a length that does not match it is rejected before waiting for the
+payload, so a false `SYNC` never holds back the frames after it
+
+Usage
+-----
+`python -m telemetry.reader /dev/ttyACM0` prints samples as CSV until interrupted\n
+`python -m telemetry.reader capture.raw -o samples.csv` decodes a saved stream\n
+Serial ports are opened with pyserial if it is installed, otherwise as plain files
+(set the port to raw mode first, e.g. `stty -F /dev/ttyACM0 raw`)
+"""
+
+import struct
+import sys
+from array import array
+
+from log.binary import RECORD_FORMAT, RECORD_FIELDS, TEMPERATURE_FIELDS, TEMPERATURE_SCALE
+from .frames import SYNC, PREFIX_FORMAT, CHECKSUM_FORMAT, FRAME_SAMPLE, PAYLOAD_SIZES, fletcher16
+
+_PREFIX_SIZE = struct.calcsize(PREFIX_FORMAT)
+_CHECKSUM_SIZE = struct.calcsize(CHECKSUM_FORMAT)
+
+# array type codes for each record field
+_ARRAY_CODES = {"I": "L", "h": "h", "B": "B"}
+
+class FrameReader:
+    """
+    Splits a byte stream into checked frames
+
+    Counts the bytes skipped while resynchronizing and the frames failing their type, length
+    or checksum check
+    """
+
+    skipped_bytes: int
+    bad_frames: int
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.skipped_bytes = 0
+        self.bad_frames = 0
+
+    def feed(self, data:bytes) -> list:
+        """Adds received bytes and returns every complete frame they finish
+
+        Parameters
+        ----------
+        data : `bytes`
+            Bytes read from the stream
+
+        Returns
+        -------
+        frames : `list[tuple[int, bytes]]`
+            `(frame_type, payload)` of each valid frame
+        """
+
+        frames = []
+        buffer = self._buffer
+        buffer += data
+        start = 0
+        while True:
+            sync = buffer.find(SYNC, start)
+            if sync < 0:
+                # keep a possible partial sync at the end
+                keep = len(SYNC) - 1 if buffer.endswith(SYNC[:1]) else 0
+                self.skipped_bytes += len(buffer) - start - keep
+                start = len(buffer) - keep
+                break
+            self.skipped_bytes += sync - start
+            start = sync
+
+            prefix_end = sync + len(SYNC) + _PREFIX_SIZE
+            if len(buffer) < prefix_end: break
+            length, frame_type = struct.unpack_from(PREFIX_FORMAT, buffer, sync + len(SYNC))
+            if PAYLOAD_SIZES.get(frame_type) != length:
+                # false sync, don't wait for a payload that isn't coming
+                self.bad_frames += 1
+                self.skipped_bytes += 1
+                start = sync + 1
+                continue
+            payload_end = prefix_end + length
+            frame_end = payload_end + _CHECKSUM_SIZE
+            if len(buffer) < frame_end: break
+
+            checksum, = struct.unpack_from(CHECKSUM_FORMAT, buffer, payload_end)
+            if checksum != fletcher16(buffer, sync + len(SYNC), payload_end):
+                # false sync or corrupted frame, look for the next sync
+                self.bad_frames += 1
+                self.skipped_bytes += 1
+                start = sync + 1
+                continue
+            frames.append((frame_type, bytes(buffer[prefix_end:payload_end])))
+            start = frame_end
+        del buffer[:start]
+        return frames
+
+def iter_samples(stream, chunk_size:int=4096):
+    """Yields each sample in a telemetry stream as a tuple of raw field values, in
+    `log.binary.RECORD_FIELDS` order
+
+    Parameters
+    ----------
+    stream : `BinaryIO`
+        Serial port or file to read until it ends
+    chunk_size : `int`
+        Bytes requested per read
+
+    Returns
+    -------
+    samples : `Iterator[tuple]`
+    """
+
+    reader = FrameReader()
+    unpacker = struct.Struct(RECORD_FORMAT)
+    while True:
+        data = stream.read(chunk_size)
+        if not data: return
+        for frame_type, payload in reader.feed(data):
+            if frame_type != FRAME_SAMPLE or len(payload) != unpacker.size: continue
+            yield unpacker.unpack(payload)
+
+def read_samples(stream, celsius:bool=True) -> dict:
+    """Reads a telemetry stream to its end into one array per field
+
+    Parameters
+    ----------
+    stream : `BinaryIO`
+        Serial port or file to read
+    celsius : `bool`
+        Convert temperature fields to float degrees Celsius\n
+        If `False` they are left in raw register units
+
+    Returns
+    -------
+    samples : `dict[str, array]`
+        Arrays keyed by field name
+    """
+
+    codes = RECORD_FORMAT.lstrip("<>!=@")
+    columns = {
+        field: array("d" if celsius and field in TEMPERATURE_FIELDS else _ARRAY_CODES[code])
+        for field, code in zip(RECORD_FIELDS, codes)
+    }
+    scaled = [celsius and field in TEMPERATURE_FIELDS for field in RECORD_FIELDS]
+    targets = [columns[field] for field in RECORD_FIELDS]
+    for sample in iter_samples(stream):
+        for column, value, scale in zip(targets, sample, scaled):
+            column.append(value / TEMPERATURE_SCALE if scale else value)
+    return columns
+
+def _is_port(path:str) -> bool:
+    return path.startswith("/dev/") or path.upper().startswith("COM")
+
+def _open(path:str):
+    if _is_port(path):
+        try:
+            import serial
+        except ImportError:
+            pass
+        else:
+            return serial.Serial(path, timeout=None)
+    return open(path, "rb", buffering=0)
+
+def main(argv:list|None=None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Decode a SPARX telemetry stream to CSV")
+    parser.add_argument("source", help="serial port or saved stream")
+    parser.add_argument("-o", "--output", help="CSV file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.output is None else open(args.output, "w")
+    scaled = [field in TEMPERATURE_FIELDS for field in RECORD_FIELDS]
+    try:
+        with _open(args.source) as stream:
+            out.write(",".join(RECORD_FIELDS) + "\n")
+            # small reads from a port, so samples show up as they arrive
+            chunk_size = 64 if _is_port(args.source) else 4096
+            for sample in iter_samples(stream, chunk_size):
+                out.write(",".join(
+                    str(value / TEMPERATURE_SCALE) if scale else str(value)
+                    for value, scale in zip(sample, scaled)
+                ) + "\n")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not sys.stdout: out.close()
+
+if __name__ == "__main__":
+    main()
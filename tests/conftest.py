@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sim
+
+@pytest.fixture
+def simulation():
+    """Simulated board with one MCP9600 at 0x60 on a virtual clock"""
+
+    simulation = sim.install(virtual=True, overhead_us=60)
+    yield simulation
+    simulation.uninstall()
+
+@pytest.fixture
+def live_simulation():
+    """Simulated board on the host clock, for `uasyncio` code such as `scheduler.Runtime`"""
+
+    simulation = sim.install(virtual=False)
+    sys.modules.pop("pins", None)
+    yield simulation
+    sys.modules.pop("pins", None)
+    simulation.uninstall()
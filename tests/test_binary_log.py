@@ -0,0 +1,84 @@
+import io
+import os
+
+def _samples(count:int) -> list:
+    from thermocouple import Snapshot
+
+    samples = []
+    for i in range(count):
+        sample = Snapshot()
+        # ticks past 2**31 and negative temperatures check the field types
+        sample.ticks = (0x7FFFFFF0 + i * 7) & 0xFFFFFFFF
+        sample.hot = 400 + i * 13 - 300
+        sample.delta = -i * 5
+        sample.cold = 350 + i
+        sample.status = i & 0xFF
+        samples.append(sample)
+    return samples
+
+def _fields(sample, relay:int) -> tuple:
+    return (sample.ticks, sample.hot, sample.delta, sample.cold, sample.status, relay)
+
+def test_records_read_back_across_block_boundaries(simulation, tmp_path):
+    from log import SampleLog
+    from log.binary import RECORD_SIZE, header
+    from log.decode import iter_records, to_csv
+
+    filename = str(tmp_path / "log1.bin")
+    samples = _samples(50)
+    # records and the header do not divide the block, so many records straddle two blocks
+    buffer_size = 64
+    assert buffer_size % RECORD_SIZE and len(header()) % RECORD_SIZE
+    log = SampleLog(filename, buffer_size=buffer_size, flush_interval_ms=None)
+    for i, sample in enumerate(samples[:30]):
+        log.write_sample(sample, i % 2)
+    log.close()
+    # appending to an existing log does not repeat the header
+    log = SampleLog(filename, buffer_size=buffer_size, flush_interval_ms=None)
+    for i, sample in enumerate(samples[30:], 30):
+        log.write_sample(sample, i % 2)
+    log.close()
+
+    assert os.path.getsize(filename) == len(header()) + 50 * RECORD_SIZE
+    assert list(iter_records(filename)) == [_fields(sample, i % 2) for i, sample in enumerate(samples)]
+
+    out = io.StringIO()
+    to_csv(filename, out)
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "ticks,hot,delta,cold,status,relay"
+    assert len(lines) == 51
+    last = samples[-1]
+    assert lines[-1] == f"{last.ticks},{last.hot / 16},{last.delta / 16},{last.cold / 16},{last.status},1"
+
+def test_truncated_record_is_skipped(simulation, tmp_path):
+    from log import SampleLog
+    from log.decode import iter_records
+
+    filename = str(tmp_path / "log1.bin")
+    samples = _samples(3)
+    log = SampleLog(filename, flush_interval_ms=None)
+    for sample in samples:
+        log.write_sample(sample)
+    log.close()
+    with open(filename, "ab") as file:
+        file.write(b"\x01\x02\x03")
+
+    assert list(iter_records(filename)) == [_fields(sample, 0) for sample in samples]
+
+def test_rotated_logs_each_start_with_a_header(simulation, tmp_path):
+    from log import SampleLog
+    from log.binary import RECORD_SIZE, header
+    from log.decode import iter_records
+
+    samples = _samples(20)
+    log = SampleLog.new_file(str(tmp_path), max_bytes=len(header()) + 8 * RECORD_SIZE, buffer_size=64)
+    for sample in samples:
+        log.write_sample(sample)
+    log.close()
+
+    names = sorted(name for name in os.listdir(tmp_path) if name.endswith(".bin"))
+    assert names == ["log1.bin", "log2.bin", "log3.bin"]
+    records = []
+    for name in names:
+        records += list(iter_records(str(tmp_path / name)))
+    assert records == [_fields(sample, 0) for sample in samples]
@@ -0,0 +1,44 @@
+import time
+
+class _Recorder:
+    # stands in for the file handle, recording the size of every write
+    def __init__(self, file):
+        self.file = file
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(len(data))
+        return self.file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+def test_writes_are_block_aligned_until_the_interval(simulation, tmp_path):
+    from log.buffer import BlockWriter
+
+    writer = BlockWriter(str(tmp_path / "data.bin"), block_size=64, flush_interval_ms=100)
+    writer._file = recorder = _Recorder(writer._file)
+    record = bytes(range(12))
+    for _ in range(20):
+        writer.write(record)
+        writer.flush_if_due()
+        time.sleep_ms(2)
+
+    # 240 bytes within the interval: only whole blocks written, the rest still buffered
+    assert recorder.writes == [64, 64, 64]
+    assert writer.size == 240
+
+    time.sleep_ms(100)
+    writer.flush_if_due()
+    assert recorder.writes == [64, 64, 64, 48]
+
+    # a new interval starts at the flush
+    writer.write(record)
+    time.sleep_ms(50)
+    writer.flush_if_due()
+    assert recorder.writes == [64, 64, 64, 48]
+
+    writer.close()
+    assert recorder.writes == [64, 64, 64, 48, 12]
+    with open(tmp_path / "data.bin", "rb") as file:
+        assert file.read() == record * 21
@@ -0,0 +1,55 @@
+def _snapshot(ticks:int):
+    from thermocouple import Snapshot
+
+    sample = Snapshot()
+    sample.ticks = ticks
+    sample.hot = ticks * 16
+    sample.delta = -ticks
+    sample.cold = 400
+    sample.status = ticks & 0xFF
+    return sample
+
+def test_ring_wraps_around(simulation):
+    from dualcore import SampleRing
+
+    ring = SampleRing(3)
+    out = _snapshot(0)
+    ticks = 0
+    for _ in range(5):
+        # two in, two out moves the indices past the end of the storage
+        assert ring.push(_snapshot(ticks)) and ring.push(_snapshot(ticks + 1))
+        assert len(ring) == 2
+        for expected in (ticks, ticks + 1):
+            assert ring.pop(out)
+            assert (out.ticks, out.hot, out.delta, out.cold, out.status) == (expected, expected * 16, -expected, 400, expected)
+        ticks += 2
+        assert len(ring) == 0
+    assert not ring.pop(out)
+
+def test_full_ring_drops_new_samples(simulation):
+    from dualcore import SampleRing
+
+    ring = SampleRing(3)
+    for ticks in range(3):
+        assert ring.push(_snapshot(ticks))
+    assert len(ring) == 3
+    assert not ring.push(_snapshot(3))
+    assert ring.dropped == 1
+    assert len(ring) == 3
+
+    # the unread samples are kept, not overwritten
+    out = _snapshot(0)
+    assert [ring.pop(out) and out.ticks for _ in range(3)] == [0, 1, 2]
+    assert ring.push(_snapshot(4))
+    assert len(ring) == 1
+
+def test_conversion_period_does_not_touch_the_bus(simulation):
+    from dualcore import CoreSampler
+    from thermocouple import MCP9600
+
+    mcp = MCP9600(simulation.i2c, address=0x60)
+    mcp.set_profile("balanced")
+    sampler = CoreSampler(mcp)
+    transactions = simulation.i2c.transactions
+    assert sampler.conversion_period_ms == 80
+    assert simulation.i2c.transactions == transactions
@@ -0,0 +1,70 @@
+import pytest
+
+@pytest.fixture(autouse=True)
+def _shims(simulation):
+    # `thermocouple` needs the MicroPython stand-ins
+    yield
+
+def _snapshot(ticks:int, hot:int):
+    from thermocouple import Snapshot
+
+    sample = Snapshot()
+    sample.ticks = ticks
+    sample.hot = hot
+    sample.delta = hot - 400
+    sample.cold = 400
+    sample.status = 0x40
+    return sample
+
+def _collect(received:list):
+    from pipeline import sink
+
+    return sink(lambda sample: received.append((sample.ticks, sample.hot, sample.delta, sample.cold, sample.status)))
+
+def test_median_rejects_single_spikes():
+    from pipeline import median
+
+    received = []
+    stage = median(3, _collect(received))
+    for ticks, hot in enumerate((100, 5000, 104, 102, -3000, 106)):
+        stage.send(_snapshot(ticks, hot))
+
+    # the first value passes alone, then the median of two, then of three
+    assert [hot for _, hot, _, _, _ in received] == [100, 5000, 104, 104, 102, 102]
+    # everything but the hot junction is passed through from the latest sample
+    assert received[-1] == (5, 102, 106 - 400, 400, 0x40)
+
+def test_moving_average_rounds_down_over_a_partial_window():
+    from pipeline import moving_average
+
+    received = []
+    stage = moving_average(4, _collect(received))
+    for ticks, hot in enumerate((10, 20, 31, 40, 50, -50)):
+        stage.send(_snapshot(ticks, hot))
+
+    assert [hot for _, hot, _, _, _ in received] == [10, 15, 20, 25, 35, 17]
+    assert [ticks for ticks, _, _, _, _ in received] == [0, 1, 2, 3, 4, 5]
+
+def test_filters_do_not_modify_the_input():
+    from pipeline import moving_average
+
+    received = []
+    sample = _snapshot(7, 100)
+    stage = moving_average(2, _collect(received))
+    stage.send(_snapshot(6, 300))
+    stage.send(sample)
+
+    assert sample.hot == 100
+    assert received[-1][:2] == (7, 200)
+
+def test_decimate_forwards_every_nth_sample():
+    from pipeline import broadcast, decimate
+
+    received = []
+    raw = []
+    stage = broadcast(_collect(raw), decimate(3, _collect(received)))
+    for ticks in range(10):
+        stage.send(_snapshot(ticks, ticks * 16))
+
+    assert len(raw) == 10
+    assert [ticks for ticks, _, _, _, _ in received] == [2, 5, 8]
@@ -0,0 +1,48 @@
+import os
+import tracemalloc
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_REGISTER_FILES = (tracemalloc.Filter(True, os.path.join(_ROOT, "adafruit_register", "*")),)
+
+def _allocated(func, repeats:int=200) -> int:
+    func() # first use allocates the device's register buffers
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(_REGISTER_FILES)
+        for _ in range(repeats):
+            func()
+        after = tracemalloc.take_snapshot().filter_traces(_REGISTER_FILES)
+    finally:
+        tracemalloc.stop()
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+def _mcp(simulation):
+    from thermocouple import MCP9600
+
+    return MCP9600(simulation.i2c, address=0x60)
+
+def test_bit_access_does_not_allocate(simulation):
+    mcp = _mcp(simulation)
+    assert _allocated(lambda: mcp.temperature_update) == 0
+    assert _allocated(lambda: setattr(mcp, "ambient_resolution", True)) == 0
+
+def test_bits_access_does_not_allocate(simulation):
+    mcp = _mcp(simulation)
+    assert _allocated(lambda: mcp.filter_coefficient) == 0
+    assert _allocated(lambda: setattr(mcp, "filter_coefficient", 3)) == 0
+
+def test_struct_access_does_not_allocate(simulation):
+    mcp = _mcp(simulation)
+    assert _allocated(lambda: mcp._alert_1_hysteresis) == 0
+    assert _allocated(lambda: setattr(mcp, "_alert_1_hysteresis", 2)) == 0
+
+def test_register_buffers_are_per_device(simulation):
+    from thermocouple import MCP9600
+
+    simulation.i2c.attach(0x61, type(simulation.devices[0x60])(simulation.clock))
+    first = MCP9600(simulation.i2c, address=0x60)
+    second = MCP9600(simulation.i2c, address=0x61)
+    first.filter_coefficient = 1
+    second.filter_coefficient = 5
+    assert first._register_buffers[1] is not second._register_buffers[1]
+    assert (first.filter_coefficient, second.filter_coefficient) == (1, 5)
@@ -0,0 +1,28 @@
+import errno
+
+import pytest
+
+def test_failed_batch_write_drops_unwritten_shadow(simulation):
+    from thermocouple import MCP9600
+
+    mcp = MCP9600(simulation.i2c, address=0x60)
+    mcp.enable_register_cache()
+    mcp.filter_coefficient = 0
+    resolution = mcp.adc_resolution
+    device = mcp.i2c_device
+    write = device.writeto_mem
+
+    def failing_write(memaddr, buf):
+        if memaddr == 0x06: raise OSError(errno.EIO)
+        write(memaddr, buf)
+
+    device.writeto_mem = failing_write
+    with pytest.raises(OSError):
+        with mcp.batch():
+            mcp.filter_coefficient = 4
+            mcp.adc_resolution = (resolution + 1) % 4
+    device.writeto_mem = write
+
+    # 0x05 was written before the failure, 0x06 must be re-read from the device
+    assert mcp.filter_coefficient == 4
+    assert mcp.adc_resolution == resolution
@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+from adafruit_register.i2c_record import I2CRecorder
+from sim import replay
+
+def _record(simulation, path, samples:int) -> None:
+    from thermocouple import MCP9600
+
+    recorder = I2CRecorder(simulation.i2c, path)
+    mcp = MCP9600(recorder, address=0x60)
+    read = 0
+    while read < samples:
+        if mcp.read_if_ready() is None:
+            time.sleep_ms(1)
+        else:
+            read += 1
+    # trailing traffic that the replay loop never asks for
+    mcp.adc_resolution
+    recorder.close()
+
+def test_replay_ends_at_trailing_traffic(simulation, tmp_path, capsys):
+    trace = str(tmp_path / "flight.trc")
+    output = tmp_path / "samples.csv"
+    _record(simulation, trace, 20)
+
+    replay.main([trace, "-o", str(output)])
+
+    rows = output.read_text().splitlines()
+    assert rows[0] == "ticks,hot,delta,cold,status"
+    assert len(rows) == 21
+    assert capsys.readouterr().err.startswith("20 samples")
+
+def test_replay_mismatch_before_end(simulation, tmp_path):
+    trace = str(tmp_path / "flight.trc")
+    _record(simulation, trace, 20)
+
+    # the trace opens with configuration traffic, its first status read is out of reach
+    bus = replay.ReplayI2C(trace, lookahead=0)
+    with pytest.raises(replay.ReplayMismatch):
+        bus.readfrom_mem(0x60, 0x04, 1)
@@ -0,0 +1,43 @@
+import os
+
+from log.rotation import LogSequence
+
+def _touch(folder, *names):
+    for name in names:
+        open(os.path.join(folder, name), "w").close()
+
+def test_first_log_prunes_every_stale_log(tmp_path):
+    _touch(tmp_path, "log1.txt", "log2.txt", "log7.txt", "log8.txt", "log9.txt", "notes.txt")
+    sequence = LogSequence(str(tmp_path), max_files=2)
+
+    assert sequence.next_path() == sequence.path(10)
+    assert sorted(os.listdir(tmp_path)) == [".log.txt.seq", "log9.txt", "notes.txt"]
+
+    sequence.next_path()
+    assert sorted(os.listdir(tmp_path)) == [".log.txt.seq", "notes.txt"]
+
+def test_missing_folder_is_created(tmp_path):
+    folder = tmp_path / "logs"
+    sequence = LogSequence(str(folder) + "/", suffix=".bin")
+
+    assert sequence.next_path() == sequence.path(1)
+    assert sorted(os.listdir(folder)) == [".log.bin.seq"]
+    # an existing folder is fine too
+    assert LogSequence(str(folder), suffix=".bin").next_path() == sequence.path(2)
+
+def test_capture_writes_into_a_missing_folder(simulation, tmp_path):
+    from capture import TriggerCapture
+    from thermocouple import MCP9600
+
+    folder = str(tmp_path / "logs") + "/"
+    mcp = MCP9600(simulation.i2c, address=0x60)
+    capture = TriggerCapture(mcp, pre_samples=4, post_samples=4, folder=folder)
+    for _ in range(4):
+        capture.add(mcp.read_all())
+    capture.trigger(0)
+    for _ in range(4):
+        capture.add(mcp.read_all())
+    path = capture.write_pending()
+
+    assert path == folder + "event1.bin"
+    assert os.path.exists(path)
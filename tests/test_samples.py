@@ -0,0 +1,49 @@
+import pytest
+
+from samples import SampleStore
+
+def _reference(values:list, n:int|None) -> tuple:
+    recent = values if n is None else values[-n:]
+    return min(recent), max(recent), sum(recent) // len(recent)
+
+def _fill(store:SampleStore, hots:list) -> None:
+    for i, hot in enumerate(hots):
+        store.append(i, hot, -hot, 400 + i, i & 1)
+
+HOTS = [400, -35, 1200, 7, 7, -800, 300, 1599, 12, -1, 640]
+
+def test_window_before_the_store_fills():
+    store = SampleStore(16)
+    _fill(store, HOTS)
+
+    assert len(store) == len(HOTS)
+    for n in (None, 1, 3, 5, len(HOTS), 100):
+        assert store.summary("hot", n) == _reference(HOTS, n)
+        assert list(store.window("hot", n)) == (HOTS if n is None else HOTS[-n:])
+    assert store.summary("delta", 4) == _reference([-hot for hot in HOTS], 4)
+
+def test_window_after_the_store_wraps_around():
+    capacity = 4
+    store = SampleStore(capacity)
+    # oldest slots are overwritten, so windows cross the end of the arrays
+    for count in range(capacity + 1, len(HOTS) + 1):
+        store.clear()
+        _fill(store, HOTS[:count])
+        kept = HOTS[count - capacity:count]
+
+        assert len(store) == capacity
+        for n in (None, 1, 2, 3, capacity, capacity + 3):
+            window = store.window("hot", n)
+            expected = kept if n is None else kept[-n:]
+            assert list(window) == expected
+            assert [window[i] for i in range(len(window))] == expected
+            assert window[-1] == HOTS[count - 1] == store.latest("hot")
+            assert (window.min(), window.max(), window.mean()) == _reference(kept, n)
+        assert store.summary("ticks") == _reference(list(range(count - capacity, count)), None)
+
+def test_empty_window():
+    store = SampleStore(4)
+    with pytest.raises(ValueError):
+        store.summary("hot")
+    with pytest.raises(IndexError):
+        store.latest("hot")
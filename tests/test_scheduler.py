@@ -0,0 +1,42 @@
+import asyncio
+
+def _run(runtime, seconds:float) -> None:
+    async def run():
+        task = asyncio.create_task(runtime.main())
+        await asyncio.sleep(seconds)
+        runtime.stop()
+        await task
+    asyncio.run(run())
+
+def test_irq_boot_with_run_switch_on(live_simulation):
+    live_simulation.set_input(0, 1)
+    import pins
+    from scheduler import Runtime
+
+    pins.run_pin.enable_irq(debounce_ms=5)
+    runtime = Runtime(run_pin=pins.run_pin, relays=(pins.valve,))
+    _run(runtime, 0.05)
+
+    assert runtime.running
+    assert live_simulation.board.relays[pins.VALVE_RELAY]
+
+def test_shorter_period_cuts_the_wait_short(live_simulation):
+    from scheduler import PeriodicTask
+
+    periodic = PeriodicTask("test", 1000)
+    async def run():
+        task = periodic.start(lambda: None)
+        await asyncio.sleep(0.01)
+        periodic.set_period(5)
+        await asyncio.sleep(0.1)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return task
+    task = asyncio.run(run())
+
+    # one run before the change, then one every 5 ms instead of waiting out the second
+    assert periodic.runs >= 10
+    assert task.cancelled()
@@ -0,0 +1,27 @@
+import io
+
+from telemetry.frames import SYNC, FRAME_SAMPLE, Telemetry
+from telemetry.reader import FrameReader
+
+def _frames(samples:int) -> bytes:
+    from thermocouple import Snapshot
+
+    stream = io.BytesIO()
+    telemetry = Telemetry(stream)
+    snapshot = Snapshot()
+    for i in range(samples):
+        snapshot.ticks = i
+        snapshot.hot = 16 * i
+        telemetry.send_sample(snapshot)
+    return stream.getvalue()
+
+def test_false_sync_does_not_hold_back_frames(simulation):
+    data = _frames(3)
+    # a stray sync claiming a 170 byte payload, longer than everything after it
+    stream = b"junk" + SYNC + b"\xaa\x01" + data
+    reader = FrameReader()
+
+    frames = reader.feed(stream)
+
+    assert [frame_type for frame_type, _ in frames] == [FRAME_SAMPLE] * 3
+    assert reader.bad_frames == 1
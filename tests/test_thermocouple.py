@@ -0,0 +1,18 @@
+import time
+
+def test_poll_burst_does_not_block(simulation):
+    from thermocouple import MCP9600
+
+    mcp = MCP9600(simulation.i2c, address=0x60)
+    samples = MCP9600.BURST_SAMPLES_8
+    mcp.start_burst(samples)
+    start = simulation.clock.now_us()
+    assert mcp.poll_burst() is None
+    # a pending poll is one status read, not a wait for the burst
+    assert simulation.clock.now_us() - start < 1000
+
+    time.sleep_ms(mcp.burst_duration_ms(samples))
+    reading = mcp.poll_burst()
+    assert reading is not None
+    assert mcp.shutdown_mode == MCP9600.SHUTDOWN
+    assert not mcp.burst_complete
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+import sim
+from sim import profiles
+
+ADDRESSES = (0x60, 0x61, 0x62, 0x63)
+RATE = 100.0 # degrees per second
+
+@pytest.fixture
+def array_simulation():
+    simulation = sim.install(hot=profiles.ramp(20, RATE), addresses=ADDRESSES, virtual=True, overhead_us=60)
+    yield simulation
+    simulation.uninstall()
+
+def _array(simulation, **kwargs):
+    from thermocouple_array import ThermocoupleArray
+
+    array = ThermocoupleArray(simulation.i2c, addresses=ADDRESSES, **kwargs)
+    array.start()
+    return array
+
+def _frames(array, seconds:float) -> list:
+    # copies of every frame completed within `seconds`
+    frames = []
+    end = time.ticks_add(time.ticks_ms(), int(seconds * 1000))
+    while time.ticks_diff(end, time.ticks_ms()) > 0:
+        frame = array.poll()
+        if frame is not None:
+            frames.append((frame.ticks, list(frame.hot), list(frame.valid)))
+        time.sleep_ms(array.poll_period_ms)
+    return frames
+
+def test_conversions_are_staggered(array_simulation):
+    array = _array(array_simulation)
+    offset = array.period_ms // len(ADDRESSES)
+
+    assert array.period_ms == 80
+    for i in range(1, len(ADDRESSES)):
+        gap = time.ticks_diff(array._due[i], array._due[i - 1])
+        assert abs(gap - offset) <= 1
+
+def test_tcfilter_overrides_the_profile(array_simulation):
+    from thermocouple import MCP9600
+
+    array = _array(array_simulation, tcfilter=0)
+    assert all(device.filter_coefficient == 0 for device in array.devices)
+
+    array = _array(array_simulation)
+    assert all(device.filter_coefficient == MCP9600.PROFILES["balanced"][2] for device in array.devices)
+
+def test_channels_are_interpolated_to_the_frame_time(array_simulation):
+    start_us = array_simulation.clock.now_us()
+    array = _array(array_simulation, tcfilter=0)
+    frames = _frames(array, 1.0)
+
+    assert len(frames) >= 10
+    for ticks, hot, valid in frames[2:]:
+        assert all(valid)
+        expected = 20 + RATE * (time.ticks_diff(ticks, start_us // 1000)) / 1000
+        # unaligned channels would be up to a conversion period apart, 8 degrees at this rate
+        for value in hot:
+            assert abs(value / 16 - expected) < 1.0
+        assert max(hot) - min(hot) <= 8 # half a degree
+
+def test_missing_channel_times_out(array_simulation):
+    array = _array(array_simulation)
+    _frames(array, 0.3)
+    del array_simulation.i2c.devices[0x62]
+
+    frames = _frames(array, 1.0)
+    assert frames
+    for ticks, hot, valid in frames[1:]:
+        assert valid == [1, 1, 0, 1]
+    assert array.errors > 0
+    assert array.missed >= len(frames) - 1
+    # without the channel frames wait for the timeout instead of every conversion
+    assert len(frames) <= 1.0 * 1000 // (array.timeout_periods * array.period_ms) + 1
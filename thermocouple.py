@@ -30,12 +30,16 @@ Implementation Notes
 * Adafruit's Bus Device library: https://github.com/adafruit/Adafruit_CircuitPython_BusDevice
 """
 
+import time
+from array import array
 from struct import unpack
 from micropython import const
 
 from adafruit_register.i2c_struct import UnaryStruct
 from adafruit_register.i2c_bits import RWBits, ROBits
 from adafruit_register.i2c_bit import RWBit, ROBit
+from adafruit_register.register_cache import RegisterCache, RegisterBatch
+from adafruit_register.i2c_device import I2CDevice
 
 __version__ = "0.0.0-auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MCP9600.git"
@@ -45,15 +49,106 @@ _DEFAULT_ADDRESS = const(0x67)
 _REGISTER_HOT_JUNCTION = const(0x00)
 _REGISTER_DELTA_TEMP = const(0x01)
 _REGISTER_COLD_JUNCTION = const(0x02)
+_REGISTER_STATUS = const(0x04)
 _REGISTER_THERM_CFG = const(0x05)
 _REGISTER_VERSION = const(0x20)
 
+_STATUS_TEMPERATURE_UPDATE = const(0x40)
+
+# hot junction conversion time for each ADC resolution setting (18, 16, 14, 12-bit)
+_CONVERSION_TIMES_MS = (320, 80, 20, 5)
+
+# registers that only change when written: thermocouple and device config, alert config,
+# hysteresis and limits, and the device ID
+_CACHEABLE_REGISTERS = (0x05, 0x06) + tuple(range(0x08, 0x14)) + (_REGISTER_VERSION,)
+
+
+FIXED_SCALE = const(16)
+"""Fixed-point temperatures are integers in 1/``FIXED_SCALE`` degrees Celsius, the unit the
+temperature registers deliver."""
+
+
+def fixed_temperature(byteData, offset=0):
+    """Decodes a temperature register pair into a fixed-point integer, without float math.
+
+    :param byteData: Buffer holding the register's upper and lower byte.
+    :param int offset: Index of the upper byte in ``byteData``.
+    :return: The temperature in 1/16 degrees Celsius.
+    """
+    # Taken from MCP9600 Datasheet:
+    # TΔ = (UpperByte x 16 + LowerByte / 16), minus 4096 when negative,
+    # i.e. a 16-bit two's complement value in 1/16 degrees Celsius
+    value = byteData[offset] << 8 | byteData[offset + 1]
+    if value & 0x8000:
+        value -= 0x10000
+    return value
+
+
+def decode_fixed(byteData, out=None):
+    """Decodes a buffer of consecutive temperature register pairs in one pass.
+
+    :param byteData: Buffer of big-endian register pairs.
+    :param array out: ``array('h')`` to fill, at least ``len(byteData) // 2`` long. Allocated
+                      if `None`.
+    :return: ``out``, holding temperatures in 1/16 degrees Celsius.
+    """
+    count = len(byteData) // 2
+    if out is None:
+        out = array("h", [0] * count)
+    for i in range(count):
+        value = byteData[2 * i] << 8 | byteData[2 * i + 1]
+        out[i] = value - ((value & 0x8000) << 1)
+    return out
+
+
+def fixed_to_celsius(value):
+    """Converts a fixed-point temperature to degrees Celsius. Meant for display and export only,
+    as it allocates a float."""
+    return value / FIXED_SCALE
+
+
+class Snapshot:
+    """
+    One reading of the hot junction, delta and cold junction temperatures plus the status
+    register, filled in place by :meth:`MCP9600.read_all`.
+
+    Temperatures are stored as the raw signed register values, in 1/16 degrees Celsius, so
+    taking a reading does not allocate. The ``*_temperature`` properties convert to Celsius.
+    """
+
+    def __init__(self):
+        self.ticks = 0
+        """``time.ticks_ms()`` at the time of the reading."""
+        self.hot = 0
+        """Hot junction temperature in 1/16 degrees Celsius."""
+        self.delta = 0
+        """Delta temperature in 1/16 degrees Celsius."""
+        self.cold = 0
+        """Cold junction temperature in 1/16 degrees Celsius."""
+        self.status = 0
+        """Raw status register (0x4)."""
+
+    @property
+    def temperature(self):
+        """ Hot junction temperature in Celsius """
+        return fixed_to_celsius(self.hot)
+
+    @property
+    def delta_temperature(self):
+        """ Delta temperature in Celsius """
+        return fixed_to_celsius(self.delta)
+
+    @property
+    def ambient_temperature(self):
+        """ Cold junction/ambient/room temperature in Celsius """
+        return fixed_to_celsius(self.cold)
+
 
 class MCP9600:
     """
     Interface to the MCP9600 thermocouple amplifier breakout
 
-    :param ~busio.I2C i2c: The I2C bus the MCP9600 is connected to.
+    :param ~machine.I2C i2c: The I2C bus the MCP9600 is connected to.
     :param int address: The I2C address of the device. Defaults to :const:`0x67`
     :param str tctype: Thermocouple type. Defaults to :const:`"K"`
     :param int tcfilter: Value for the temperature filter. Can limit spikes in
@@ -132,6 +227,20 @@ class MCP9600:
     AMBIENT_RESOLUTION_0_0625 = 0  # 0.0625 degrees Celsius
     AMBIENT_RESOLUTION_0_25 = 1  # 0.25 degrees Celsius
 
+    # Thermocouple ADC resolution options, with their conversion times
+    ADC_RESOLUTION_18 = 0b00  # 320 ms
+    ADC_RESOLUTION_16 = 0b01  # 80 ms
+    ADC_RESOLUTION_14 = 0b10  # 20 ms
+    ADC_RESOLUTION_12 = 0b11  # 5 ms
+
+    # Speed/precision profiles for :meth:`set_profile`:
+    # (ADC resolution, ambient resolution, filter coefficient)
+    PROFILES = {
+        "fast": (ADC_RESOLUTION_12, AMBIENT_RESOLUTION_0_25, 0),
+        "balanced": (ADC_RESOLUTION_16, AMBIENT_RESOLUTION_0_0625, 2),
+        "precise": (ADC_RESOLUTION_18, AMBIENT_RESOLUTION_0_0625, 4),
+    }
+
     # STATUS - 0x4
     burst_complete = RWBit(0x4, 7)
     """Burst complete."""
@@ -147,6 +256,9 @@ class MCP9600:
     """Alert 3 status."""
     alert_4 = ROBit(0x4, 3)
     """Alert 4 status."""
+    # Thermocouple Sensor Configuration - 0x5
+    filter_coefficient = RWBits(3, 0x5, 0)
+    """Digital filter coefficient, from 0 (off) to 7 (maximum filtering)."""
     # Device Configuration - 0x6
     ambient_resolution = RWBit(0x6, 7)
     """Ambient (cold-junction) temperature resolution. Options are ``AMBIENT_RESOLUTION_0_0625``
@@ -155,6 +267,10 @@ class MCP9600:
     """The number of samples taken during a burst in burst mode. Options are ``BURST_SAMPLES_1``,
     ``BURST_SAMPLES_2``, ``BURST_SAMPLES_4``, ``BURST_SAMPLES_8``, ``BURST_SAMPLES_16``,
     ``BURST_SAMPLES_32``, ``BURST_SAMPLES_64``, ``BURST_SAMPLES_128``."""
+    adc_resolution = RWBits(2, 0x6, 5)
+    """Thermocouple ADC resolution, which sets the conversion time. Options are
+    ``ADC_RESOLUTION_18``, ``ADC_RESOLUTION_16``, ``ADC_RESOLUTION_14`` and
+    ``ADC_RESOLUTION_12``."""
     shutdown_mode = RWBits(2, 0x6, 0)
     """Shutdown modes. Options are ``NORMAL``, ``SHUTDOWN``, and ``BURST``."""
     # Alert 1 Configuration - 0x8
@@ -196,21 +312,29 @@ class MCP9600:
     # Alert 1 Limit - 0x10
     _alert_1_temperature_limit = UnaryStruct(0x10, ">H")
     # Alert 2 Limit - 0x11
-    _alert_2_limit = UnaryStruct(0x11, ">H")
+    _alert_2_temperature_limit = UnaryStruct(0x11, ">H")
     # Alert 3 Limit - 0x12
-    _alert_3_limit = UnaryStruct(0x12, ">H")
+    _alert_3_temperature_limit = UnaryStruct(0x12, ">H")
     # Alert 4 Limit - 0x13
-    _alert_4_limit = UnaryStruct(0x13, ">H")
+    _alert_4_temperature_limit = UnaryStruct(0x13, ">H")
     # Device ID/Revision - 0x20
     _device_id = ROBits(8, 0x20, 8, register_width=2, lsb_first=False)
     _revision_id = ROBits(8, 0x20, 0, register_width=2)
 
     types = ("K", "J", "T", "N", "S", "E", "B", "R")
 
+    CONFIG_REGISTERS = _CACHEABLE_REGISTERS
+    """Registers that only change when written, see :meth:`enable_register_cache`."""
+
+    register_cache = None
+    """Shadow of the configuration registers, or `None` when caching is disabled.
+    See :meth:`enable_register_cache`."""
+
     def __init__(self, myi2c, address=_DEFAULT_ADDRESS, tctype="K", tcfilter=0):
         self.buf = bytearray(2)
         self.singlebyte = bytearray(1)
-        self.i2c_device = myi2c
+        self.snapshot = Snapshot()
+        self.i2c_device = I2CDevice(myi2c, address)
         self.ADDR = address
         self.type = tctype
 
@@ -222,15 +346,64 @@ class MCP9600:
         tcfilter = min(7, max(0, tcfilter))
         ttype = MCP9600.types.index(tctype)
 
-        self.buf[0] = _REGISTER_THERM_CFG
-        self.buf[1] = tcfilter | (ttype << 4)
-        self.i2c_device.writeto(self.ADDR, self.buf)
-        
-        # I was having trouble porting this, I think this is some sort of self check
-        #with self.i2c_device as tci2c:
-        #    tci2c.write(self.buf, end=2)
-        # if self._device_id != 0x40:
-        #     raise RuntimeError("Failed to find MCP9600 - check wiring!")
+        self.singlebyte[0] = tcfilter | (ttype << 4)
+        self.i2c_device.writeto_mem(_REGISTER_THERM_CFG, self.singlebyte)
+
+        if self._device_id != 0x40:
+            raise RuntimeError("Failed to find MCP9600 - check wiring!")
+
+    def enable_register_cache(self, enable=True):
+        """Keeps a write-through shadow copy of the configuration registers so that repeated
+        configuration reads and read-modify-writes are served from RAM. The status and
+        temperature registers are never cached.
+
+        If the device may be reconfigured behind the driver's back (e.g. after a power cycle),
+        call ``register_cache.invalidate()`` or ``register_cache.refresh(mcp)``.
+
+        :param bool enable: `True` to enable the cache, `False` to disable and drop it.
+
+        """
+        self.register_cache = RegisterCache(_CACHEABLE_REGISTERS) if enable else None
+
+    def set_profile(self, profile):
+        """Sets the thermocouple ADC resolution, ambient resolution and filter coefficient
+        together from one of the :attr:`PROFILES`, in a single batched update.
+
+        * ``"fast"``: 12-bit, 5 ms conversions, no filtering. For fast transients.
+        * ``"balanced"``: 16-bit, 80 ms conversions, light filtering.
+        * ``"precise"``: 18-bit, 320 ms conversions, heavier filtering. For steady state.
+
+        :param str profile: The profile name.
+        :return: The expected conversion period in milliseconds, see
+                 :attr:`conversion_period_ms`.
+        """
+        if profile not in MCP9600.PROFILES:
+            raise ValueError("Unknown profile ({})".format(profile))
+        adc_resolution, ambient_resolution, filter_coefficient = MCP9600.PROFILES[profile]
+        with self.batch():
+            self.filter_coefficient = filter_coefficient
+            self.adc_resolution = adc_resolution
+            self.ambient_resolution = ambient_resolution
+        return _CONVERSION_TIMES_MS[adc_resolution]
+
+    @property
+    def conversion_period_ms(self):
+        """Expected time between hot junction conversions in milliseconds, set by
+        :attr:`adc_resolution`. Suitable as the sampling period."""
+        return _CONVERSION_TIMES_MS[self.adc_resolution]
+
+    def batch(self):
+        """Returns a context manager that coalesces register writes: every field written inside
+        the ``with`` block is combined into one write per register when the block exits.
+
+        .. code-block:: python
+
+            with mcp.batch():
+                mcp.alert_config(alert_number=1, ...)
+                mcp.alert_config(alert_number=2, ...)
+
+        """
+        return RegisterBatch(self)
 
     def alert_config(
         self,
@@ -295,17 +468,18 @@ class MCP9600:
             raise ValueError("Alert pin number must be 1-4.")
         if not 0 <= alert_hysteresis < 256:
             raise ValueError("Hysteresis value must be 0-255.")
-        setattr(self, "_alert_%d_monitor" % alert_number, alert_temp_source)
-        setattr(
-            self,
-            "_alert_%d_temperature_limit" % alert_number,
-            int(alert_temp_limit / 0.0625),
-        )
-        setattr(self, "_alert_%d_hysteresis" % alert_number, alert_hysteresis)
-        setattr(self, "_alert_%d_temp_direction" % alert_number, alert_temp_direction)
-        setattr(self, "_alert_%d_mode" % alert_number, alert_mode)
-        setattr(self, "_alert_%d_state" % alert_number, alert_state)
-        setattr(self, "_alert_%d_enable" % alert_number, True)
+        with self.batch():
+            setattr(self, "_alert_%d_monitor" % alert_number, alert_temp_source)
+            setattr(
+                self,
+                "_alert_%d_temperature_limit" % alert_number,
+                int(alert_temp_limit / 0.0625),
+            )
+            setattr(self, "_alert_%d_hysteresis" % alert_number, alert_hysteresis)
+            setattr(self, "_alert_%d_temp_direction" % alert_number, alert_temp_direction)
+            setattr(self, "_alert_%d_mode" % alert_number, alert_mode)
+            setattr(self, "_alert_%d_state" % alert_number, alert_state)
+            setattr(self, "_alert_%d_enable" % alert_number, True)
 
     def alert_disable(self, alert_number):
         """Configuring an alert using :meth:`alert_config` enables the specified alert by default.
@@ -334,7 +508,7 @@ class MCP9600:
     def version(self):
         """ MCP9600 chip version """
         data = self._read_register(_REGISTER_VERSION, 2)
-        return unpack(">xH", data)[0]
+        return unpack(">H", data)[0]
 
     @property
     def ambient_temperature(self):
@@ -354,29 +528,123 @@ class MCP9600:
         data = self._read_register(_REGISTER_DELTA_TEMP, 2)
         return self.temp_c(data)
 
+    def read_all(self, snapshot=None):
+        """Reads the hot junction, delta and cold junction temperatures and the status register
+        in four single-transaction reads.
+
+        :param Snapshot snapshot: Record to fill. Defaults to the preallocated
+                                  :attr:`snapshot`, which is overwritten by every call.
+        :return: The filled `Snapshot`.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot
+        snapshot.ticks = time.ticks_ms()
+        self._read_temperatures(snapshot)
+        snapshot.status = self._read_register(_REGISTER_STATUS)[0]
+        return snapshot
+
+    def read_if_ready(self, snapshot=None):
+        """Reads the junction temperatures only if a new conversion has completed since the last
+        call, then clears :attr:`temperature_update` so each conversion is read exactly once.
+        Costs a single status read when no new data is available.
+
+        :param Snapshot snapshot: Record to fill, as for :meth:`read_all`. Its ``ticks`` is
+                                  the time at which the new conversion was detected.
+        :return: The filled `Snapshot`, or `None` if no new conversion is ready.
+        """
+        status = self._read_register(_REGISTER_STATUS)[0]
+        if not status & _STATUS_TEMPERATURE_UPDATE:
+            return None
+        if snapshot is None:
+            snapshot = self.snapshot
+        snapshot.ticks = time.ticks_ms()
+        snapshot.status = status
+        self._read_temperatures(snapshot)
+        self.singlebyte[0] = status & ~_STATUS_TEMPERATURE_UPDATE
+        self.i2c_device.writeto_mem(_REGISTER_STATUS, self.singlebyte)
+        return snapshot
+
+    def _read_temperatures(self, snapshot):
+        snapshot.hot = fixed_temperature(self._read_register(_REGISTER_HOT_JUNCTION, 2))
+        snapshot.delta = fixed_temperature(self._read_register(_REGISTER_DELTA_TEMP, 2))
+        snapshot.cold = fixed_temperature(self._read_register(_REGISTER_COLD_JUNCTION, 2))
+
+    def start_burst(self, samples=BURST_SAMPLES_1):
+        """Clears :attr:`burst_complete` and starts a burst of conversions. The device enters
+        shutdown mode by itself once the burst is done.
+
+        :param int samples: The number of samples in the burst. Options are
+                            ``BURST_SAMPLES_1`` through ``BURST_SAMPLES_128``.
+        """
+        with self.batch():
+            self.burst_complete = False
+            self.burst_mode_samples = samples
+            self.shutdown_mode = MCP9600.BURST
+
+    def poll_burst(self, snapshot=None):
+        """Returns the reading of a burst started with :meth:`start_burst` once the burst is
+        complete, leaving the device in shutdown mode. Costs a single status read while the
+        burst is still running, so it can be polled from a scheduler instead of blocking in
+        :meth:`read_burst`.
+
+        :param Snapshot snapshot: Record to fill, as for :meth:`read_all`.
+        :return: The filled `Snapshot`, or `None` if the burst is not complete yet.
+        """
+        if not self.burst_complete:
+            return None
+        snapshot = self.read_all(snapshot)
+        with self.batch():
+            self.burst_complete = False
+            self.shutdown_mode = MCP9600.SHUTDOWN
+        return snapshot
+
+    def read_burst(self, samples=BURST_SAMPLES_1, *, timeout_ms=None, poll_ms=10, snapshot=None):
+        """Runs a burst of conversions and returns the resulting reading, leaving the device in
+        shutdown mode. Sleeps for the expected burst duration instead of spinning, then polls
+        :attr:`burst_complete` every ``poll_ms``.
+
+        Blocks for the whole burst, up to tens of seconds for long precise bursts; `uasyncio`
+        code should call :meth:`start_burst` and poll :meth:`poll_burst` instead.
+
+        :param int samples: The number of samples in the burst. Options are
+                            ``BURST_SAMPLES_1`` through ``BURST_SAMPLES_128``.
+        :param int timeout_ms: How long to wait for the burst before raising `RuntimeError`.
+                               Defaults to twice the expected burst duration.
+        :param int poll_ms: Interval between :attr:`burst_complete` checks.
+        :param Snapshot snapshot: Record to fill, as for :meth:`read_all`.
+        :return: The filled `Snapshot`.
+        """
+        duration = self.burst_duration_ms(samples)
+        if timeout_ms is None:
+            timeout_ms = 2 * duration
+        start = time.ticks_ms()
+        self.start_burst(samples)
+        time.sleep_ms(duration)
+        reading = self.poll_burst(snapshot)
+        while reading is None:
+            if time.ticks_diff(time.ticks_ms(), start) > timeout_ms:
+                self.shutdown_mode = MCP9600.SHUTDOWN
+                raise RuntimeError("MCP9600 burst timed out")
+            time.sleep_ms(poll_ms)
+            reading = self.poll_burst(snapshot)
+        return reading
+
+    def burst_duration_ms(self, samples=BURST_SAMPLES_1):
+        """Expected duration of a burst of ``samples`` (a ``BURST_SAMPLES_*`` option)
+        in milliseconds."""
+        return (1 << samples) * self.conversion_period_ms
+
     def _read_register(self, reg, count=1):
-        self.singlebyte[0] = reg
-        self.i2c_device.writeto(self.ADDR, self.singlebyte)
-        self.i2c_device.readfrom_into(self.ADDR, self.buf)
-        return self.buf
-
-    def temp_c2(self, byteData):
-        value = byteData[0] << 8 | byteData[1]
-        temp = (value & 0xFFF) / 16.0
-        if value & 0x1000:
-            temp -= 256.0
-        return temp
+        if count == 1:
+            buf = self.singlebyte
+        elif count == 2:
+            buf = self.buf
+        else:
+            buf = bytearray(count)
+        self.i2c_device.readfrom_mem_into(reg, buf)
+        return buf
 
     def temp_c(self, byteData):
-        # Taken from MCP9600 Datasheet:
-        # Temperature >= 0°C
-        # TΔ = (UpperByte x 16 + LowerByte / 16)
-        # Temperature < 0°C
-        # TΔ = (UpperByte x 16 + LowerByte / 16) - 4096
-
-        temp = (byteData[0] * 16 + byteData[1] / 16)
-        value = byteData[0] << 8 | byteData[1]
-
-        if value & 0x1000:
-            temp -= 4096.0
-        return temp
\ No newline at end of file
+        """Converts a temperature register pair to degrees Celsius. See :func:`fixed_temperature`
+        for the allocation-free integer decode."""
+        return fixed_to_celsius(fixed_temperature(byteData))
\ No newline at end of file
@@ -0,0 +1,273 @@
+"""Multi-channel thermocouple acquisition from up to eight MCP9600s on one bus
+
+Finds the devices with one bus scan, then releases them from shutdown one after another,
+`period / n` apart, so their conversions complete at evenly spaced times and the bus
+reads of one device fall between the conversions of the others
+
+Each device is only polled once its next conversion is due, so a device costs one status
+read and three temperature reads per conversion, and aggregate throughput grows with the
+number of devices instead of being paced by the slowest one
+
+The stagger is not maintained: each device converts on its own oscillator, a few percent
+off nominal, so over minutes their conversions drift together and frames come from reads
+that are no longer evenly spread; call `start()` again to re-stagger them
+
+Samples are collected into time-aligned `Frame`s: each channel is linearly interpolated
+to the time of the oldest channel's newest conversion, using integer math on fixed-point
+temperatures (1/16 degrees Celsius)
+"""
+
+import time
+from array import array
+
+from thermocouple import MCP9600, Snapshot, fixed_to_celsius
+
+DEFAULT_ADDRESSES = tuple(range(0x60, 0x68))
+
+class Frame:
+    """
+    One time-aligned reading of every channel
+
+    Preallocated and overwritten by every new frame
+    """
+
+    ticks: int
+
+    def __init__(self, addresses:tuple):
+        """
+        Parameters
+        ----------
+        addresses : `tuple[int]`
+            I2C address of each channel
+        """
+
+        count = len(addresses)
+        self.addresses = addresses
+        self.ticks = 0
+        self.hot = array("h", [0] * count)
+        self.delta = array("h", [0] * count)
+        self.cold = array("h", [0] * count)
+        self.status = bytearray(count)
+        # 0 where the channel missed this frame and holds its last value
+        self.valid = bytearray(count)
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def temperatures(self) -> list:
+        """Hot junction temperatures in degrees Celsius, for display only as it allocates
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        temperatures : `list[float]`
+        """
+
+        return [fixed_to_celsius(value) for value in self.hot]
+
+class ThermocoupleArray:
+    """
+    Staggered round-robin acquisition from several MCP9600s sharing a bus
+
+    Call `start()` once, then `poll()` every `poll_period_ms`
+    """
+
+    addresses: tuple
+    period_ms: int
+    poll_period_ms: int
+    frames: int
+    missed: int
+    errors: int
+
+    def __init__(self, i2c, *, addresses:tuple=DEFAULT_ADDRESSES, profile:str="balanced",
+                 tctype:str="K", tcfilter:int|None=None, timeout_periods:int=2):
+        """
+        Parameters
+        ----------
+        i2c : `machine.I2C`
+            The shared bus
+        addresses : `tuple[int]`
+            Addresses to look for MCP9600s at
+        profile : `str`
+            Conversion profile of every device, see `MCP9600.PROFILES`
+        tctype : `str`
+            Thermocouple type of every device
+        tcfilter : `int | None`
+            Filter coefficient of every device, in place of the profile's\n
+            If `None` the profile's
+        timeout_periods : `int`
+            Conversion periods to wait for a silent channel before sending a frame without it
+        """
+
+        found = i2c.scan()
+        self.devices = []
+        for address in addresses:
+            if address not in found: continue
+            try:
+                self.devices.append(MCP9600(i2c, address=address, tctype=tctype))
+            except (OSError, RuntimeError):
+                # another kind of device at this address
+                pass
+        if not self.devices: raise RuntimeError("No MCP9600 found")
+
+        count = len(self.devices)
+        self.addresses = tuple(device.ADDR for device in self.devices)
+        self.profile = profile
+        self.tcfilter = tcfilter
+        self.timeout_periods = timeout_periods
+        self.period_ms = 0
+        self.poll_period_ms = 1
+        self.frame = Frame(self.addresses)
+        self.frames = 0
+        self.missed = 0
+        self.errors = 0
+
+        # two snapshots per channel, swapped on every read: the latest and the one before
+        self._latest = [Snapshot() for _ in range(count)]
+        self._previous = [Snapshot() for _ in range(count)]
+        self._readings = bytearray(count) # readings so far, capped at 2
+        self._fresh = bytearray(count)
+        self._fresh_count = 0
+        self._due = array("i", [0] * count)
+        self._first_fresh = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+    def start(self) -> None:
+        """Configures every device and starts their conversions `period / n` apart\n
+        Blocks for about one conversion period; call again to re-stagger drifted devices
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        for device in self.devices:
+            with device.batch():
+                device.shutdown_mode = MCP9600.SHUTDOWN
+                device.set_profile(self.profile)
+                if self.tcfilter is not None: device.filter_coefficient = self.tcfilter
+        count = len(self.devices)
+        self.period_ms = self.devices[0].conversion_period_ms
+        offset = self.period_ms // count
+        self.poll_period_ms = max(1, offset // 2)
+
+        start = time.ticks_ms()
+        for i, device in enumerate(self.devices):
+            wait = time.ticks_diff(time.ticks_add(start, i * offset), time.ticks_ms())
+            if wait > 0: time.sleep_ms(wait)
+            device.shutdown_mode = MCP9600.NORMAL
+            self._due[i] = time.ticks_add(time.ticks_ms(), self.period_ms)
+            self._readings[i] = 0
+            self._fresh[i] = 0
+        self._fresh_count = 0
+
+    def stop(self) -> None:
+        """Puts every device in shutdown
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None : `None`
+        """
+
+        for device in self.devices:
+            device.shutdown_mode = MCP9600.SHUTDOWN
+
+    def poll(self) -> Frame|None:
+        """Reads every channel whose conversion is due, starting after the last one read
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        frame : `Frame | None`
+            The completed frame, or `None` until every channel has a new reading
+        """
+
+        count = len(self.devices)
+        now = time.ticks_ms()
+        start = self._next
+        for step in range(count):
+            i = start + step
+            if i >= count: i -= count
+            if time.ticks_diff(now, self._due[i]) < 0: continue
+            try:
+                # read into the older snapshot, which becomes the latest
+                sample = self.devices[i].read_if_ready(self._previous[i])
+            except OSError:
+                # unplugged or disturbed, the other channels carry on and frames mark it invalid
+                self.errors += 1
+                self._due[i] = time.ticks_add(now, self.period_ms)
+                continue
+            if sample is None: continue # oscillator a little slow, retry on the next poll
+            self._previous[i] = self._latest[i]
+            self._latest[i] = sample
+            if self._readings[i] < 2: self._readings[i] += 1
+
+            due = time.ticks_add(self._due[i], self.period_ms)
+            if time.ticks_diff(due, now) <= 0: due = time.ticks_add(now, self.period_ms)
+            self._due[i] = due
+            self._next = i + 1 if i + 1 < count else 0
+
+            if not self._fresh[i]:
+                if self._fresh_count == 0: self._first_fresh = sample.ticks
+                self._fresh[i] = 1
+                self._fresh_count += 1
+
+        if self._fresh_count == 0: return None
+        if self._fresh_count < count:
+            waited = time.ticks_diff(now, self._first_fresh)
+            if waited < self.timeout_periods * self.period_ms: return None
+        return self._build_frame()
+
+    def _build_frame(self) -> Frame:
+        frame = self.frame
+        count = len(self.devices)
+
+        # align to the oldest of the channels' newest readings
+        ticks = 0
+        first = True
+        for i in range(count):
+            if not self._fresh[i]: continue
+            latest = self._latest[i].ticks
+            if first or time.ticks_diff(latest, ticks) < 0: ticks = latest
+            first = False
+        frame.ticks = ticks
+
+        for i in range(count):
+            latest = self._latest[i]
+            frame.status[i] = latest.status
+            frame.valid[i] = self._fresh[i]
+            if not self._fresh[i]: self.missed += 1
+            previous = self._previous[i]
+            span = time.ticks_diff(latest.ticks, previous.ticks)
+            weight = time.ticks_diff(ticks, previous.ticks)
+            if self._readings[i] < 2 or span <= 0 or weight >= span:
+                frame.hot[i] = latest.hot
+                frame.delta[i] = latest.delta
+                frame.cold[i] = latest.cold
+                continue
+            if weight < 0: weight = 0
+            frame.hot[i] = previous.hot + (latest.hot - previous.hot) * weight // span
+            frame.delta[i] = previous.delta + (latest.delta - previous.delta) * weight // span
+            frame.cold[i] = previous.cold + (latest.cold - previous.cold) * weight // span
+        for i in range(count):
+            self._fresh[i] = 0
+        self._fresh_count = 0
+        self.frames += 1
+        return frame